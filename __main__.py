@@ -1,5 +1,59 @@
-from src.emulator import Window
+import argparse
+import pathlib
+import time
+
+from src.core.capture import FrameCapture
+from src.core.chip8 import Chip8
+from src.core.movie import Movie, replay
+
+DEFAULT_ROM = pathlib.Path(__file__).parent / "roms" / "Pong [Paul Vervalin, 1990].ch8"
 
 if __name__ == "__main__":
-    window = Window(rom_path=r"roms\Pong [Paul Vervalin, 1990].ch8")
-    window.run()
+    parser = argparse.ArgumentParser(description="Run a CHIP-8 ROM in a window.")
+    parser.add_argument("rom", nargs="?", type=pathlib.Path, default=DEFAULT_ROM, help="path to the ROM to run")
+    parser.add_argument("--turbo", action="store_true", help="start uncapped; toggle at runtime with Tab")
+    parser.add_argument("--mute", action="store_true", help="disable sound")
+    parser.add_argument("--seed", type=int, help="seed for the random number generator")
+    parser.add_argument("--record", type=pathlib.Path, metavar="MOVIE", help="record input to a movie file")
+    parser.add_argument(
+        "--replay", type=pathlib.Path, metavar="MOVIE", help="replay a movie headless at full speed and verify it"
+    )
+    parser.add_argument(
+        "--capture",
+        type=pathlib.Path,
+        metavar="PATH",
+        help="record every presented frame to a .gif, a .y4m or a directory of PNGs",
+    )
+    parser.add_argument("--capture-scale", type=int, default=1, help="pixels per CHIP-8 pixel in the capture")
+    args = parser.parse_args()
+
+    if args.replay is not None:
+        # Headless replays wait for the encoder rather than drop frames: nothing is paced in real time.
+        capture = (
+            FrameCapture(args.capture, scale=args.capture_scale, policy="block") if args.capture is not None else None
+        )
+
+        def on_frame(chip: Chip8) -> None:
+            if capture is not None:
+                capture.push(chip.framebuffer.to_bytes())
+
+        start = time.perf_counter()
+        chip = replay(Movie.load(args.replay), args.rom, on_frame=on_frame)
+        elapsed = time.perf_counter() - start
+        if capture is not None:
+            capture.close()
+            print(f"Captured {capture.pushed:,} distinct frames ({capture.duplicates:,} repeats) to {args.capture}.")
+        print(f"Replayed {chip.cycles:,} cycles in {elapsed:.2f}s ({chip.cycles / elapsed:,.0f} IPS), state matches.")
+    else:
+        from src.emulator import Window
+
+        window = Window(
+            rom_path=args.rom,
+            turbo=args.turbo,
+            sound="null" if args.mute else "pygame",
+            seed=args.seed,
+            movie_path=args.record,
+            capture_path=args.capture,
+            capture_scale=args.capture_scale,
+        )
+        window.run()
@@ -0,0 +1,48 @@
+import argparse
+import json
+import pathlib
+import sys
+import time
+
+from src.core.batch import check_golden, find_roms, run_batch, to_csv, to_json
+
+DEFAULT_ROMS = pathlib.Path(__file__).parent / "roms"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every ROM in a directory headless on a process pool.")
+    parser.add_argument("directory", nargs="?", type=pathlib.Path, default=DEFAULT_ROMS, help="directory of ROMs")
+    parser.add_argument("--cycles", type=int, default=100_000, help="instructions to run per ROM")
+    parser.add_argument("--engine", choices=("interpreter", "recompiler"), default="interpreter")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random number generator")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json", help="report format")
+    parser.add_argument("--output", type=pathlib.Path, help="write the report here instead of stdout")
+    parser.add_argument("--golden", type=pathlib.Path, help="JSON file of golden framebuffer hashes to check")
+    parser.add_argument("--update-golden", action="store_true", help="rewrite the golden file from this run")
+    args = parser.parse_args()
+
+    roms = find_roms(args.directory)
+    start = time.perf_counter()
+    results = run_batch(roms, args.cycles, engine=args.engine, seed=args.seed, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    report = to_json(results) if args.format == "json" else to_csv(results)
+    if args.output is not None:
+        args.output.write_text(report)
+    else:
+        print(report)
+    total = sum(result.instructions for result in results)
+    print(
+        f"{len(results)} ROMs, {total:,} instructions in {elapsed:.2f}s ({total / elapsed:,.0f} IPS)", file=sys.stderr
+    )
+
+    if args.golden is not None:
+        if args.update_golden:
+            golden = {result.rom: result.framebuffer_hash for result in results}
+            args.golden.write_text(json.dumps(golden, indent=2, sort_keys=True) + "\n")
+        else:
+            mismatches = check_golden(results, json.loads(args.golden.read_text()))
+            for mismatch in mismatches:
+                print(mismatch, file=sys.stderr)
+            if mismatches:
+                sys.exit(1)
@@ -0,0 +1,82 @@
+import argparse
+import json
+import pathlib
+import sys
+
+import attrs
+
+from src.core.batch import find_roms
+from src.core.benchmark import BenchmarkResult, compare, machine_info, run_macro, run_micro
+
+DEFAULT_ROMS = pathlib.Path(__file__).parent / "roms"
+MICRO_ROM = DEFAULT_ROMS / "IBM Logo.ch8"
+
+
+def run(args: argparse.Namespace) -> None:
+    results: list[BenchmarkResult] = []
+    if not args.macro_only:
+        results += run_micro(MICRO_ROM, number=args.number, repeat=args.repeat, only=args.filter)
+    if not args.micro_only:
+        for engine in args.engine:
+            results += run_macro(
+                find_roms(args.roms), cycles=args.cycles, engine=engine, repeat=args.repeat, only=args.filter
+            )
+    for result in results:
+        print(f"{result.name:<64} {result.ns_per_op:>12,.1f} ns/op", file=sys.stderr)
+    report = json.dumps(
+        {"metadata": machine_info(), "results": {result.name: attrs.asdict(result) for result in results}}, indent=2
+    )
+    if args.output is not None:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+
+
+def compare_runs(args: argparse.Namespace) -> None:
+    old = json.loads(args.old.read_text())["results"]
+    new = json.loads(args.new.read_text())["results"]
+    comparisons = compare(
+        {name: result["ns_per_op"] for name, result in old.items()},
+        {name: result["ns_per_op"] for name, result in new.items()},
+    )
+    regressions = 0
+    for comparison in comparisons:
+        regressed = comparison.change > args.threshold
+        regressions += regressed
+        print(
+            f"{comparison.name:<64} {comparison.old:>12,.1f} -> {comparison.new:>12,.1f} ns/op"
+            f" {comparison.change:>+8.1%}{'  REGRESSION' if regressed else ''}"
+        )
+    if regressions:
+        print(f"{regressions} benchmark(s) slower by more than {args.threshold:.0%}.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the CHIP-8 core and compare runs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks and write a JSON report")
+    run_parser.add_argument("--roms", type=pathlib.Path, default=DEFAULT_ROMS, help="directory of ROMs")
+    run_parser.add_argument("--cycles", type=int, default=200_000, help="instructions per ROM")
+    run_parser.add_argument(
+        "--engine", action="append", choices=("interpreter", "recompiler"), help="engines for the ROM runs"
+    )
+    run_parser.add_argument("--number", type=int, default=20_000, help="calls per micro-benchmark repeat")
+    run_parser.add_argument("--repeat", type=int, default=5, help="repeats; the best one is reported")
+    run_parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    run_parser.add_argument("--micro-only", action="store_true")
+    run_parser.add_argument("--macro-only", action="store_true")
+    run_parser.add_argument("--output", type=pathlib.Path, help="write the report here instead of stdout")
+    run_parser.set_defaults(handler=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two reports and flag regressions")
+    compare_parser.add_argument("old", type=pathlib.Path)
+    compare_parser.add_argument("new", type=pathlib.Path)
+    compare_parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown, e.g. 0.10 for 10%%")
+    compare_parser.set_defaults(handler=compare_runs)
+
+    args = parser.parse_args()
+    if args.command == "run" and not args.engine:
+        args.engine = ["interpreter", "recompiler"]
+    args.handler(args)
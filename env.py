@@ -0,0 +1,51 @@
+import argparse
+import pathlib
+import random
+import sys
+import time
+
+DEFAULT_ROMS = pathlib.Path(__file__).parent / "roms"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure environment steps per second on the bundled ROMs.")
+    parser.add_argument("roms", nargs="*", type=pathlib.Path, help="ROMs to run (default: every bundled ROM)")
+    parser.add_argument("--steps", type=int, default=2_000, help="steps per environment")
+    parser.add_argument("--frame-skip", type=int, default=4, help="frames per step")
+    parser.add_argument("--envs", type=int, default=8, help="environments in the vector env")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--observation", choices=("pixels", "packed"), default="pixels")
+    parser.add_argument("--engine", choices=("interpreter", "recompiler"), default="interpreter")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the machines and the random actions")
+    args = parser.parse_args()
+
+    try:
+        from src.core.env import Chip8Env, Chip8VectorEnv
+    except ImportError:
+        sys.exit("The environments need NumPy: poetry install --with vector")
+
+    roms = args.roms or sorted(path for path in DEFAULT_ROMS.iterdir() if path.suffix == ".ch8")
+    actions = random.Random(args.seed)
+    options = {"frame_skip": args.frame_skip, "observation": args.observation, "engine": args.engine}
+
+    total = 0
+    elapsed = 0.0
+    for rom in roms:
+        env = Chip8Env(rom, **options)
+        env.reset(seed=args.seed)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            if env.step(actions.getrandbits(16))[2]:
+                env.reset()
+        rom_elapsed = time.perf_counter() - start
+        total += args.steps
+        elapsed += rom_elapsed
+        print(f"{rom.name:<50}{args.steps / rom_elapsed:>12,.0f} steps/s")
+    print(f"{'Chip8Env':<50}{total / elapsed:>12,.0f} steps/s")
+
+    with Chip8VectorEnv([roms[i % len(roms)] for i in range(args.envs)], workers=args.workers, **options) as vector:
+        vector.reset(seed=args.seed)
+        start = time.perf_counter()
+        for _ in range(args.steps):
+            vector.step([actions.getrandbits(16) for _ in range(args.envs)])
+        elapsed = time.perf_counter() - start
+    print(f"{f'Chip8VectorEnv ({args.envs} envs)':<50}{args.steps * args.envs / elapsed:>12,.0f} steps/s")
@@ -0,0 +1,36 @@
+import argparse
+import pathlib
+import sys
+
+from src.core.fuzzer import fuzz
+
+DEFAULT_ROM = pathlib.Path(__file__).parent / "roms" / "Pong [Paul Vervalin, 1990].ch8"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fuzz a ROM's input for new coverage and crashes on a process pool.")
+    parser.add_argument("rom", nargs="?", type=pathlib.Path, default=DEFAULT_ROM, help="path to the ROM to fuzz")
+    parser.add_argument("--corpus", type=pathlib.Path, default=pathlib.Path("corpus"), help="shared corpus directory")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to fuzz for")
+    parser.add_argument("--executions", type=int, help="stop each worker after this many executions")
+    parser.add_argument("--frames", type=int, default=600, help="length of new inputs in frames")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the first worker; worker i uses seed + i")
+    args = parser.parse_args()
+
+    stats = fuzz(
+        args.rom,
+        args.corpus,
+        workers=args.workers,
+        seed=args.seed,
+        frames=args.frames,
+        executions=args.executions,
+        duration=args.duration,
+    )
+    coverage = stats.coverage
+    print(
+        f"{stats.executions:,} executions in {stats.elapsed:.1f}s ({stats.executions_per_second:,.0f} execs/s): "
+        f"{coverage.addresses} addresses, {len(coverage.edges)} edges, {len(coverage.variants)} opcode patterns, "
+        f"{stats.corpus} new corpus entries"
+    )
+    for error, name in sorted(stats.crashes.items()):
+        print(f"crash: {error} ({args.corpus / 'crashes' / name})", file=sys.stderr)
@@ -0,0 +1,25 @@
+import argparse
+import pathlib
+
+from src.core.chip8 import Chip8
+
+DEFAULT_ROM = pathlib.Path(__file__).parent / "roms" / "Pong [Paul Vervalin, 1990].ch8"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile where a ROM spends its instructions.")
+    parser.add_argument("rom", nargs="?", type=pathlib.Path, default=DEFAULT_ROM, help="path to the ROM to profile")
+    parser.add_argument("--cycles", type=int, default=100_000, help="instructions to run")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the random number generator")
+    parser.add_argument("--top", type=int, default=20, help="number of hot addresses to list")
+    args = parser.parse_args()
+
+    chip = Chip8(args.rom, seed=args.seed, profile=True)
+    error = None
+    try:
+        chip.run_cycles(args.cycles)
+    except (ValueError, IndexError) as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    assert chip.profiler is not None
+    print(chip.profiler.report(args.top))
+    if error is not None:
+        print(f"\nStopped early: {error}")
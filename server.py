@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import pathlib
+
+from src.net.server import EmulationServer
+
+DEFAULT_ROMS = pathlib.Path(__file__).parent / "roms"
+
+
+async def main(args: argparse.Namespace) -> None:
+    server = EmulationServer(
+        args.directory, engine=args.engine, max_buffer=args.max_buffer, max_sessions=args.max_sessions
+    )
+    await server.start(args.host, args.port)
+    host, port = server.address
+    print(f"Serving ROMs from {server.rom_directory} on {host}:{port}")
+    try:
+        while True:
+            await asyncio.sleep(args.stats_interval)
+            stats = server.stats()
+            print(
+                f"{len(stats['sessions'])} sessions, {stats['instructions_per_second']:,.0f} instructions/s, "
+                f"{stats['frames_sent']:,} frames sent, {stats['frames_dropped']:,} dropped, "
+                f"{stats['bytes_sent']:,} bytes, {stats['latency_ms']:.2f} ms input latency"
+            )
+            for session in stats["sessions"]:
+                print(
+                    f"  #{session['session']} {session['rom']}: {session['instructions_per_second']:,.0f} "
+                    f"instructions/s, {session['latency_ms']:.2f} ms (max {session['max_latency_ms']:.2f} ms)"
+                )
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve paced CHIP-8 sessions over TCP with delta frames.")
+    parser.add_argument("directory", nargs="?", type=pathlib.Path, default=DEFAULT_ROMS, help="directory of ROMs")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="port to listen on")
+    parser.add_argument("--engine", choices=("interpreter", "recompiler"), default="interpreter")
+    parser.add_argument("--max-buffer", type=int, default=64 * 1024, help="bytes queued per client before frames skip")
+    parser.add_argument("--max-sessions", type=int, default=64, help="sessions accepted at once")
+    parser.add_argument("--stats-interval", type=float, default=5.0, help="seconds between stats lines")
+    try:
+        asyncio.run(main(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
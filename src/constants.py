@@ -4,6 +4,8 @@ CHIP_8_TIMER_CLOCK = 60
 CHIP_8_CPU_CLOCK = 540
 CHIP_8_MEMORY_SIZE = 4096
 CHIP_8_ROM_START = 0x200
+CHIP_8_DISPLAY_WIDTH = 64
+CHIP_8_DISPLAY_HEIGHT = 32
 CHIP_8_FONTSET = (
     (0xF0, 0x90, 0x90, 0x90, 0xF0),  # 0
     (0x20, 0x60, 0x20, 0x20, 0x70),  # 1
@@ -0,0 +1,92 @@
+"""Headless batch runs of many ROMs on a process pool."""
+
+import concurrent.futures
+import csv
+import hashlib
+import io
+import json
+import pathlib
+import time
+import typing as t
+
+import attrs
+
+from src.core.chip8 import Chip8, Engine
+
+__all__: tuple[str, ...] = ("RomResult", "check_golden", "find_roms", "run_batch", "run_rom", "to_csv", "to_json")
+
+ROM_SUFFIXES = (".ch8", ".c8")
+
+
+@attrs.define(slots=True, kw_only=True)
+class RomResult:
+    rom: str
+    instructions: int
+    wall_time: float
+    instructions_per_second: float
+    final_pc: int
+    framebuffer_hash: str
+    idle_cycles: int = 0
+    error: str | None = None
+
+
+def find_roms(directory: str | pathlib.Path) -> list[pathlib.Path]:
+    return sorted(path for path in pathlib.Path(directory).iterdir() if path.suffix.lower() in ROM_SUFFIXES)
+
+
+def run_rom(path: str | pathlib.Path, cycles: int, *, engine: Engine = "interpreter", seed: int = 0) -> RomResult:
+    """Run one ROM for ``cycles`` instructions with no input and report how it ended."""
+    chip = Chip8(path, engine=engine, seed=seed)
+    error = None
+    start = time.perf_counter()
+    try:
+        chip.run_cycles(cycles)
+    except (ValueError, IndexError) as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    wall_time = time.perf_counter() - start
+    return RomResult(
+        rom=pathlib.Path(path).name,
+        instructions=chip.cycles,
+        wall_time=wall_time,
+        instructions_per_second=chip.cycles / wall_time if wall_time else 0.0,
+        final_pc=chip.registers.PC,
+        framebuffer_hash=hashlib.sha1(chip.framebuffer.to_bytes()).hexdigest(),
+        idle_cycles=chip.idle_cycles,
+        error=error,
+    )
+
+
+def run_batch(
+    paths: t.Iterable[str | pathlib.Path],
+    cycles: int,
+    *,
+    engine: Engine = "interpreter",
+    seed: int = 0,
+    workers: int | None = None,
+) -> list[RomResult]:
+    """Run every ROM in its own worker process and return the results in input order."""
+    paths = list(paths)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(run_rom, path, cycles, engine=engine, seed=seed) for path in paths]
+        return [future.result() for future in futures]
+
+
+def check_golden(results: t.Iterable[RomResult], golden: t.Mapping[str, str]) -> list[str]:
+    """Return a message for every ROM whose framebuffer hash differs from its golden one."""
+    return [
+        f"{result.rom}: framebuffer {result.framebuffer_hash} != golden {golden[result.rom]}"
+        for result in results
+        if result.rom in golden and result.framebuffer_hash != golden[result.rom]
+    ]
+
+
+def to_json(results: t.Iterable[RomResult]) -> str:
+    return json.dumps([attrs.asdict(result) for result in results], indent=2)
+
+
+def to_csv(results: t.Iterable[RomResult]) -> str:
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=[field.name for field in attrs.fields(RomResult)])
+    writer.writeheader()
+    writer.writerows(attrs.asdict(result) for result in results)
+    return output.getvalue()
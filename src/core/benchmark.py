@@ -0,0 +1,203 @@
+"""Reproducible micro- and macro-benchmarks.
+
+Every benchmark reports the best time per operation over a few repeats, which is the least noisy
+figure on a shared machine. Macro-benchmarks run whole ROMs with a fixed seed and a scripted keypad,
+so two runs of the same tree execute exactly the same instructions.
+"""
+
+import datetime
+import os
+import pathlib
+import platform
+import subprocess
+import sys
+import time
+import timeit
+import typing as t
+
+import attrs
+
+from src.core.chip8 import Chip8, Engine
+from src.core.scheduler import FrameScheduler
+
+__all__: tuple[str, ...] = (
+    "BenchmarkResult",
+    "Comparison",
+    "compare",
+    "machine_info",
+    "run_macro",
+    "run_micro",
+    "scripted_keys",
+)
+
+# A representative opcode for every family the interpreter decodes; FX0A is left out because it blocks.
+FAMILY_OPCODES = {
+    "0NNN": 0x00E0,
+    "1NNN": 0x1200,
+    "2NNN": 0x2300,
+    "3XNN": 0x3012,
+    "4XNN": 0x4012,
+    "5XY0": 0x5010,
+    "6XNN": 0x6012,
+    "7XNN": 0x7001,
+    "8XYN": 0x8014,
+    "9XY0": 0x9010,
+    "ANNN": 0xA300,
+    "BNNN": 0xB200,
+    "CXNN": 0xC0FF,
+    "DXYN": 0xD015,
+    "EXNN": 0xE09E,
+    "FXNN": 0xF01E,
+}
+
+
+@attrs.define(slots=True, kw_only=True)
+class BenchmarkResult:
+    name: str
+    ns_per_op: float
+    ops: int
+
+
+@attrs.define(slots=True, kw_only=True)
+class Comparison:
+    name: str
+    old: float
+    new: float
+
+    @property
+    def change(self) -> float:
+        return self.new / self.old - 1 if self.old else 0.0
+
+
+def machine_info() -> dict[str, t.Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=10
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.UTC).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+def _measure(name: str, function: t.Callable[[], object], number: int, repeat: int) -> BenchmarkResult:
+    best = min(timeit.Timer(function).repeat(repeat=repeat, number=number))
+    return BenchmarkResult(name=name, ns_per_op=best / number * 1e9, ops=number)
+
+
+def _micro_benchmarks(rom_path: str | pathlib.Path) -> dict[str, t.Callable[[], object]]:
+    chip = Chip8(rom_path, seed=0)
+    registers = chip.registers
+    memory = chip.memory
+    benchmarks: dict[str, t.Callable[[], object]] = {}
+
+    def fetch() -> None:
+        registers.PC = 0x200
+        chip.fetch_opcode()
+
+    benchmarks["fetch_opcode"] = fetch
+    for family, opcode in FAMILY_OPCODES.items():
+
+        def execute(opcode: int = opcode) -> None:
+            # Undo the side effects that would otherwise overflow the stack, walk I out of memory or
+            # leave V0 out of the keypad's range.
+            registers.SP = 0
+            registers.I = 0
+            registers.V[0] = 5
+            chip.execute_opcode(opcode)
+
+        benchmarks[f"execute_opcode[{family}]"] = execute
+
+    draw = chip.decode(0xD01F)
+    registers.V[0], registers.V[1] = 10, 8
+
+    def draw_sprite() -> None:
+        registers.I = 0
+        draw()
+
+    benchmarks["draw_sprite"] = draw_sprite
+    benchmarks["memory_getitem"] = lambda: memory[0x300]
+
+    def set_item() -> None:
+        memory[0x300] = 0x12
+
+    benchmarks["memory_setitem"] = set_item
+    try:
+        from src.gui.screen import Display
+    except ImportError:
+        return benchmarks
+    framebuffer = chip.framebuffer
+    display = Display(framebuffer)
+    framebuffer.rows[:] = [chip.random.getrandbits(framebuffer.width) for _ in range(framebuffer.height)]
+
+    def render() -> None:
+        # A new version forces a full redraw, the worst case of a frame that changed.
+        framebuffer.version += 1
+        display.render()
+
+    benchmarks["display_render"] = render
+    return benchmarks
+
+
+def run_micro(
+    rom_path: str | pathlib.Path, *, number: int = 20_000, repeat: int = 5, only: str = ""
+) -> list[BenchmarkResult]:
+    return [
+        _measure(name, function, number, repeat)
+        for name, function in _micro_benchmarks(rom_path).items()
+        if only in name
+    ]
+
+
+def scripted_keys(frame: int) -> int:
+    """Keypad mask for ``frame``: every key in turn is held for half a second, then released."""
+    step = frame // 30
+    return 1 << (step // 2 % 16) if step % 2 else 0
+
+
+def _play(rom_path: pathlib.Path, cycles: int, engine: Engine) -> Chip8:
+    chip = Chip8(rom_path, instructions_per_tick=None, engine=engine, seed=0)
+    scheduler = FrameScheduler(chip)
+    frame = 0
+    while chip.cycles < cycles:
+        if frame % 30 == 0:
+            chip.keyboard.set_state(scripted_keys(frame))
+        scheduler.run_frame()
+        frame += 1
+    return chip
+
+
+def run_macro(
+    roms: t.Iterable[pathlib.Path],
+    *,
+    cycles: int = 200_000,
+    engine: Engine = "interpreter",
+    repeat: int = 3,
+    only: str = "",
+) -> list[BenchmarkResult]:
+    results: list[BenchmarkResult] = []
+    for rom in roms:
+        name = f"rom[{engine}:{rom.stem}]"
+        if only not in name:
+            continue
+        best = float("inf")
+        executed = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            executed = _play(rom, cycles, engine).cycles
+            best = min(best, time.perf_counter() - start)
+        results.append(BenchmarkResult(name=name, ns_per_op=best / executed * 1e9, ops=executed))
+    return results
+
+
+def compare(old: t.Mapping[str, float], new: t.Mapping[str, float]) -> list[Comparison]:
+    """Pair up the ns/op of every benchmark present in both runs."""
+    return [Comparison(name=name, old=old[name], new=new[name]) for name in old if name in new]
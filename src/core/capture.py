@@ -0,0 +1,336 @@
+"""Recording presented frames to a PNG sequence, an animated GIF or a raw ``.y4m`` stream.
+
+The emulation loop only copies the 256-byte framebuffer into a bounded queue; compression and disk I/O
+happen on a background thread or process. Consecutive identical frames are never queued: every frame
+carries its frame number, so the encoder rebuilds the timing (longer GIF delays, repeated ``.y4m``
+frames, gaps in the PNG numbering) from the frames that did change.
+"""
+
+import abc
+import multiprocessing
+import pathlib
+import queue
+import struct
+import threading
+import typing as t
+import zlib
+
+from src.constants import CHIP_8_DISPLAY_HEIGHT, CHIP_8_DISPLAY_WIDTH, CHIP_8_TIMER_CLOCK
+
+__all__: tuple[str, ...] = (
+    "CaptureFormat",
+    "FrameCapture",
+    "GifEncoder",
+    "PngSequenceEncoder",
+    "Y4mEncoder",
+    "format_for",
+)
+
+type CaptureFormat = t.Literal["png", "gif", "y4m"]
+type Policy = t.Literal["drop", "block"]
+type Worker = t.Literal["thread", "process"]
+type Message = tuple[int, bytes | None]
+
+ROW_BYTES = CHIP_8_DISPLAY_WIDTH // 8
+
+
+def format_for(path: str | pathlib.Path) -> CaptureFormat:
+    """``.gif`` and ``.y4m`` files by suffix; anything else is a directory for a PNG sequence."""
+    suffix = pathlib.Path(path).suffix.lower()
+    if suffix == ".gif":
+        return "gif"
+    if suffix == ".y4m":
+        return "y4m"
+    return "png"
+
+
+def _expand(scale: int, on: int) -> tuple[bytes, ...]:
+    """Map each packed byte of eight pixels to ``8 * scale`` bytes of 0 or ``on``."""
+    return tuple(
+        b"".join(bytes((on if byte >> (7 - bit) & 1 else 0,)) * scale for bit in range(8)) for byte in range(256)
+    )
+
+
+def _expand_bits(scale: int) -> tuple[bytes, ...]:
+    """Map each packed byte to ``scale`` bytes in which every pixel is repeated ``scale`` times."""
+    table: list[bytes] = []
+    for byte in range(256):
+        bits = 0
+        for bit in range(8):
+            pixel = byte >> (7 - bit) & 1
+            bits = bits << scale | (((1 << scale) - 1) if pixel else 0)
+        table.append(bits.to_bytes(scale, "big"))
+    return tuple(table)
+
+
+class _Encoder(abc.ABC):
+    def __init__(self, path: pathlib.Path, *, scale: int, frame_rate: int) -> None:
+        self.path = path
+        self.scale = scale
+        self.frame_rate = frame_rate
+        self.width = CHIP_8_DISPLAY_WIDTH * scale
+        self.height = CHIP_8_DISPLAY_HEIGHT * scale
+        self.frames = 0
+
+    def _rows(self, bitmap: bytes, table: tuple[bytes, ...]) -> t.Iterator[bytes]:
+        for y in range(CHIP_8_DISPLAY_HEIGHT):
+            line = b"".join([table[byte] for byte in bitmap[y * ROW_BYTES : (y + 1) * ROW_BYTES]])
+            for _ in range(self.scale):
+                yield line
+
+    @abc.abstractmethod
+    def write(self, frame: int, bitmap: bytes) -> None:
+        """Encode the frame numbered ``frame``, which differs from the previous one written."""
+
+    def close(self, end: int) -> None:
+        """Finish the file; ``end`` is the number of the first frame after the recording."""
+
+
+class PngSequenceEncoder(_Encoder):
+    """One 1-bit greyscale PNG per distinct frame, named by its frame number."""
+
+    def __init__(self, path: pathlib.Path, *, scale: int, frame_rate: int) -> None:
+        super().__init__(path, scale=scale, frame_rate=frame_rate)
+        path.mkdir(parents=True, exist_ok=True)
+        self._table = _expand_bits(scale)
+        self._header = struct.pack(">IIBBBBB", self.width, self.height, 1, 0, 0, 0, 0)
+
+    @staticmethod
+    def _chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    def write(self, frame: int, bitmap: bytes) -> None:
+        raw = b"".join([b"\x00" + row for row in self._rows(bitmap, self._table)])
+        png = (
+            b"\x89PNG\r\n\x1a\n"
+            + self._chunk(b"IHDR", self._header)
+            + self._chunk(b"IDAT", zlib.compress(raw))
+            + self._chunk(b"IEND", b"")
+        )
+        (self.path / f"frame_{frame:06d}.png").write_bytes(png)
+        self.frames += 1
+
+
+class Y4mEncoder(_Encoder):
+    """Uncompressed monochrome YUV4MPEG2 at the frame rate, repeating frames that were deduplicated."""
+
+    def __init__(self, path: pathlib.Path, *, scale: int, frame_rate: int) -> None:
+        super().__init__(path, scale=scale, frame_rate=frame_rate)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb")
+        self._file.write(f"YUV4MPEG2 W{self.width} H{self.height} F{frame_rate}:1 Ip A1:1 Cmono\n".encode())
+        self._table = _expand(scale, 0xFF)
+        self._pending: tuple[int, bytes] | None = None
+
+    def _flush(self, until: int) -> None:
+        if self._pending is not None:
+            frame, data = self._pending
+            for _ in range(max(until - frame, 1)):
+                self._file.write(b"FRAME\n")
+                self._file.write(data)
+                self.frames += 1
+
+    def write(self, frame: int, bitmap: bytes) -> None:
+        self._flush(frame)
+        self._pending = (frame, b"".join(self._rows(bitmap, self._table)))
+
+    def close(self, end: int) -> None:
+        self._flush(end)
+        self._file.close()
+
+
+def _lzw(indices: bytes, min_code_size: int) -> bytes:
+    """GIF variant of LZW: variable code width from ``min_code_size + 1`` up to 12 bits, LSB first."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    code_size = min_code_size + 1
+    next_code = end + 1
+    codes: dict[int, int] = {}
+    out = bytearray()
+    accumulator = 0
+    bits = 0
+
+    def emit(code: int) -> None:
+        nonlocal accumulator, bits
+        accumulator |= code << bits
+        bits += code_size
+        while bits >= 8:
+            out.append(accumulator & 0xFF)
+            accumulator >>= 8
+            bits -= 8
+
+    emit(clear)
+    prefix = indices[0]
+    for index in indices[1:]:
+        key = prefix << 8 | index
+        code = codes.get(key)
+        if code is not None:
+            prefix = code
+            continue
+        emit(prefix)
+        if next_code < 4096:
+            codes[key] = next_code
+            next_code += 1
+            if next_code > 1 << code_size and code_size < 12:
+                code_size += 1
+        else:
+            emit(clear)
+            codes.clear()
+            next_code = end + 1
+            code_size = min_code_size + 1
+        prefix = index
+    emit(prefix)
+    emit(end)
+    if bits:
+        out.append(accumulator & 0xFF)
+    return bytes(out)
+
+
+class GifEncoder(_Encoder):
+    """Looping two-colour animated GIF; each distinct frame is shown until the next one arrives."""
+
+    def __init__(self, path: pathlib.Path, *, scale: int, frame_rate: int) -> None:
+        super().__init__(path, scale=scale, frame_rate=frame_rate)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = path.open("wb")
+        self._file.write(b"GIF89a" + struct.pack("<HHBBB", self.width, self.height, 0x80, 0, 0))
+        self._file.write(b"\x00\x00\x00\xff\xff\xff")
+        self._file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+        self._table = _expand(scale, 1)
+        self._pending: tuple[int, bytes] | None = None
+        # GIF delays are in centiseconds; the rounding error is carried so long recordings keep their pace.
+        self._time = 0
+
+    def _flush(self, until: int) -> None:
+        if self._pending is None:
+            return
+        frame, data = self._pending
+        end = round(max(until, frame + 1) * 100 / self.frame_rate)
+        delay = max(end - self._time, 1)
+        self._time += delay
+        image = _lzw(data, 2)
+        blocks = b"".join(
+            [bytes((len(block),)) + block for block in (image[i : i + 255] for i in range(0, len(image), 255))]
+        )
+        self._file.write(b"\x21\xf9\x04\x00" + struct.pack("<H", delay) + b"\x00\x00")
+        self._file.write(b"\x2c" + struct.pack("<HHHHB", 0, 0, self.width, self.height, 0) + b"\x02" + blocks + b"\x00")
+        self.frames += 1
+
+    def write(self, frame: int, bitmap: bytes) -> None:
+        if self._pending is None:
+            self._time = round(frame * 100 / self.frame_rate)
+        self._flush(frame)
+        self._pending = (frame, b"".join(self._rows(bitmap, self._table)))
+
+    def close(self, end: int) -> None:
+        self._flush(end)
+        self._file.write(b"\x3b")
+        self._file.close()
+
+
+ENCODERS: dict[CaptureFormat, type[_Encoder]] = {"png": PngSequenceEncoder, "gif": GifEncoder, "y4m": Y4mEncoder}
+
+
+def _encode(
+    frames: "queue.Queue[Message] | multiprocessing.Queue[Message]",
+    format: CaptureFormat,
+    path: pathlib.Path,
+    scale: int,
+    frame_rate: int,
+) -> None:
+    encoder = ENCODERS[format](path, scale=scale, frame_rate=frame_rate)
+    while True:
+        frame, bitmap = frames.get()
+        if bitmap is None:
+            encoder.close(frame)
+            return
+        encoder.write(frame, bitmap)
+
+
+class FrameCapture:
+    """Feeds presented frames to an encoder running on a background thread or process.
+
+    :meth:`push` never waits on the encoder with the default ``drop`` policy: when ``queue_size`` frames
+    are already waiting, the new frame is counted in :attr:`dropped` and discarded, and the frame before
+    it stays on screen longer in the recording. The ``block`` policy waits for room instead, for headless
+    runs where a complete recording matters more than pace.
+    """
+
+    def __init__(
+        self,
+        path: str | pathlib.Path,
+        *,
+        format: CaptureFormat | None = None,
+        scale: int = 1,
+        frame_rate: int = CHIP_8_TIMER_CLOCK,
+        queue_size: int = 256,
+        policy: Policy = "drop",
+        worker: Worker = "thread",
+    ) -> None:
+        if scale < 1:
+            raise ValueError(f"scale must be at least 1, got {scale}.")
+        if policy not in ("drop", "block"):
+            raise ValueError(f"Unknown capture policy: {policy}")
+        self.path = pathlib.Path(path)
+        self.format: CaptureFormat = format or format_for(path)
+        self.policy = policy
+        self.pushed = 0
+        self.duplicates = 0
+        self.dropped = 0
+        self._last: bytes | None = None
+        self._end = 0
+        args = (self.format, self.path, scale, frame_rate)
+        self._queue: queue.Queue[Message] | multiprocessing.Queue[Message]
+        self._worker: threading.Thread | multiprocessing.Process
+        match worker:
+            case "thread":
+                self._queue = queue.Queue(queue_size)
+                self._worker = threading.Thread(target=_encode, args=(self._queue, *args), daemon=True)
+            case "process":
+                self._queue = multiprocessing.Queue(queue_size)
+                self._worker = multiprocessing.Process(target=_encode, args=(self._queue, *args), daemon=True)
+            case _:
+                raise ValueError(f"Unknown capture worker: {worker}")
+        self._worker.start()
+        self.closed = False
+
+    def push(self, bitmap: bytes, frame: int | None = None) -> bool:
+        """Queue a frame and return whether it was queued rather than deduplicated or dropped.
+
+        Frames are numbered one after another unless ``frame`` gives the number explicitly.
+        """
+        if self.closed:
+            raise ValueError("Capture is closed.")
+        if frame is None:
+            frame = self._end
+        elif frame < self._end:
+            raise ValueError(f"Frame {frame} comes before frame {self._end - 1}.")
+        self._end = frame + 1
+        if bitmap == self._last:
+            self.duplicates += 1
+            return False
+        try:
+            if self.policy == "drop":
+                self._queue.put_nowait((frame, bitmap))
+            else:
+                self._queue.put((frame, bitmap))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self._last = bitmap
+        self.pushed += 1
+        return True
+
+    def close(self) -> None:
+        """Finish the recording, waiting for the encoder to write every queued frame."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put((self._end, None))
+        self._worker.join()
+
+    def __enter__(self) -> t.Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
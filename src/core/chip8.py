@@ -2,26 +2,58 @@ import array
 import pathlib
 import random
 import typing as t
-import winsound
 
+from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_TIMER_CLOCK
+from src.core import savestate
+from src.core.decode_cache import DecodeCache, Handler
+from src.core.framebuffer import Framebuffer
+from src.core.idle import MAX_LOOP_BYTES, IdleLoop, find_idle_loop
 from src.core.keyboard import Keyboard
 from src.core.memory import Memory
-from src.core.registers import Registers
+from src.core.profiler import Profiler
+from src.core.recompiler import Recompiler
+from src.core.registers import RegisterFile
+from src.core.sound import NullSound, SoundBackend
 
-if t.TYPE_CHECKING:
-    from src.gui.screen import Display
+type Engine = t.Literal["interpreter", "recompiler"]
 
 
 class Chip8:
-    wait_for_key: int | None = None
-
-    def __init__(self, rom_path: str | pathlib.Path) -> None:
-        self.registers = Registers()
+    def __init__(
+        self,
+        rom_path: str | pathlib.Path,
+        *,
+        instructions_per_tick: int | None = CHIP_8_CPU_CLOCK // CHIP_8_TIMER_CLOCK,
+        engine: Engine = "interpreter",
+        sound: SoundBackend | None = None,
+        seed: int | None = None,
+        profile: bool = False,
+        skip_idle: bool = True,
+    ) -> None:
+        self.registers = RegisterFile()
         self.memory = Memory()
-        self.stack = array.array("H", [0] * 16)
         self.keyboard = Keyboard()
+        self.keyboard.add_listener(self._on_key)
+        self.framebuffer = Framebuffer()
+        self.wait_for_key = None
         self.rom_path = rom_path
-        self.opcode_map: dict[int, t.Callable[[int, "Display"], None]] = {
+        self.instructions_per_tick = instructions_per_tick
+        self.engine = engine
+        self.sound: SoundBackend = sound if sound is not None else NullSound()
+        self._beeping = False
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.cycles = 0
+        self._tick_countdown = instructions_per_tick or 0
+        self.profiler = Profiler(self) if profile else None
+        self.skip_idle = skip_idle
+        self.idle_cycles = 0
+        self._idle_length = 0
+        # Set by a batch function that raises: the instructions it completed before the one that raised.
+        self._batch_progress = 0
+        # The cycles left in the current run_cycles call, which a batch may run into past its budget.
+        self._batch_limit = 0
+        self.opcode_map: dict[int, t.Callable[[int], Handler]] = {
             0x0000: self.__opcode_0,
             0x1000: self.__opcode_1,
             0x2000: self.__opcode_2,
@@ -39,211 +71,570 @@ class Chip8:
             0xE000: self.__opcode_E,
             0xF000: self.__opcode_F,
         }
+        self._attach_engine()
         self.memory.load_rom(self.rom_path)
 
-    def __opcode_0(self, opcode: int, display: "Display") -> None:
+    def _attach_engine(self) -> None:
+        self.decode_cache = DecodeCache(self.memory.size, lookbehind=MAX_LOOP_BYTES - 1)
+        self.memory.add_write_listener(self.decode_cache.invalidate)
+        self.recompiler: Recompiler | None = None
+        match self.engine:
+            case "interpreter":
+                self._run_batch = self._interpret
+            case "recompiler":
+                self.recompiler = Recompiler(self)
+                self.memory.add_write_listener(self.recompiler.invalidate)
+                self._run_batch = self.recompiler.run
+            case _:
+                raise ValueError(f"Unknown engine: {self.engine}")
+        if self.profiler is not None:
+            # Swapping the batch function keeps the unprofiled loop free of any profiling checks.
+            self._run_batch = self.profiler.run
+
+    @property
+    def stack(self) -> "array.array[int]":
+        return self.registers.stack
+
+    def __opcode_0(self, opcode: int) -> Handler:
         tail = opcode & 0x00FF
         match tail:
             case 0xE0:
-                display.clear_display()
+                return self.framebuffer.clear
             case 0xEE:
-                self.registers.program_counter = self.stack.pop()
-                self.registers.stack_pointer -= 1
+                registers = self.registers
+                stack = registers.stack
+
+                def ret() -> None:
+                    if registers.SP == 0:
+                        raise IndexError(f"Stack underflow at 0x{registers.PC - 2:03X}")
+                    registers.SP -= 1
+                    registers.PC = stack[registers.SP]
+
+                return ret
             case _:
                 raise ValueError(f"Unknown opcode: {opcode:04X}")
 
-    def __opcode_1(self, opcode: int, _: "Display") -> None:
+    def __opcode_1(self, opcode: int) -> Handler:
+        registers = self.registers
         nnn = opcode & 0x0FFF
-        self.registers.program_counter = nnn
 
-    def __opcode_2(self, opcode: int, _: "Display") -> None:
+        def jump() -> None:
+            registers.PC = nnn
+
+        return jump
+
+    def __opcode_2(self, opcode: int) -> Handler:
+        registers = self.registers
+        stack = registers.stack
+        depth = len(stack)
         nnn = opcode & 0x0FFF
-        self.stack.append(self.registers.program_counter)
-        self.registers.stack_pointer += 1
-        self.registers.program_counter = nnn
 
-    def __opcode_3(self, opcode: int, _: "Display") -> None:
+        def call() -> None:
+            if registers.SP == depth:
+                raise IndexError(f"Stack overflow at 0x{registers.PC - 2:03X}")
+            stack[registers.SP] = registers.PC
+            registers.SP += 1
+            registers.PC = nnn
+
+        return call
+
+    def __opcode_3(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
         x = (opcode >> 8) & 0x0F
         nn = opcode & 0x00FF
-        if self.registers.V[f"V{x:X}"] == nn:
-            self.registers.PC += 2
 
-    def __opcode_4(self, opcode: int, _: "Display") -> None:
+        def skip_eq() -> None:
+            if V[x] == nn:
+                registers.PC += 2
+
+        return skip_eq
+
+    def __opcode_4(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
         x = (opcode >> 8) & 0x0F
         nn = opcode & 0x00FF
-        if self.registers.V[f"V{x:X}"] != nn:
-            self.registers.PC += 2
 
-    def __opcode_5(self, opcode: int, _: "Display") -> None:
+        def skip_ne() -> None:
+            if V[x] != nn:
+                registers.PC += 2
+
+        return skip_ne
+
+    def __opcode_5(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
         x = (opcode >> 8) & 0x0F
         y = (opcode >> 4) & 0x0F
-        if self.registers.V[f"V{x:X}"] == self.registers.V[f"V{y:X}"]:
-            self.registers.PC += 2
 
-    def __opcode_6(self, opcode: int, _: "Display") -> None:
+        def skip_eq_reg() -> None:
+            if V[x] == V[y]:
+                registers.PC += 2
+
+        return skip_eq_reg
+
+    def __opcode_6(self, opcode: int) -> Handler:
+        V = self.registers.V
         x = (opcode >> 8) & 0x0F
         nn = opcode & 0x00FF
-        self.registers.V[f"V{x:X}"].value = nn
 
-    def __opcode_7(self, opcode: int, _: "Display") -> None:
+        def load() -> None:
+            V[x] = nn
+
+        return load
+
+    def __opcode_7(self, opcode: int) -> Handler:
+        V = self.registers.V
         x = (opcode >> 8) & 0x0F
         nn = opcode & 0x00FF
-        self.registers.V[f"V{x:X}"] += nn
 
-    def __opcode_8(self, opcode: int, _: "Display") -> None:
+        def add() -> None:
+            V[x] = (V[x] + nn) & 0xFF
+
+        return add
+
+    def __opcode_8(self, opcode: int) -> Handler:
+        V = self.registers.V
         x = (opcode >> 8) & 0x0F
         y = (opcode >> 4) & 0x0F
         n = opcode & 0x000F
         match n:
             case 0x0:
-                self.registers.V[f"V{x:X}"].value = int(self.registers.V[f"V{y:X}"])
+
+                def mov() -> None:
+                    V[x] = V[y]
+
+                return mov
             case 0x1:
-                self.registers.V[f"V{x:X}"] |= int(self.registers.V[f"V{y:X}"])
+
+                def or_() -> None:
+                    V[x] |= V[y]
+
+                return or_
             case 0x2:
-                self.registers.V[f"V{x:X}"] &= int(self.registers.V[f"V{y:X}"])
+
+                def and_() -> None:
+                    V[x] &= V[y]
+
+                return and_
             case 0x3:
-                self.registers.V[f"V{x:X}"] ^= int(self.registers.V[f"V{y:X}"])
+
+                def xor() -> None:
+                    V[x] ^= V[y]
+
+                return xor
             case 0x4:
-                result = int(self.registers.V[f"V{x:X}"]) + int(self.registers.V[f"V{y:X}"])
-                self.registers.VF.value = result > 255
-                self.registers.V[f"V{x:X}"].value = result % 256
+
+                def add_carry() -> None:
+                    result = V[x] + V[y]
+                    V[0xF] = result > 0xFF
+                    V[x] = result & 0xFF
+
+                return add_carry
             case 0x5:
-                result = int(self.registers.V[f"V{x:X}"]) - int(self.registers.V[f"V{y:X}"])
-                self.registers.VF.value = result >= 0
-                self.registers.V[f"V{x:X}"].value = result % 256
+
+                def sub() -> None:
+                    result = V[x] - V[y]
+                    V[0xF] = result >= 0
+                    V[x] = result & 0xFF
+
+                return sub
             case 0x6:
-                self.registers.VF.value = int(self.registers.V[f"V{x:X}"]) & 1
-                self.registers.V[f"V{x:X}"] >>= 1
+
+                def shr() -> None:
+                    V[0xF] = V[x] & 1
+                    V[x] >>= 1
+
+                return shr
             case 0x7:
-                result = int(self.registers.V[f"V{y:X}"]) - int(self.registers.V[f"V{x:X}"])
-                self.registers.VF.value = result >= 0
-                self.registers.V[f"V{x:X}"].value = result % 256
+
+                def subn() -> None:
+                    result = V[y] - V[x]
+                    V[0xF] = result >= 0
+                    V[x] = result & 0xFF
+
+                return subn
             case 0xE:
-                self.registers.VF.value = (int(self.registers.V[f"V{x:X}"]) >> 7) & 1
-                self.registers.V[f"V{x:X}"] <<= 1
+
+                def shl() -> None:
+                    V[0xF] = V[x] >> 7
+                    V[x] = (V[x] << 1) & 0xFF
+
+                return shl
             case _:
                 raise ValueError(f"Unknown opcode: {opcode:04X}")
 
-    def __opcode_9(self, opcode: int, _: "Display") -> None:
+    def __opcode_9(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
         x = (opcode >> 8) & 0x0F
         y = (opcode >> 4) & 0x0F
-        if self.registers.V[f"V{x:X}"] != self.registers.V[f"V{y:X}"]:
-            self.registers.PC += 2
 
-    def __opcode_A(self, opcode: int, _: "Display") -> None:
+        def skip_ne_reg() -> None:
+            if V[x] != V[y]:
+                registers.PC += 2
+
+        return skip_ne_reg
+
+    def __opcode_A(self, opcode: int) -> Handler:
+        registers = self.registers
         nnn = opcode & 0x0FFF
-        self.registers.I.value = nnn
 
-    def __opcode_B(self, opcode: int, _: "Display") -> None:
+        def load_i() -> None:
+            registers.I = nnn
+
+        return load_i
+
+    def __opcode_B(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
         nnn = opcode & 0x0FFF
-        self.registers.program_counter = nnn + int(self.registers.V["V0"])
 
-    def __opcode_C(self, opcode: int, _: "Display") -> None:
+        def jump_v0() -> None:
+            registers.PC = nnn + V[0]
+
+        return jump_v0
+
+    def __opcode_C(self, opcode: int) -> Handler:
+        V = self.registers.V
+        randint = self.random.randint
         x = (opcode >> 8) & 0x0F
         nn = opcode & 0x00FF
-        random_value = random.randint(0, 255)
-        self.registers.V[f"V{x:X}"].value = random_value & nn
 
-    def __opcode_D(self, opcode: int, display: "Display") -> None:
+        def rand() -> None:
+            V[x] = randint(0, 255) & nn
+
+        return rand
+
+    def __opcode_D(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
+        view = self.memory.view
+        draw_sprite = self.framebuffer.draw_sprite
         x = (opcode >> 8) & 0x0F
         y = (opcode >> 4) & 0x0F
         n = opcode & 0x000F
-        self.registers.VF.value = 0
-        for i in range(n):
-            sprite = int(self.memory[int(self.registers.I) + i])
-            for j in range(8):
-                if (sprite >> (7 - j)) & 1:
-                    x_pos = int(self.registers.V[f"V{x:X}"]) + j
-                    y_pos = int(self.registers.V[f"V{y:X}"]) + i
-                    if x_pos >= display.width or y_pos >= display.height:
-                        continue
-                    if display.get_pixel(x_pos, y_pos):
-                        self.registers.VF.value = 1
-                    display.set_pixel(x_pos, y_pos, not display.get_pixel(x_pos, y_pos))
-
-    def __opcode_E(self, opcode: int, _: "Display") -> None:
+
+        def draw() -> None:
+            V[0xF] = draw_sprite(V[x], V[y], view[registers.I : registers.I + n])
+
+        return draw
+
+    def __opcode_E(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
+        is_key_pressed = self.keyboard.is_key_pressed
         x = (opcode >> 8) & 0x0F
         tail = opcode & 0x00FF
         match tail:
             case 0x9E:
-                if self.keyboard.is_key_pressed(int(self.registers.V[f"V{x:X}"])):
-                    self.registers.PC += 2
+
+                def skip_pressed() -> None:
+                    if is_key_pressed(V[x]):
+                        registers.PC += 2
+
+                return skip_pressed
             case 0xA1:
-                if not self.keyboard.is_key_pressed(int(self.registers.V[f"V{x:X}"])):
-                    self.registers.PC += 2
+
+                def skip_not_pressed() -> None:
+                    if not is_key_pressed(V[x]):
+                        registers.PC += 2
+
+                return skip_not_pressed
             case _:
                 raise ValueError(f"Unknown opcode: {opcode:04X}")
 
-    def __opcode_F(self, opcode: int, _: "Display") -> None:
+    def __opcode_F(self, opcode: int) -> Handler:
+        registers = self.registers
+        V = registers.V
+        ram = self.memory.memory
+        write = self.memory.write
         x = (opcode >> 8) & 0x0F
         tail = opcode & 0x00FF
         match tail:
             case 0x07:
-                self.registers.V[f"V{x:X}"].value = int(self.registers.DT)
+
+                def load_dt() -> None:
+                    V[x] = registers.DT
+
+                return load_dt
             case 0x0A:
-                self.wait_for_key = x
+
+                def wait_key() -> bool:
+                    self.wait_for_key = x
+                    return True
+
+                return wait_key
             case 0x15:
-                self.registers.DT.value = int(self.registers.V[f"V{x:X}"])
+
+                def set_dt() -> None:
+                    registers.DT = V[x]
+
+                return set_dt
             case 0x18:
-                self.registers.ST.value = int(self.registers.V[f"V{x:X}"])
+
+                def set_st() -> None:
+                    registers.ST = V[x]
+
+                return set_st
             case 0x1E:
-                result = int(self.registers.I) + int(self.registers.V[f"V{x:X}"])
-                self.registers.VF.value = result > 0xFFF
-                self.registers.I.value = result % 0x1000
+
+                def add_i() -> None:
+                    result = registers.I + V[x]
+                    V[0xF] = result > 0xFFF
+                    registers.I = result & 0xFFF
+
+                return add_i
             case 0x29:
-                self.registers.I.value = int(self.registers.V[f"V{x:X}"]) * 5
+
+                def load_font() -> None:
+                    registers.I = V[x] * 5
+
+                return load_font
             case 0x33:
-                value = int(self.registers.V[f"V{x:X}"])
-                self.memory[int(self.registers.I)] = value // 100
-                self.memory[int(self.registers.I) + 1] = (value // 10) % 10
-                self.memory[int(self.registers.I) + 2] = value % 10
+
+                def bcd() -> None:
+                    value = V[x]
+                    write(registers.I, bytes((value // 100, value // 10 % 10, value % 10)))
+
+                return bcd
             case 0x55:
-                for i in range(x + 1):
-                    self.memory[int(self.registers.I) + i] = int(self.registers.V[f"V{i:X}"])
-                self.registers.I += x + 1
+
+                def store() -> None:
+                    write(registers.I, V[: x + 1])
+                    registers.I = (registers.I + x + 1) & 0xFFFF
+
+                return store
             case 0x65:
-                for i in range(x + 1):
-                    self.registers.V[f"V{i:X}"].value = int(self.memory[int(self.registers.I) + i])
-                self.registers.I += x + 1
+
+                def load() -> None:
+                    values = ram[registers.I : registers.I + x + 1]
+                    V[: len(values)] = values
+                    if len(values) <= x:
+                        raise IndexError(f"Memory read out of range at 0x{registers.I + len(values):03X}")
+                    registers.I = (registers.I + x + 1) & 0xFFFF
+
+                return load
             case _:
                 raise ValueError(f"Unknown opcode: {opcode:04X}")
 
     def timers_60Hz(self) -> None:
-        if int(self.registers.DT) > 0:
-            self.registers.DT -= 1
-        if int(self.registers.ST) > 0:
-            self.registers.ST -= 1
-            beep_duration_ms = int((1 / 60) * 1000)
-            winsound.Beep(440, beep_duration_ms)
-
-    def cycle(self, display: "Display") -> None:
-        if self.wait_for_key is not None:
-            if any(self.keyboard.is_key_pressed(i) for i in range(16)):
-                key = next((i for i in range(16) if self.keyboard.is_key_pressed(i)), None)
-                assert key is not None, "Key not found"
-                self.registers.V[f"V{self.wait_for_key:X}"].value = key
-                self.wait_for_key = None
+        registers = self.registers
+        if registers.DT > 0:
+            registers.DT -= 1
+        beeping = registers.ST > 0
+        if beeping:
+            registers.ST -= 1
+        if beeping != self._beeping:
+            self._beeping = beeping
+            if beeping:
+                self.sound.start()
+            else:
+                self.sound.stop()
+
+    @property
+    def wait_for_key(self) -> int | None:
+        return self._wait_for_key
+
+    @wait_for_key.setter
+    def wait_for_key(self, register: int | None) -> None:
+        self._wait_for_key = register
+        # A key may already be held when the wait starts, so the first resume attempt always checks.
+        self._key_event = register is not None
+
+    @property
+    def blocked(self) -> bool:
+        """Whether the machine waits in FX0A and no key has been pressed since it last checked."""
+        return self._wait_for_key is not None and not self._key_event
+
+    def _on_key(self, value: int, pressed: bool) -> None:
+        if pressed:
+            self._key_event = True
+
+    def cycle(self) -> None:
+        if self._wait_for_key is not None:
+            self._resume_key_wait()
             return
         opcode = self.fetch_opcode()
-        self.execute_opcode(opcode, display)
+        self.execute_opcode(opcode)
+
+    def _resume_key_wait(self) -> bool:
+        register = self._wait_for_key
+        assert register is not None
+        if not self._key_event:
+            return False
+        self._key_event = False
+        keys = self.keyboard.state
+        if not keys:
+            return False
+        self.registers.V[register] = (keys & -keys).bit_length() - 1
+        self.wait_for_key = None
+        return True
+
+    def run_cycles(self, n: int) -> int:
+        ticks = self.instructions_per_tick
+        executed = 0
+        try:
+            while executed < n:
+                budget = self._batch_limit = n - executed
+                if ticks:
+                    budget = min(budget, self._tick_countdown)
+                if self._wait_for_key is None:
+                    done = self._run_batch(budget)
+                elif self._resume_key_wait():
+                    done = 1
+                else:
+                    # Nothing can press a key mid-call, so the rest of the budget is spent blocked.
+                    done = budget
+                executed += done
+                if ticks:
+                    self._count_ticks(done, ticks)
+        finally:
+            # An instruction raised: count what ran before it.
+            done = self._batch_progress
+            if done:
+                self._batch_progress = 0
+                executed += done
+                if ticks:
+                    self._count_ticks(done, ticks)
+            self.cycles += executed
+        return executed
+
+    def _count_ticks(self, done: int, ticks: int) -> None:
+        # A batch only runs past the tick with instructions that never touch the timers, so ticking
+        # after them ends in the same state as ticking in their midst.
+        self._tick_countdown -= done
+        while self._tick_countdown <= 0:
+            self.timers_60Hz()
+            self._tick_countdown += ticks
+
+    def run_until(self, predicate: t.Callable[["Chip8"], bool], *, max_cycles: int | None = None, step: int = 1) -> int:
+        executed = 0
+        while not predicate(self):
+            budget = step if max_cycles is None else min(step, max_cycles - executed)
+            if budget <= 0:
+                break
+            executed += self.run_cycles(budget)
+        return executed
+
+    def _interpret(self, n: int) -> int:
+        registers = self.registers
+        cache = self.decode_cache
+        entries = cache.entries
+        decode_at = self._decode_at
+        remaining = n
+        try:
+            while remaining:
+                remaining -= 1
+                pc = registers.PC
+                registers.PC = pc + 2
+                handler = entries[pc]
+                if handler is None:
+                    handler = decode_at(pc)
+                if handler():
+                    idle = self._idle_length
+                    if not idle:
+                        break
+                    # The loop comes back to this exact state every `idle` instructions, so skip whole iterations.
+                    self._idle_length = 0
+                    skipped = remaining - remaining % idle
+                    remaining -= skipped
+                    self.idle_cycles += skipped
+                    # Skipped instructions never reach the cache; the finally block counts them as lookups.
+                    cache.lookups -= skipped
+        except BaseException:
+            self._batch_progress = n - remaining - 1
+            raise
+        finally:
+            cache.lookups += n - remaining
+        return n - remaining
 
-    def execute_opcode(self, opcode: int, display: "Display") -> None:
+    def _decode_at(self, address: int) -> Handler:
+        ram = self.memory.memory
+        handler = self.decode(ram[address] << 8 | ram[address + 1])
+        if self.skip_idle:
+            loop = find_idle_loop(ram, address)
+            if loop is not None:
+                handler = self._idle_handler(address, loop, handler)
+        self.decode_cache.entries[address] = handler
+        self.decode_cache.misses += 1
+        return handler
+
+    def _idle_handler(self, address: int, loop: IdleLoop, handler: Handler) -> Handler:
+        """Wrap the handler heading an idle loop so it reports the loop instead of spinning through it."""
+        registers = self.registers
+        V = registers.V
+        length = loop.length
+        match loop.kind:
+            case "spin":
+
+                def spin() -> bool:
+                    registers.PC = address
+                    self._idle_length = length
+                    return True
+
+                return spin
+            case "timer":
+                ram = self.memory.memory
+                x = ram[address] & 0x0F
+                nn = ram[address + 3]
+
+                def wait_timer() -> bool | None:
+                    handler()
+                    if V[x] != nn:
+                        self._idle_length = length
+                        return True
+
+                return wait_timer
+            case "key":
+                resume = address + 2
+
+                def poll_key() -> bool | None:
+                    handler()
+                    if registers.PC == resume:
+                        self._idle_length = length
+                        return True
+
+                return poll_key
+
+    def decode(self, opcode: int) -> Handler:
         opcode_type = opcode & 0xF000
         if opcode_type in self.opcode_map:
-            self.opcode_map[opcode_type](opcode, display)
-        else:
-            raise ValueError(f"Unknown opcode: {opcode:04X}")
+            return self.opcode_map[opcode_type](opcode)
+        raise ValueError(f"Unknown opcode: {opcode:04X}")
+
+    def execute_opcode(self, opcode: int) -> None:
+        self.decode(opcode)()
 
     def fetch_opcode(self) -> int:
-        pc = self.registers.program_counter
-        opcode = int(self.memory[pc]) << 8 | int(self.memory[pc + 1])
-        self.registers.PC += 2
-        return opcode
+        registers = self.registers
+        ram = self.memory.memory
+        pc = registers.PC
+        registers.PC = pc + 2
+        return ram[pc] << 8 | ram[pc + 1]
+
+    def snapshot(self) -> bytes:
+        return savestate.snapshot(self)
+
+    def restore(self, data: bytes) -> None:
+        savestate.restore(self, data)
 
     def reset(self) -> None:
-        self.registers = Registers()
+        if self._beeping:
+            self.sound.stop()
+            self._beeping = False
+        self.registers = RegisterFile()
         self.memory = Memory()
-        self.stack = array.array("H", [0] * 16)
         self.keyboard = Keyboard()
+        self.keyboard.add_listener(self._on_key)
+        self._attach_engine()
+        self.framebuffer.clear()
         self.wait_for_key = None
+        self.cycles = 0
+        self.idle_cycles = 0
+        self._idle_length = 0
+        self._batch_progress = 0
+        self._tick_countdown = self.instructions_per_tick or 0
+        self.random.seed(self.seed)
         self.memory.load_rom(self.rom_path)
@@ -0,0 +1,47 @@
+import typing as t
+
+type Handler = t.Callable[[], bool | None]
+
+
+class DecodeCache:
+    """Per-address cache of decoded instruction handlers.
+
+    Each entry holds the handler for the opcode starting at that address with its operands already bound.
+    Writes to memory must be reported through :meth:`invalidate` so self-modifying programs stay correct.
+    """
+
+    def __init__(self, size: int, *, lookbehind: int = 1) -> None:
+        self.entries: list[Handler | None] = [None] * size
+        self.lookbehind = lookbehind
+        self.lookups = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def hits(self) -> int:
+        return self.lookups - self.misses
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def invalidate(self, start: int, stop: int) -> None:
+        entries = self.entries
+        # An opcode spans two bytes, so a write also invalidates the instruction starting one byte earlier.
+        # Handlers that cover a longer pattern, such as an idle loop, raise the lookbehind.
+        for address in range(max(start - self.lookbehind, 0), min(stop, len(entries))):
+            if entries[address] is not None:
+                entries[address] = None
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        self.entries = [None] * len(self.entries)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hit_rate,
+        }
@@ -0,0 +1,103 @@
+__all__: tuple[str, ...] = ("disassemble", "pattern")
+
+
+def pattern(opcode: int) -> str:
+    """Return the opcode's pattern as written in instruction tables, e.g. ``8XY4`` or ``FX33``."""
+    n = opcode & 0x000F
+    nn = opcode & 0x00FF
+    match opcode >> 12:
+        case 0x0:
+            return {0x00E0: "00E0", 0x00EE: "00EE"}.get(opcode, "0NNN")
+        case 0x1 | 0x2 | 0xA | 0xB:
+            return f"{opcode >> 12:X}NNN"
+        case 0x3 | 0x4 | 0x6 | 0x7 | 0xC:
+            return f"{opcode >> 12:X}XNN"
+        case 0x5 | 0x9:
+            return f"{opcode >> 12:X}XY0"
+        case 0x8:
+            return f"8XY{n:X}"
+        case 0xD:
+            return "DXYN"
+        case _:
+            return f"{opcode >> 12:X}X{nn:02X}"
+
+
+def disassemble(opcode: int) -> str:
+    x = (opcode >> 8) & 0x0F
+    y = (opcode >> 4) & 0x0F
+    n = opcode & 0x000F
+    nn = opcode & 0x00FF
+    nnn = opcode & 0x0FFF
+    match pattern(opcode):
+        case "00E0":
+            return "CLS"
+        case "00EE":
+            return "RET"
+        case "0NNN":
+            return f"SYS 0x{nnn:03X}"
+        case "1NNN":
+            return f"JP 0x{nnn:03X}"
+        case "2NNN":
+            return f"CALL 0x{nnn:03X}"
+        case "3XNN":
+            return f"SE V{x:X}, 0x{nn:02X}"
+        case "4XNN":
+            return f"SNE V{x:X}, 0x{nn:02X}"
+        case "5XY0":
+            return f"SE V{x:X}, V{y:X}"
+        case "6XNN":
+            return f"LD V{x:X}, 0x{nn:02X}"
+        case "7XNN":
+            return f"ADD V{x:X}, 0x{nn:02X}"
+        case "8XY0":
+            return f"LD V{x:X}, V{y:X}"
+        case "8XY1":
+            return f"OR V{x:X}, V{y:X}"
+        case "8XY2":
+            return f"AND V{x:X}, V{y:X}"
+        case "8XY3":
+            return f"XOR V{x:X}, V{y:X}"
+        case "8XY4":
+            return f"ADD V{x:X}, V{y:X}"
+        case "8XY5":
+            return f"SUB V{x:X}, V{y:X}"
+        case "8XY6":
+            return f"SHR V{x:X}"
+        case "8XY7":
+            return f"SUBN V{x:X}, V{y:X}"
+        case "8XYE":
+            return f"SHL V{x:X}"
+        case "9XY0":
+            return f"SNE V{x:X}, V{y:X}"
+        case "ANNN":
+            return f"LD I, 0x{nnn:03X}"
+        case "BNNN":
+            return f"JP V0, 0x{nnn:03X}"
+        case "CXNN":
+            return f"RND V{x:X}, 0x{nn:02X}"
+        case "DXYN":
+            return f"DRW V{x:X}, V{y:X}, {n}"
+        case "EX9E":
+            return f"SKP V{x:X}"
+        case "EXA1":
+            return f"SKNP V{x:X}"
+        case "FX07":
+            return f"LD V{x:X}, DT"
+        case "FX0A":
+            return f"LD V{x:X}, K"
+        case "FX15":
+            return f"LD DT, V{x:X}"
+        case "FX18":
+            return f"LD ST, V{x:X}"
+        case "FX1E":
+            return f"ADD I, V{x:X}"
+        case "FX29":
+            return f"LD F, V{x:X}"
+        case "FX33":
+            return f"LD B, V{x:X}"
+        case "FX55":
+            return f"LD [I], V{x:X}"
+        case "FX65":
+            return f"LD V{x:X}, [I]"
+        case _:
+            return f"DW 0x{opcode:04X}"
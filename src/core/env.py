@@ -0,0 +1,290 @@
+"""Gym-style environments over the core, for agents that act on the keypad and observe the framebuffer.
+
+Observations are NumPy views over storage the environment owns and overwrites on every step, so stepping
+never builds a per-pixel Python list. Copy an observation to keep it past the next step.
+"""
+
+import itertools
+import multiprocessing
+import multiprocessing.connection
+import pathlib
+import typing as t
+from multiprocessing import shared_memory
+
+import numpy as np
+import numpy.typing as npt
+
+from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_DISPLAY_HEIGHT, CHIP_8_DISPLAY_WIDTH
+from src.core.chip8 import Chip8, Engine
+from src.core.scheduler import FrameScheduler
+
+__all__: tuple[str, ...] = ("Chip8Env", "Chip8VectorEnv", "Observation")
+
+type Observation = t.Literal["pixels", "packed"]
+type Reward = t.Callable[[Chip8], float]
+type Array = npt.NDArray[np.uint8]
+
+SHAPES: dict[Observation, tuple[int, int]] = {
+    "pixels": (CHIP_8_DISPLAY_HEIGHT, CHIP_8_DISPLAY_WIDTH),
+    "packed": (CHIP_8_DISPLAY_HEIGHT, CHIP_8_DISPLAY_WIDTH // 8),
+}
+
+
+class Chip8Env:
+    """One machine driven a step at a time: each step holds a keypad mask for ``frame_skip`` frames.
+
+    A frame runs the instructions owed at ``cpu_clock`` and ticks the timers once, exactly as
+    :class:`~src.core.scheduler.FrameScheduler` does, but without pacing. The observation is the framebuffer
+    either as ``(32, 64)`` pixels of 0 or 1, or ``packed`` as ``(32, 8)`` bytes with the leftmost pixel in
+    the most significant bit. ``buffer`` lets the caller supply the storage behind it, e.g. shared memory.
+
+    An instruction that raises ends the episode: ``step`` reports it as terminated with the error in
+    ``info["error"]``. ``reward`` scores the machine after each step and defaults to always 0.
+    """
+
+    def __init__(
+        self,
+        rom_path: str | pathlib.Path,
+        *,
+        frame_skip: int = 1,
+        max_steps: int | None = None,
+        observation: Observation = "pixels",
+        engine: Engine = "interpreter",
+        cpu_clock: int = CHIP_8_CPU_CLOCK,
+        reward: Reward | None = None,
+        buffer: memoryview | bytearray | None = None,
+    ) -> None:
+        if frame_skip < 1:
+            raise ValueError(f"frame_skip must be at least 1, got {frame_skip}.")
+        self.chip = Chip8(rom_path, instructions_per_tick=None, engine=engine)
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.observation = observation
+        self.cpu_clock = cpu_clock
+        self.reward = reward
+        self.shape = SHAPES[observation]
+        size = self.shape[0] * self.shape[1]
+        if buffer is None:
+            buffer = bytearray(size)
+        if len(buffer) != size:
+            raise ValueError(f"Observation buffer must be {size} bytes, got {len(buffer)}.")
+        self._storage: Array = np.frombuffer(buffer, dtype=np.uint8).reshape(self.shape)
+        self._observation = self._storage.view()
+        self._observation.flags.writeable = False
+        self._version = -1
+        self.steps = 0
+        self.done = False
+        self.scheduler = FrameScheduler(self.chip, cpu_clock=cpu_clock)
+
+    def _observe(self) -> Array:
+        framebuffer = self.chip.framebuffer
+        if framebuffer.version != self._version:
+            self._version = framebuffer.version
+            packed = np.frombuffer(framebuffer.to_bytes(), dtype=np.uint8).reshape(SHAPES["packed"])
+            if self.observation == "packed":
+                self._storage[...] = packed
+            else:
+                self._storage[...] = np.unpackbits(packed, axis=1)
+        return self._observation
+
+    def _info(self) -> dict[str, t.Any]:
+        return {"cycles": self.chip.cycles, "frames": self.scheduler.frames, "error": None}
+
+    def reset(self, seed: int | None = None) -> tuple[Array, dict[str, t.Any]]:
+        """Start a new episode; with no ``seed`` the machine's RNG restarts from the previous seed."""
+        chip = self.chip
+        if seed is not None:
+            chip.seed = seed
+        chip.reset()
+        self.scheduler = FrameScheduler(chip, cpu_clock=self.cpu_clock)
+        self.steps = 0
+        self.done = False
+        self._version = -1
+        return self._observe(), self._info()
+
+    def step(
+        self, action_mask: int, frame_skip: int | None = None
+    ) -> tuple[Array, float, bool, bool, dict[str, t.Any]]:
+        """Hold ``action_mask`` on the keypad for ``frame_skip`` frames.
+
+        Returns ``(observation, reward, terminated, truncated, info)``.
+        """
+        if self.done:
+            raise RuntimeError("Episode is over; call reset() first.")
+        self.chip.keyboard.set_state(action_mask)
+        run_frame = self.scheduler.run_frame
+        info = self._info()
+        terminated = False
+        try:
+            for _ in range(frame_skip or self.frame_skip):
+                run_frame()
+        except (ValueError, IndexError) as exc:
+            terminated = True
+            info["error"] = f"{type(exc).__name__}: {exc}"
+        self.steps += 1
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        self.done = terminated or truncated
+        info["cycles"] = self.chip.cycles
+        info["frames"] = self.scheduler.frames
+        reward = self.reward(self.chip) if self.reward is not None else 0.0
+        return self._observe(), reward, terminated, truncated, info
+
+
+def _run_envs(
+    connection: multiprocessing.connection.Connection,
+    block: memoryview,
+    first: int,
+    roms: list[str | pathlib.Path],
+    options: dict[str, t.Any],
+) -> None:
+    shape = SHAPES[options["observation"]]
+    size = shape[0] * shape[1]
+    envs = [
+        Chip8Env(rom, buffer=block[(first + i) * size : (first + i + 1) * size], **options)
+        for i, rom in enumerate(roms)
+    ]
+    try:
+        while True:
+            command, *args = connection.recv()
+            if command == "reset":
+                (seeds,) = args
+                connection.send([env.reset(seed)[1] for env, seed in zip(envs, seeds)])
+            elif command == "step":
+                actions, frame_skip = args
+                results: list[tuple[float, bool, bool, dict[str, t.Any]]] = []
+                for env, action in zip(envs, actions):
+                    _, reward, terminated, truncated, info = env.step(action, frame_skip)
+                    if terminated or truncated:
+                        # Start the next episode right away; the observation returned is its first frame.
+                        info["final_observation"] = env._storage.copy()
+                        env.reset()
+                    results.append((reward, terminated, truncated, info))
+                connection.send(results)
+            else:
+                return
+    except (EOFError, KeyboardInterrupt):
+        return
+
+
+def _serve_envs(
+    connection: multiprocessing.connection.Connection,
+    memory_name: str,
+    first: int,
+    roms: list[str | pathlib.Path],
+    options: dict[str, t.Any],
+) -> None:
+    memory = shared_memory.SharedMemory(memory_name)
+    assert memory.buf is not None
+    _run_envs(connection, memory.buf, first, roms, options)
+    # The environments' arrays were views of the block; it can only close once they are gone.
+    memory.close()
+
+
+class Chip8VectorEnv:
+    """``len(roms)`` environments spread over ``workers`` processes, observed through shared memory.
+
+    :attr:`observations` is one ``(N, *shape)`` array over a shared block that every worker writes its
+    environments' frames into, so a step moves only actions, rewards and flags between processes. An
+    environment whose episode ends is reset in its worker and its next observation is the new episode's
+    first frame; the last frame of the old one is in its info as ``final_observation``.
+
+    ``reward`` is sent to the workers, so it must be picklable: a module-level function, not a lambda.
+    """
+
+    def __init__(
+        self,
+        roms: t.Sequence[str | pathlib.Path],
+        *,
+        workers: int | None = None,
+        frame_skip: int = 1,
+        max_steps: int | None = None,
+        observation: Observation = "pixels",
+        engine: Engine = "interpreter",
+        cpu_clock: int = CHIP_8_CPU_CLOCK,
+        reward: Reward | None = None,
+    ) -> None:
+        self.num_envs = len(roms)
+        if not self.num_envs:
+            raise ValueError("At least one environment is needed.")
+        workers = min(workers or multiprocessing.cpu_count(), self.num_envs)
+        self.shape = SHAPES[observation]
+        size = self.shape[0] * self.shape[1]
+        self._memory = shared_memory.SharedMemory(create=True, size=size * self.num_envs)
+        self.observations: Array = np.ndarray((self.num_envs, *self.shape), dtype=np.uint8, buffer=self._memory.buf)
+        self.observations.flags.writeable = False
+        options: dict[str, t.Any] = {
+            "frame_skip": frame_skip,
+            "max_steps": max_steps,
+            "observation": observation,
+            "engine": engine,
+            "cpu_clock": cpu_clock,
+            "reward": reward,
+        }
+        bounds = [self.num_envs * i // workers for i in range(workers + 1)]
+        self._slices = [slice(start, stop) for start, stop in itertools.pairwise(bounds)]
+        self._connections: list[multiprocessing.connection.Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        for part in self._slices:
+            connection, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve_envs,
+                args=(child, self._memory.name, part.start, list(roms[part]), options),
+                daemon=True,
+            )
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+        self.closed = False
+
+    def reset(self, seed: int | None = None) -> tuple[Array, list[dict[str, t.Any]]]:
+        """Reset every environment, environment ``i`` with ``seed + i`` when a seed is given."""
+        seeds = [None if seed is None else seed + i for i in range(self.num_envs)]
+        for connection, part in zip(self._connections, self._slices):
+            connection.send(("reset", seeds[part]))
+        infos: list[dict[str, t.Any]] = []
+        for connection in self._connections:
+            infos.extend(connection.recv())
+        return self.observations, infos
+
+    def step(
+        self, actions: t.Sequence[int] | npt.NDArray[np.integer[t.Any]], frame_skip: int | None = None
+    ) -> tuple[Array, npt.NDArray[np.float64], npt.NDArray[np.bool_], npt.NDArray[np.bool_], list[dict[str, t.Any]]]:
+        """Step every environment with its own keypad mask; returns batched ``step`` results."""
+        if len(actions) != self.num_envs:
+            raise ValueError(f"Expected {self.num_envs} actions, got {len(actions)}.")
+        masks = [int(action) for action in actions]
+        for connection, part in zip(self._connections, self._slices):
+            connection.send(("step", masks[part], frame_skip))
+        results: list[tuple[float, bool, bool, dict[str, t.Any]]] = []
+        for connection in self._connections:
+            results.extend(connection.recv())
+        rewards = np.array([result[0] for result in results], dtype=np.float64)
+        terminated = np.array([result[1] for result in results], dtype=np.bool_)
+        truncated = np.array([result[2] for result in results], dtype=np.bool_)
+        return self.observations, rewards, terminated, truncated, [result[3] for result in results]
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        for connection in self._connections:
+            try:
+                connection.send(("close",))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        del self.observations
+        self._memory.close()
+        self._memory.unlink()
+
+    def __enter__(self) -> t.Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -0,0 +1,77 @@
+from src.constants import CHIP_8_DISPLAY_HEIGHT, CHIP_8_DISPLAY_WIDTH
+
+
+class Framebuffer:
+    """Monochrome framebuffer stored as one integer per row.
+
+    The leftmost pixel of a row is its most significant bit, so an 8-pixel sprite row is drawn with a
+    single shift and XOR. ``rows`` is only ever mutated in place, so callers may hold on to it.
+    With ``wrap`` set, sprites wrap around the screen edges instead of being clipped.
+    """
+
+    def __init__(
+        self, width: int = CHIP_8_DISPLAY_WIDTH, height: int = CHIP_8_DISPLAY_HEIGHT, *, wrap: bool = False
+    ) -> None:
+        self.width = width
+        self.height = height
+        self.wrap = wrap
+        self.rows = [0] * height
+        self.version = 0
+        self._row_mask = (1 << width) - 1
+
+    def draw_sprite(self, x: int, y: int, sprite: bytes | bytearray | memoryview) -> bool:
+        rows = self.rows
+        width = self.width
+        height = self.height
+        collision = False
+        if self.wrap:
+            x %= width
+            y %= height
+            row_mask = self._row_mask
+            for i, byte in enumerate(sprite):
+                row = (y + i) % height
+                line = byte << (width - 8)
+                mask = (line >> x | line << (width - x)) & row_mask
+                if rows[row] & mask:
+                    collision = True
+                rows[row] ^= mask
+        elif x < width and y < height:
+            shift = width - 8 - x
+            for i, byte in enumerate(sprite[: height - y]):
+                mask = byte << shift if shift >= 0 else byte >> -shift
+                if rows[y + i] & mask:
+                    collision = True
+                rows[y + i] ^= mask
+        self.version += 1
+        return collision
+
+    def set_pixel(self, x: int, y: int, value: bool) -> None:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            bit = 1 << (self.width - 1 - x)
+            self.rows[y] = self.rows[y] | bit if value else self.rows[y] & ~bit
+            self.version += 1
+
+    def get_pixel(self, x: int, y: int) -> bool:
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return bool(self.rows[y] >> (self.width - 1 - x) & 1)
+        return False
+
+    def clear(self) -> None:
+        self.rows[:] = [0] * self.height
+        self.version += 1
+
+    def to_bytes(self) -> bytes:
+        row_bytes = self.width // 8
+        return b"".join([row.to_bytes(row_bytes, "big") for row in self.rows])
+
+    def load_bytes(self, data: bytes) -> None:
+        row_bytes = self.width // 8
+        if len(data) != row_bytes * self.height:
+            raise ValueError(f"Framebuffer data must be {row_bytes * self.height} bytes.")
+        self.rows[:] = [int.from_bytes(data[y * row_bytes : (y + 1) * row_bytes], "big") for y in range(self.height)]
+        self.version += 1
+
+    @property
+    def buffer(self) -> list[list[bool]]:
+        width = self.width
+        return [[bool(row >> (width - 1 - x) & 1) for x in range(width)] for row in self.rows]
@@ -0,0 +1,328 @@
+"""Coverage-guided fuzzing of a ROM through its input movies.
+
+An input is a :class:`~src.core.movie.Movie`: a seed for the random generator and a timeline of keypad
+changes. Each execution replays it headless for a fixed number of cycles while a tracer records every
+control-flow edge (the pair of consecutive instruction addresses) and the opcode patterns decoded. The
+4096-bit PC coverage bitmap follows from the edges. Inputs that reach new edges join the corpus and are
+mutated further; inputs that make an instruction raise are kept as crashes and replay the fault with
+``replay(movie, rom, verify=False)``.
+
+Workers share a corpus directory: each one saves what it finds there and periodically runs the entries
+the others saved, so coverage found by one worker seeds the mutations of all of them.
+"""
+
+import concurrent.futures
+import hashlib
+import os
+import pathlib
+import random
+import time
+
+import attrs
+
+from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_MEMORY_SIZE, CHIP_8_TIMER_CLOCK
+from src.core.chip8 import Chip8
+from src.core.disassembler import pattern
+from src.core.movie import Movie, replay, rom_hash
+
+__all__: tuple[str, ...] = (
+    "Coverage",
+    "CoverageTracer",
+    "Execution",
+    "FuzzStats",
+    "execute",
+    "fuzz",
+    "fuzz_worker",
+    "mutate",
+)
+
+CORPUS_SUFFIX = ".c8mv"
+# The edge into the first instruction comes from one past the end of memory, an address nothing runs at.
+ENTRY = CHIP_8_MEMORY_SIZE
+
+
+@attrs.define(slots=True, kw_only=True)
+class Coverage:
+    """Edges are ``source << 16 | target`` for every pair of consecutive instruction addresses."""
+
+    edges: set[int] = attrs.field(factory=lambda: set[int]())
+    variants: set[str] = attrs.field(factory=lambda: set[str]())
+
+    @property
+    def pcs(self) -> bytes:
+        """The 4096-bit bitmap of executed addresses, address 0 in the most significant bit."""
+        bitmap = bytearray(CHIP_8_MEMORY_SIZE // 8)
+        for edge in self.edges:
+            target = edge & 0xFFFF
+            bitmap[target >> 3] |= 0x80 >> (target & 7)
+        return bytes(bitmap)
+
+    @property
+    def addresses(self) -> int:
+        return len({edge & 0xFFFF for edge in self.edges})
+
+    def merge(self, other: "Coverage") -> bool:
+        """Add ``other`` to this coverage and return whether it held anything new."""
+        new = not other.edges <= self.edges or not other.variants <= self.variants
+        self.edges |= other.edges
+        self.variants |= other.variants
+        return new
+
+
+class CoverageTracer:
+    """Instrumented dispatch loop that records the coverage of everything a machine runs.
+
+    Like the profiler it replaces the machine's batch function, so it always interprets. Idle loops are
+    still skipped: a skipped iteration retraces edges the first one already recorded.
+    """
+
+    def __init__(self, chip: Chip8, coverage: Coverage | None = None) -> None:
+        self.chip = chip
+        self.coverage = coverage if coverage is not None else Coverage()
+        self._previous = ENTRY
+        chip._run_batch = self.run
+
+    def run(self, n: int) -> int:
+        chip = self.chip
+        registers = chip.registers
+        ram = chip.memory.memory
+        cache = chip.decode_cache
+        entries = cache.entries
+        decode_at = chip._decode_at
+        add_edge = self.coverage.edges.add
+        add_variant = self.coverage.variants.add
+        previous = self._previous
+        remaining = n
+        try:
+            while remaining:
+                remaining -= 1
+                pc = registers.PC
+                registers.PC = pc + 2
+                handler = entries[pc]
+                # Recorded before decoding so the edge into an unknown opcode counts as covered.
+                add_edge(previous << 16 | pc)
+                previous = pc
+                if handler is None:
+                    add_variant(pattern(ram[pc] << 8 | ram[pc + 1]))
+                    handler = decode_at(pc)
+                if handler():
+                    idle = chip._idle_length
+                    if not idle:
+                        break
+                    chip._idle_length = 0
+                    skipped = remaining - remaining % idle
+                    remaining -= skipped
+                    chip.idle_cycles += skipped
+                    # Skipped instructions never reach the cache; the finally block counts them as lookups.
+                    cache.lookups -= skipped
+        except BaseException:
+            chip._batch_progress = n - remaining - 1
+            raise
+        finally:
+            self._previous = previous
+            cache.lookups += n - remaining
+        return n - remaining
+
+
+@attrs.define(slots=True, kw_only=True)
+class Execution:
+    coverage: Coverage
+    cycles: int
+    error: str | None = None
+
+
+def execute(movie: Movie, rom_path: str | pathlib.Path) -> Execution:
+    """Replay ``movie`` with coverage tracing, reporting an instruction that raises instead of raising."""
+    tracers: list[CoverageTracer] = []
+    error = None
+    try:
+        # The very replay a crash is reproduced with, so what faults here faults there.
+        replay(movie, rom_path, verify=False, on_start=lambda chip: tracers.append(CoverageTracer(chip)))
+    except (ValueError, IndexError) as exc:
+        if not tracers:
+            raise
+        error = f"{type(exc).__name__}: {exc}"
+    (tracer,) = tracers
+    return Execution(coverage=tracer.coverage, cycles=tracer.chip.cycles, error=error)
+
+
+def mutate(movie: Movie, rng: random.Random, donor: Movie | None = None) -> Movie:
+    """Return a copy of ``movie`` with a random stack of mutations applied to its seed and key timeline.
+
+    With a ``donor`` one of them may splice in the donor's input from a random cycle on.
+    """
+    length = max(movie.length, 1)
+    seed = movie.seed
+    events = list(movie.events)
+    for _ in range(1 << rng.randrange(4)):
+        match rng.randrange(6 if donor is not None else 5):
+            case 0:
+                seed = rng.getrandbits(64)
+            case 1:
+                # Mostly a single key, sometimes a chord or all keys released.
+                mask = rng.choice((1 << rng.randrange(16), rng.getrandbits(16), 0))
+                events.append((rng.randrange(length), mask))
+            case 2 if events:
+                del events[rng.randrange(len(events))]
+            case 3 if events:
+                i = rng.randrange(len(events))
+                cycle, mask = events[i]
+                events[i] = (cycle, mask ^ 1 << rng.randrange(16))
+            case 4 if events:
+                i = rng.randrange(len(events))
+                cycle, mask = events[i]
+                shift = rng.randint(-CHIP_8_CPU_CLOCK, CHIP_8_CPU_CLOCK)
+                events[i] = (min(max(cycle + shift, 0), length - 1), mask)
+            case 5:
+                assert donor is not None
+                cut = rng.randrange(length)
+                events = [event for event in events if event[0] < cut]
+                events += [event for event in donor.events if cut <= event[0] < length]
+            case _:
+                pass
+    events.sort(key=lambda event: event[0])
+    return attrs.evolve(movie, seed=seed, events=events)
+
+
+@attrs.define(slots=True, kw_only=True)
+class FuzzStats:
+    executions: int = 0
+    elapsed: float = 0.0
+    coverage: Coverage = attrs.field(factory=Coverage)
+    corpus: int = 0
+    crashes: dict[str, str] = attrs.field(factory=lambda: dict[str, str]())
+
+    @property
+    def executions_per_second(self) -> float:
+        return self.executions / self.elapsed if self.elapsed else 0.0
+
+
+def _save(directory: pathlib.Path, movie: Movie) -> str:
+    data = movie.to_bytes()
+    name = hashlib.sha1(data).hexdigest()[:16] + CORPUS_SUFFIX
+    path = directory / name
+    if not path.exists():
+        # Other workers list the directory while this one writes, so files only appear complete.
+        partial = directory / f".{name}.{os.getpid()}"
+        partial.write_bytes(data)
+        partial.replace(path)
+    return name
+
+
+def fuzz_worker(
+    rom_path: str | pathlib.Path,
+    corpus_directory: str | pathlib.Path,
+    *,
+    seed: int = 0,
+    frames: int = 600,
+    executions: int | None = None,
+    duration: float | None = None,
+    sync_interval: float = 1.0,
+) -> FuzzStats:
+    """Fuzz one ROM until ``executions`` inputs ran or ``duration`` seconds passed, whichever comes first.
+
+    New inputs start at ``frames`` frames long. Inputs that add coverage are saved to the corpus
+    directory, crashes to its ``crashes`` subdirectory next to a ``.txt`` file with the error.
+    """
+    if executions is None and duration is None:
+        raise ValueError("Give a number of executions or a duration to fuzz for.")
+    corpus_directory = pathlib.Path(corpus_directory)
+    crash_directory = corpus_directory / "crashes"
+    crash_directory.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(seed)
+    rom = rom_hash(rom_path)
+    length = frames * CHIP_8_CPU_CLOCK // CHIP_8_TIMER_CLOCK
+    stats = FuzzStats()
+    queue: list[Movie] = []
+    known: set[str] = set()
+
+    def run(movie: Movie) -> None:
+        result = execute(movie, rom_path)
+        stats.executions += 1
+        new = stats.coverage.merge(result.coverage)
+        if result.error is not None:
+            if result.error not in stats.crashes:
+                name = _save(crash_directory, movie)
+                (crash_directory / name).with_suffix(".txt").write_text(result.error + "\n")
+                stats.crashes[result.error] = name
+        elif new:
+            queue.append(movie)
+            name = _save(corpus_directory, movie)
+            if name not in known:
+                known.add(name)
+                stats.corpus += 1
+
+    def sync() -> None:
+        for path in sorted(corpus_directory.glob(f"*{CORPUS_SUFFIX}")):
+            if path.name in known:
+                continue
+            known.add(path.name)
+            try:
+                movie = Movie.load(path)
+            except ValueError:
+                continue
+            if movie.rom_hash == rom:
+                result = execute(movie, rom_path)
+                stats.executions += 1
+                stats.coverage.merge(result.coverage)
+                queue.append(movie)
+
+    start = time.perf_counter()
+    sync()
+    if not queue:
+        run(Movie(rom_hash=rom, seed=seed, length=length))
+    if not queue:
+        # Even the empty input crashes; mutate it anyway in search of other faults.
+        queue.append(Movie(rom_hash=rom, seed=seed, length=length))
+    next_sync = start + sync_interval
+    while executions is None or stats.executions < executions:
+        now = time.perf_counter()
+        if duration is not None and now - start >= duration:
+            break
+        if now >= next_sync:
+            sync()
+            next_sync = now + sync_interval
+        run(mutate(rng.choice(queue), rng, rng.choice(queue)))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def fuzz(
+    rom_path: str | pathlib.Path,
+    corpus_directory: str | pathlib.Path,
+    *,
+    workers: int | None = None,
+    seed: int = 0,
+    frames: int = 600,
+    executions: int | None = None,
+    duration: float | None = None,
+) -> FuzzStats:
+    """Run :func:`fuzz_worker` on every worker process of a pool, worker ``i`` seeded ``seed + i``.
+
+    ``executions`` is per worker. The merged stats count every worker's executions over the wall time.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = FuzzStats()
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                fuzz_worker,
+                rom_path,
+                corpus_directory,
+                seed=seed + i,
+                frames=frames,
+                executions=executions,
+                duration=duration,
+            )
+            for i in range(workers)
+        ]
+        for future in futures:
+            result = future.result()
+            stats.executions += result.executions
+            stats.corpus += result.corpus
+            stats.coverage.merge(result.coverage)
+            for error, name in result.crashes.items():
+                stats.crashes.setdefault(error, name)
+    stats.elapsed = time.perf_counter() - start
+    return stats
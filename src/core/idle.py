@@ -0,0 +1,43 @@
+"""Recognition of loops that make no progress until a timer tick or a key changes.
+
+Timers only tick and keys only change between batches of instructions, so inside a batch such a loop
+returns to the exact same machine state every iteration and whole iterations can be skipped.
+"""
+
+import typing as t
+
+import attrs
+
+__all__: tuple[str, ...] = ("MAX_LOOP_BYTES", "IdleLoop", "find_idle_loop")
+
+MAX_LOOP_BYTES = 6
+
+
+@attrs.define(slots=True, frozen=True, kw_only=True)
+class IdleLoop:
+    kind: t.Literal["spin", "timer", "key"]
+    length: int
+    size: int
+
+
+def find_idle_loop(ram: bytes | bytearray, address: int) -> IdleLoop | None:
+    """Return the idle loop headed by the instruction at ``address``, if there is one.
+
+    Recognised loops are ``1NNN`` jumping to itself, ``FX07 / 3XNN / 1NNN`` waiting on the delay timer
+    and ``EX9E / 1NNN`` or ``EXA1 / 1NNN`` polling a key.
+    """
+
+    def opcode_at(offset: int) -> int:
+        at = address + offset
+        return ram[at] << 8 | ram[at + 1] if at + 1 < len(ram) else -1
+
+    head = opcode_at(0)
+    back = 0x1000 | address
+    if head == back:
+        return IdleLoop(kind="spin", length=1, size=2)
+    x = head & 0x0F00
+    if head & 0xF0FF == 0xF007 and opcode_at(2) & 0xFF00 == 0x3000 | x and opcode_at(4) == back:
+        return IdleLoop(kind="timer", length=3, size=6)
+    if head & 0xF0FF in (0xE09E, 0xE0A1) and opcode_at(2) == back:
+        return IdleLoop(kind="key", length=2, size=4)
+    return None
@@ -8,13 +8,29 @@ else:
     type ValueT = attrs.Attribute
 
 
+type KeyListener = t.Callable[[int, bool], None]
+type KeyEvent = tuple[int, bool]
+
+
 @attrs.define(slots=True, kw_only=True)
 class Key:
+    """One key of a :class:`Keyboard`; its pressed state lives in the keyboard's bitmask."""
+
     name: str
     value: int = attrs.field(
         default=0, validator=[attrs.validators.instance_of(int), attrs.validators.ge(0), attrs.validators.le(15)]
     )
-    pressed: bool = attrs.field(default=False, validator=attrs.validators.instance_of(bool))
+    keyboard: "Keyboard" = attrs.field(repr=False, eq=False)
+
+    @property
+    def pressed(self) -> bool:
+        return bool(self.keyboard.state >> self.value & 1)
+
+    @pressed.setter
+    def pressed(self, pressed: bool) -> None:
+        if not isinstance(pressed, bool):  # pyright: ignore[reportUnnecessaryIsInstance]
+            raise TypeError(f"'pressed' must be {bool!r} (got {pressed!r} that is a {type(pressed)!r}).")
+        self.keyboard.set_key(self.value, pressed)
 
     def __str__(self) -> str:
         return self.name.replace("KEY", "")
@@ -25,20 +41,67 @@ class Key:
 
 @attrs.define(slots=True, kw_only=True)
 class Keyboard:
-    keymap: dict[str, Key] = attrs.field(
-        factory=lambda: {f"KEY{i:X}": Key(name=f"KEY{i:X}", value=i) for i in range(16)}
+    """Hex keypad held as a 16-bit mask in which bit ``n`` is set while key ``n`` is down."""
+
+    _state: int = attrs.field(
+        default=0, validator=[attrs.validators.instance_of(int), attrs.validators.ge(0), attrs.validators.le(0xFFFF)]
     )
+    keymap: dict[str, Key] = attrs.field(init=False, repr=False, eq=False)
+    _listeners: list[KeyListener] = attrs.field(factory=lambda: list[KeyListener](), init=False, repr=False, eq=False)
+
+    def __attrs_post_init__(self) -> None:
+        self.keymap = {f"KEY{i:X}": Key(name=f"KEY{i:X}", value=i, keyboard=self) for i in range(16)}
 
     def __getattr__(self, name: str) -> Key:
         if name in self.keymap:
             return self.keymap[name]
         raise AttributeError(f"Key '{name}' not found.")
 
+    def add_listener(self, listener: KeyListener) -> None:
+        """Call ``listener(value, pressed)`` whenever a key goes down or up."""
+        self._listeners.append(listener)
+
+    @property
+    def state(self) -> int:
+        return self._state
+
     def is_key_pressed(self, value: int) -> bool:
         if 0 <= value < 16:
-            return self.keymap[f"KEY{value:X}"].pressed
+            return bool(self._state >> value & 1)
         raise ValueError(f"Key value {value} out of range (0-15).")
 
+    def set_key(self, value: int, pressed: bool) -> None:
+        if not 0 <= value < 16:
+            raise ValueError(f"Key value {value} out of range (0-15).")
+        self.set_state(self._state | 1 << value if pressed else self._state & ~(1 << value))
+
+    def press(self, value: int) -> None:
+        self.set_key(value, True)
+
+    def release(self, value: int) -> None:
+        self.set_key(value, False)
+
+    def set_state(self, mask: int) -> None:
+        """Replace the whole keypad at once, notifying listeners of every key that changed."""
+        if not 0 <= mask <= 0xFFFF:
+            raise ValueError(f"Key mask {mask:#x} out of range (0-0xFFFF).")
+        changed = self._state ^ mask
+        self._state = mask
+        while changed:
+            value = (changed & -changed).bit_length() - 1
+            changed &= changed - 1
+            for listener in self._listeners:
+                listener(value, bool(mask >> value & 1))
+
+    def apply_events(self, events: t.Iterable[KeyEvent]) -> None:
+        """Apply ``(value, pressed)`` transitions in order as a single update of the keypad."""
+        mask = self._state
+        for value, pressed in events:
+            if not 0 <= value < 16:
+                raise ValueError(f"Key value {value} out of range (0-15).")
+            mask = mask | 1 << value if pressed else mask & ~(1 << value)
+        self.set_state(mask)
+
     @property
     def keys(self) -> list[list[Key]]:
         return [
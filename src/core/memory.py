@@ -1,4 +1,5 @@
 import pathlib
+import typing as t
 
 from src.constants import (
     CHIP_8_FONTSET,
@@ -6,37 +7,86 @@ from src.constants import (
     CHIP_8_ROM_START,
 )
 
+_rom_images: dict[pathlib.Path, tuple[int, int, bytes]] = {}
+
+
+def read_rom(rom_path: str | pathlib.Path) -> bytes:
+    """Return a ROM's bytes, reading the file again only when its mtime or size changed."""
+    path = pathlib.Path(rom_path).resolve()
+    stat = path.stat()
+    cached = _rom_images.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+    data = path.read_bytes()
+    _rom_images[path] = (stat.st_mtime_ns, stat.st_size, data)
+    return data
+
 
 class Memory:
+    """4 KiB of RAM.
+
+    Item access validates its arguments and is meant for callers outside the core. The interpreter
+    uses :meth:`read`, :meth:`write` and the raw ``memory`` bytearray, which skip those checks.
+    """
+
     def __init__(self, size: int = CHIP_8_MEMORY_SIZE) -> None:
         self.size = size
         self.memory = bytearray(size)
+        # The exported view also pins the bytearray's size: a write that would resize it raises BufferError.
+        self.view = memoryview(self.memory)
+        self._write_listeners: list[t.Callable[[int, int], None]] = []
         self._load_fontset()
 
+    def add_write_listener(self, listener: t.Callable[[int, int], None]) -> None:
+        self._write_listeners.append(listener)
+
+    def _notify_write(self, start: int, stop: int) -> None:
+        for listener in self._write_listeners:
+            listener(start, stop)
+
     def _load_fontset(self) -> None:
         for i, font in enumerate(CHIP_8_FONTSET):
             self.memory[i * 5 : (i + 1) * 5] = bytearray(font)
 
     def load_rom(self, rom_path: str | pathlib.Path) -> None:
-        with open(rom_path, "rb") as rom_file:
-            rom_data = rom_file.read()
-            if len(rom_data) + CHIP_8_ROM_START > self.size:
-                raise ValueError("ROM size exceeds memory limit.")
-            self.memory[CHIP_8_ROM_START : CHIP_8_ROM_START + len(rom_data)] = rom_data
+        rom_data = read_rom(rom_path)
+        if len(rom_data) + CHIP_8_ROM_START > self.size:
+            raise ValueError("ROM size exceeds memory limit.")
+        self.write(CHIP_8_ROM_START, rom_data)
+
+    def read(self, address: int, size: int) -> memoryview:
+        """Return a zero-copy view of ``size`` bytes, cut short at the end of memory."""
+        return self.view[address : address + size]
+
+    def write(self, address: int, data: bytes | bytearray | memoryview) -> None:
+        """Copy ``data`` in at ``address`` without validating it.
+
+        Bytes past the end of memory are not written and raise IndexError after the rest is stored.
+        """
+        stop = min(address + len(data), self.size)
+        self.view[address:stop] = data[: stop - address]
+        self._notify_write(address, stop)
+        if stop - address < len(data):
+            raise IndexError(f"Memory write out of range at 0x{stop:03X}")
 
     def __getitem__(self, index: int | slice) -> int | bytearray:
-        if isinstance(index, slice):
-            return self.memory[index]
         return self.memory[index]
 
     def __setitem__(self, index: int | slice, value: int | bytes | bytearray) -> None:
         if isinstance(index, slice):
             if not isinstance(value, (bytes, bytearray)):
                 raise TypeError("Slice assignment requires a bytes or bytearray value.")
+            written = range(*index.indices(self.size))
+            if len(value) != len(written):
+                raise ValueError(f"Slice assignment needs {len(written)} bytes, got {len(value)}.")
             self.memory[index] = value
+            if written:
+                self._notify_write(min(written), max(written) + 1)
         else:
             if not isinstance(value, int):
                 raise TypeError("Memory value must be an integer.")
             if not (0 <= value <= 0xFF):
                 raise ValueError("Memory value must be between 0 and 255.")
             self.memory[index] = value
+            address = index % self.size
+            self._notify_write(address, address + 1)
@@ -0,0 +1,174 @@
+"""Deterministic input movies.
+
+A movie is the seed and timing a session booted with plus every change of the keypad, stamped with the
+cycle count at which it happened. Keys only change between frames and the random generator is seeded,
+so replaying the changes at the same cycles reproduces the session exactly, without a window and at full
+speed. A SHA-1 of the final save state is stored so a replay can prove it ended where the recording did.
+"""
+
+import hashlib
+import pathlib
+import struct
+import typing as t
+
+import attrs
+
+from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_TIMER_CLOCK
+from src.core.chip8 import Chip8, Engine
+from src.core.memory import read_rom
+from src.core.scheduler import FrameScheduler
+
+__all__: tuple[str, ...] = ("VERSION", "Movie", "MovieRecorder", "replay", "rom_hash")
+
+MAGIC = b"C8MV"
+VERSION = 1
+NO_DIGEST = bytes(20)
+
+HEADER = struct.Struct(
+    "<"
+    "4sH"  # magic, version
+    "20sQ"  # ROM SHA-1, RNG seed
+    "II"  # CPU clock, frame rate
+    "QI"  # length in cycles, event count
+    "20s"  # SHA-1 of the final save state
+)
+EVENT = struct.Struct("<QH")  # cycle, pressed keys bitmask
+
+
+def rom_hash(path: str | pathlib.Path) -> bytes:
+    return hashlib.sha1(read_rom(path)).digest()
+
+
+@attrs.define(slots=True, kw_only=True)
+class Movie:
+    rom_hash: bytes
+    seed: int = attrs.field(validator=[attrs.validators.ge(0), attrs.validators.lt(1 << 64)])
+    cpu_clock: int = CHIP_8_CPU_CLOCK
+    frame_rate: int = CHIP_8_TIMER_CLOCK
+    length: int = 0
+    events: list[tuple[int, int]] = attrs.field(factory=lambda: list[tuple[int, int]]())
+    digest: bytes = NO_DIGEST
+
+    def to_bytes(self) -> bytes:
+        header = HEADER.pack(
+            MAGIC,
+            VERSION,
+            self.rom_hash,
+            self.seed,
+            self.cpu_clock,
+            self.frame_rate,
+            self.length,
+            len(self.events),
+            self.digest,
+        )
+        return header + b"".join([EVENT.pack(cycle, mask) for cycle, mask in self.events])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "Movie":
+        if len(data) < HEADER.size:
+            raise ValueError("Movie file is truncated.")
+        magic, version, rom, seed, cpu_clock, frame_rate, length, count, digest = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a CHIP-8 movie.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported movie version {version} (expected {VERSION}).")
+        if len(data) != HEADER.size + count * EVENT.size:
+            raise ValueError(f"Movie header announces {count} events but the file does not hold them.")
+        events = [tuple(event) for event in EVENT.iter_unpack(data[HEADER.size :])]
+        return cls(
+            rom_hash=rom,
+            seed=seed,
+            cpu_clock=cpu_clock,
+            frame_rate=frame_rate,
+            length=length,
+            events=t.cast(list[tuple[int, int]], events),
+            digest=digest,
+        )
+
+    def save(self, path: str | pathlib.Path) -> None:
+        path = pathlib.Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: str | pathlib.Path) -> "Movie":
+        return cls.from_bytes(pathlib.Path(path).read_bytes())
+
+
+class MovieRecorder:
+    """Records the keypad of a machine driven by ``scheduler`` from the moment it booted.
+
+    Call :meth:`capture` after input has been handled and before the next frame runs.
+    """
+
+    def __init__(self, chip: Chip8, scheduler: FrameScheduler) -> None:
+        if chip.seed is None:
+            raise ValueError("Recording a movie needs a machine with a fixed seed.")
+        if chip.cycles:
+            raise ValueError("Recording a movie has to start from a freshly booted machine.")
+        self.chip = chip
+        self.movie = Movie(
+            rom_hash=rom_hash(chip.rom_path),
+            seed=chip.seed,
+            cpu_clock=scheduler.cpu_clock,
+            frame_rate=scheduler.frame_rate,
+        )
+        self._mask = chip.keyboard.state
+
+    def capture(self) -> None:
+        mask = self.chip.keyboard.state
+        if mask != self._mask:
+            self.movie.events.append((self.chip.cycles, mask))
+            self._mask = mask
+
+    def truncate(self) -> None:
+        """Forget input from the machine's current cycle on, e.g. after rewinding."""
+        cycle = self.chip.cycles
+        events = self.movie.events
+        while events and events[-1][0] >= cycle:
+            events.pop()
+        self._mask = self.chip.keyboard.state
+
+    def finish(self) -> Movie:
+        self.capture()
+        self.movie.length = self.chip.cycles
+        self.movie.digest = hashlib.sha1(self.chip.snapshot()).digest()
+        return self.movie
+
+
+def replay(
+    movie: Movie,
+    rom_path: str | pathlib.Path,
+    *,
+    engine: Engine = "interpreter",
+    verify: bool = True,
+    on_start: t.Callable[[Chip8], object] | None = None,
+    on_frame: t.Callable[[Chip8], object] | None = None,
+) -> Chip8:
+    """Replay ``movie`` headless and uncapped and return the machine in its final state.
+
+    ``on_start`` is called with the new machine before its first frame, e.g. to attach a tracer, and
+    ``on_frame`` with the machine after every frame. With ``verify`` set, a machine that does not end in the
+    recorded state raises ValueError.
+    """
+    if rom_hash(rom_path) != movie.rom_hash:
+        raise ValueError(f"{rom_path} is not the ROM this movie was recorded with.")
+    chip = Chip8(rom_path, instructions_per_tick=None, engine=engine, seed=movie.seed)
+    # Frames are run exactly as the window's scheduler ran them, so timers tick on the same cycles.
+    scheduler = FrameScheduler(chip, cpu_clock=movie.cpu_clock, frame_rate=movie.frame_rate, turbo=True)
+    if on_start is not None:
+        on_start(chip)
+    events = movie.events
+    index = 0
+    while chip.cycles < movie.length:
+        while index < len(events) and events[index][0] <= chip.cycles:
+            chip.keyboard.set_state(events[index][1])
+            index += 1
+        scheduler.run_frame()
+        if on_frame is not None:
+            on_frame(chip)
+    for _, mask in events[index:]:
+        chip.keyboard.set_state(mask)
+    if verify and movie.digest != NO_DIGEST and hashlib.sha1(chip.snapshot()).digest() != movie.digest:
+        raise ValueError(f"Replay diverged from the recording after {chip.cycles} cycles.")
+    return chip
@@ -0,0 +1,120 @@
+import array
+import collections
+import time
+import typing as t
+
+from src.core.disassembler import disassemble, pattern
+
+if t.TYPE_CHECKING:
+    from src.core.chip8 import Chip8
+
+__all__: tuple[str, ...] = ("Profiler",)
+
+
+def _row(label: str, count: int, elapsed: int, total: int) -> str:
+    return f"{label:<8}{count:>14,}{count / total:>9.1%}{elapsed / 1e6:>12.2f}{elapsed / count:>9.0f}"
+
+
+class Profiler:
+    """Instrumented dispatch loop that counts and times every instruction it runs.
+
+    It replaces the engine's batch function while profiling is on, so an unprofiled machine runs the
+    plain loop with no extra checks. Profiling always interprets, even on the recompiler engine, because
+    compiled blocks have no per-instruction boundaries to measure.
+    """
+
+    def __init__(self, chip: "Chip8") -> None:
+        self.chip = chip
+        self.hits = array.array("Q", bytes(8 * chip.memory.size))
+        self.counts: collections.Counter[str] = collections.Counter()
+        self.times: collections.Counter[str] = collections.Counter()
+        self._patterns: dict[int, str] = {}
+
+    def run(self, n: int) -> int:
+        chip = self.chip
+        registers = chip.registers
+        ram = chip.memory.memory
+        cache = chip.decode_cache
+        entries = cache.entries
+        decode_at = chip._decode_at
+        hits = self.hits
+        counts = self.counts
+        times = self.times
+        patterns = self._patterns
+        clock = time.perf_counter_ns
+        remaining = n
+        try:
+            while remaining:
+                remaining -= 1
+                pc = registers.PC
+                registers.PC = pc + 2
+                handler = entries[pc]
+                if handler is None:
+                    handler = decode_at(pc)
+                opcode = ram[pc] << 8 | ram[pc + 1]
+                key = patterns.get(opcode)
+                if key is None:
+                    key = patterns[opcode] = pattern(opcode)
+                hits[pc] += 1
+                start = clock()
+                stop = handler()
+                times[key] += clock() - start
+                counts[key] += 1
+                if stop:
+                    if not chip._idle_length:
+                        break
+                    # Idle loops are profiled instruction by instruction instead of being skipped.
+                    chip._idle_length = 0
+        except BaseException:
+            chip._batch_progress = n - remaining - 1
+            raise
+        finally:
+            cache.lookups += n - remaining
+        return n - remaining
+
+    @property
+    def calls(self) -> int:
+        return self.counts["2NNN"]
+
+    @property
+    def returns(self) -> int:
+        return self.counts["00EE"]
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    def families(self) -> dict[str, tuple[int, int]]:
+        """Aggregate (count, nanoseconds) per opcode family, keyed by its leading digit."""
+        families: dict[str, tuple[int, int]] = {}
+        for key, count in self.counts.items():
+            family_count, family_time = families.get(key[0], (0, 0))
+            families[key[0]] = (family_count + count, family_time + self.times[key])
+        return families
+
+    def hot_addresses(self, top: int = 20) -> list[tuple[int, int]]:
+        hits = self.hits
+        return sorted(((address, count) for address, count in enumerate(hits) if count), key=lambda hit: -hit[1])[:top]
+
+    def report(self, top: int = 20) -> str:
+        total = self.total or 1
+        ram = self.chip.memory.memory
+        lines = [f"{self.total:,} instructions, {self.calls:,} calls, {self.returns:,} returns", ""]
+        lines.append(f"{'family':<8}{'count':>14}{'share':>9}{'total ms':>12}{'ns/op':>9}")
+        for family, (count, elapsed) in sorted(self.families().items(), key=lambda item: -item[1][1]):
+            lines.append(_row(f"{family}XXX", count, elapsed, total))
+        lines.append("")
+        lines.append(f"{'opcode':<8}{'count':>14}{'share':>9}{'total ms':>12}{'ns/op':>9}")
+        for key, count in sorted(self.counts.items(), key=lambda item: -self.times[item[0]]):
+            lines.append(_row(key, count, self.times[key], total))
+        lines.append("")
+        lines.append(f"{'address':<9}{'hits':>14}{'share':>9}  instruction")
+        for address, count in self.hot_addresses(top):
+            opcode = ram[address] << 8 | ram[(address + 1) % len(ram)]
+            lines.append(f"0x{address:03X}   {count:>14,}{count / total:>9.1%}  {opcode:04X}  {disassemble(opcode)}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        self.hits = array.array("Q", bytes(8 * len(self.hits)))
+        self.counts.clear()
+        self.times.clear()
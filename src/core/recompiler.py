@@ -0,0 +1,338 @@
+import typing as t
+
+import attrs
+
+from src.core.decode_cache import Handler
+from src.core.idle import find_idle_loop
+
+if t.TYPE_CHECKING:
+    from src.core.chip8 import Chip8
+
+__all__: tuple[str, ...] = ("Block", "Recompiler")
+
+MAX_BLOCK_LENGTH = 64
+# Instructions that read or write a timer; a block without them can run past a timer tick.
+TIMER_OPCODES = frozenset((0x07, 0x15, 0x18))
+
+
+@attrs.define(slots=True, frozen=True)
+class Block:
+    function: Handler
+    start: int
+    stop: int
+    length: int
+    source: str = attrs.field(repr=False)
+    timed: bool = False
+
+
+@attrs.define(slots=True)
+class _Op:
+    statements: list[str]
+    reads: tuple[str, ...]
+    writes: tuple[str, ...]
+    pure: bool = True
+
+
+def _v(register: int) -> str:
+    return f"v{register:x}"
+
+
+def _straight_line(opcode: int) -> _Op | None:
+    """Translate an opcode that never changes control flow or raises, or return None."""
+    x = (opcode >> 8) & 0x0F
+    y = (opcode >> 4) & 0x0F
+    n = opcode & 0x000F
+    nn = opcode & 0x00FF
+    nnn = opcode & 0x0FFF
+    vx, vy = _v(x), _v(y)
+    match opcode & 0xF000, n, nn:
+        case 0x0000, _, 0xE0:
+            return _Op(["clear()"], (), (), pure=False)
+        case 0x6000, _, _:
+            return _Op([f"{vx} = {nn}"], (), (vx,))
+        case 0x7000, _, _:
+            return _Op([f"{vx} = ({vx} + {nn}) & 0xFF"], (vx,), (vx,))
+        case 0x8000, 0x0, _:
+            return _Op([f"{vx} = {vy}"], (vy,), (vx,))
+        case 0x8000, 0x1, _:
+            return _Op([f"{vx} = {vx} | {vy}"], (vx, vy), (vx,))
+        case 0x8000, 0x2, _:
+            return _Op([f"{vx} = {vx} & {vy}"], (vx, vy), (vx,))
+        case 0x8000, 0x3, _:
+            return _Op([f"{vx} = {vx} ^ {vy}"], (vx, vy), (vx,))
+        case 0x8000, 0x4, _:
+            return _Op([f"r = {vx} + {vy}", "vf = 1 if r > 0xFF else 0", f"{vx} = r & 0xFF"], (vx, vy), ("vf", vx))
+        case 0x8000, 0x5, _:
+            return _Op([f"r = {vx} - {vy}", "vf = 1 if r >= 0 else 0", f"{vx} = r & 0xFF"], (vx, vy), ("vf", vx))
+        case 0x8000, 0x6, _:
+            return _Op([f"vf = {vx} & 1", f"{vx} = {vx} >> 1"], (vx,), ("vf", vx))
+        case 0x8000, 0x7, _:
+            return _Op([f"r = {vy} - {vx}", "vf = 1 if r >= 0 else 0", f"{vx} = r & 0xFF"], (vx, vy), ("vf", vx))
+        case 0x8000, 0xE, _:
+            return _Op([f"vf = {vx} >> 7", f"{vx} = ({vx} << 1) & 0xFF"], (vx,), ("vf", vx))
+        case 0xA000, _, _:
+            return _Op([f"i = {nnn}"], (), ("i",))
+        case 0xC000, _, _:
+            return _Op([f"{vx} = randint(0, 255) & {nn}"], (), (vx,), pure=False)
+        case 0xF000, _, 0x07:
+            return _Op([f"{vx} = registers.DT"], (), (vx,), pure=False)
+        case 0xF000, _, 0x15:
+            return _Op([f"registers.DT = {vx}"], (vx,), (), pure=False)
+        case 0xF000, _, 0x18:
+            return _Op([f"registers.ST = {vx}"], (vx,), (), pure=False)
+        case 0xF000, _, 0x1E:
+            return _Op([f"r = i + {vx}", "vf = 1 if r > 0xFFF else 0", "i = r & 0xFFF"], ("i", vx), ("vf", "i"))
+        case 0xF000, _, 0x29:
+            return _Op([f"i = {vx} * 5"], (vx,), ("i",))
+        case _:
+            return None
+
+
+def _is_valid(opcode: int) -> bool:
+    match opcode & 0xF000, opcode & 0x000F, opcode & 0x00FF:
+        case 0x0000, _, 0xE0 | 0xEE:
+            return True
+        case 0x0000, _, _:
+            return False
+        case 0x5000 | 0x9000, n, _:
+            # The interpreter ignores the low nibble of 5XY0/9XY0, so does the recompiler.
+            return True
+        case 0x8000, n, _:
+            return n in (0x0, 0x1, 0x2, 0x3, 0x4, 0x5, 0x6, 0x7, 0xE)
+        case 0xE000, _, tail:
+            return tail in (0x9E, 0xA1)
+        case 0xF000, _, tail:
+            return tail in (0x07, 0x0A, 0x15, 0x18, 0x1E, 0x29, 0x33, 0x55, 0x65)
+        case _:
+            return True
+
+
+class _BlockBuilder:
+    def __init__(self) -> None:
+        self.body: list[str] = []
+        self.loads: list[str] = []
+        self.defined: set[str] = set()
+        self.consts: dict[str, int] = {}
+        self.materialized: set[str] = set()
+        self.written: set[str] = set()
+
+    def read(self, name: str) -> None:
+        if name in self.consts:
+            if name not in self.materialized:
+                self.body.append(f"{name} = {self.consts[name]}")
+                self.materialized.add(name)
+        elif name not in self.defined:
+            self.loads.append(f"{name} = registers.I" if name == "i" else f"{name} = V[{int(name[1:], 16)}]")
+            self.defined.add(name)
+
+    def add(self, op: _Op) -> None:
+        self.written.update(op.writes)
+        if op.pure and all(name in self.consts for name in op.reads):
+            # Every input is known at compile time, so evaluate the statements now instead of emitting them.
+            namespace = {name: self.consts[name] for name in op.reads}
+            exec("\n".join(op.statements), {}, namespace)  # noqa: S102 - generated from opcode fields
+            for name in op.writes:
+                self.consts[name] = namespace[name]
+                self.materialized.discard(name)
+            return
+        for name in op.reads:
+            self.read(name)
+        self.body.extend(op.statements)
+        for name in op.writes:
+            self.consts.pop(name, None)
+            self.materialized.discard(name)
+            self.defined.add(name)
+
+    def const(self, name: str) -> int | None:
+        return self.consts.get(name)
+
+    def operand(self, name: str) -> str:
+        if name in self.consts:
+            return str(self.consts[name])
+        self.read(name)
+        return name
+
+    def writeback(self) -> None:
+        for name in sorted(self.written):
+            value = str(self.consts[name]) if name in self.consts else name
+            if name == "i":
+                self.body.append(f"registers.I = {value}")
+            else:
+                self.body.append(f"V[{int(name[1:], 16)}] = {value}")
+        self.written.clear()
+
+
+class Recompiler:
+    """Engine that compiles straight-line basic blocks into single Python functions.
+
+    Blocks are cached by entry address and dropped when memory they were built from is written.
+    A block that does not touch the timers may run past the tick its budget ends on, up to the end of
+    the ``run_cycles`` call; the machine ticks right after it, which no instruction in between can
+    observe. Where a block cannot finish within its budget, the interpreter runs the rest of it, so
+    timers change on the same instruction as with the interpreter.
+    """
+
+    def __init__(self, chip: "Chip8", *, max_block_length: int = MAX_BLOCK_LENGTH) -> None:
+        self.chip = chip
+        self.max_block_length = max_block_length
+        self.blocks: list[Block | None] = [None] * chip.memory.size
+        self.covered = bytearray(chip.memory.size)
+        self.compiled = 0
+        self.invalidations = 0
+
+    def run(self, n: int) -> int:
+        chip = self.chip
+        registers = chip.registers
+        blocks = self.blocks
+        compile_block = self.compile
+        limit = chip._batch_limit
+        remaining = n
+        completed = 0
+        try:
+            while remaining > 0:
+                completed = n - remaining
+                pc = registers.PC
+                block = blocks[pc]
+                if block is None:
+                    block = blocks[pc] = compile_block(pc, self.max_block_length)
+                if block.length > remaining and (block.timed or block.length > limit - completed):
+                    remaining -= chip._interpret(remaining)
+                    break
+                remaining -= block.length
+                # Only a block's last instruction can raise, so the ones before it completed.
+                completed = n - remaining - 1
+                if block.function():
+                    idle = chip._idle_length
+                    if not idle:
+                        break
+                    chip._idle_length = 0
+                    skipped = remaining - remaining % idle
+                    remaining -= skipped
+                    chip.idle_cycles += skipped
+        except BaseException:
+            # The interpreter records its own progress when it raises; add the blocks run before it.
+            chip._batch_progress += completed
+            raise
+        return n - remaining
+
+    def compile(self, entry: int, limit: int) -> Block:
+        chip = self.chip
+        ram = chip.memory.memory
+        if chip.skip_idle:
+            loop = find_idle_loop(ram, entry)
+            if loop is not None:
+                # An idle loop runs through the interpreter's idle handler, which reports it to `run`.
+                idle = chip._idle_handler(entry, loop, chip.decode(ram[entry] << 8 | ram[entry + 1]))
+                registers = chip.registers
+
+                def function() -> bool | None:
+                    registers.PC = entry + 2
+                    return idle()
+
+                self.covered[entry : entry + loop.size] = b"\x01" * loop.size
+                return Block(function=function, start=entry, stop=entry + loop.size, length=1, source="")
+        builder = _BlockBuilder()
+        address = entry
+        length = 0
+        timed = False
+        terminal: tuple[int, int] | None = None
+        while length < limit:
+            if address + 1 >= len(ram):
+                if length == 0:
+                    chip.registers.PC = address + 2
+                    raise IndexError(f"Program counter out of range: 0x{address:03X}")
+                break
+            opcode = ram[address] << 8 | ram[address + 1]
+            if not _is_valid(opcode):
+                if length == 0:
+                    chip.registers.PC = address + 2
+                    raise ValueError(f"Unknown opcode: {opcode:04X}")
+                break
+            length += 1
+            timed = timed or (opcode & 0xF000 == 0xF000 and opcode & 0x00FF in TIMER_OPCODES)
+            op = _straight_line(opcode)
+            if op is None:
+                terminal = (address, opcode)
+                address += 2
+                break
+            builder.add(op)
+            address += 2
+
+        handler: Handler | None = None
+        tail: list[str] = []
+        if terminal is None:
+            builder.writeback()
+            tail.append(f"registers.PC = {address}")
+        else:
+            handler = self._terminal(builder, tail, *terminal)
+
+        source = "\n".join(
+            [
+                "def make(registers, V, ram, randint, clear, handler):",
+                "    def block():",
+                *(f"        {line}" for line in (*builder.loads, *builder.body, *tail)),
+                "    return block",
+            ]
+        )
+        namespace: dict[str, t.Any] = {}
+        # The source is generated here from decoded opcode fields, never taken from outside input.
+        exec(compile(source, f"<chip8 block 0x{entry:03X}>", "exec"), namespace)  # noqa: S102
+        function = namespace["make"](
+            chip.registers, chip.registers.V, ram, chip.random.randint, chip.framebuffer.clear, handler
+        )
+        self.covered[entry:address] = b"\x01" * (address - entry)
+        self.compiled += 1
+        return Block(function=function, start=entry, stop=address, length=length, timed=timed, source=source)
+
+    def _terminal(self, builder: _BlockBuilder, tail: list[str], address: int, opcode: int) -> Handler | None:
+        x = (opcode >> 8) & 0x0F
+        y = (opcode >> 4) & 0x0F
+        nn = opcode & 0x00FF
+        nnn = opcode & 0x0FFF
+        next_pc = address + 2
+        match opcode & 0xF000:
+            case 0x1000:
+                builder.writeback()
+                tail.append(f"registers.PC = {nnn}")
+                return None
+            case 0xB000:
+                v0 = builder.operand("v0")
+                builder.writeback()
+                tail.append(f"registers.PC = {nnn} + {v0}")
+                return None
+            case 0x3000 | 0x4000:
+                left, right = builder.const(_v(x)), nn
+                lhs, rhs = builder.operand(_v(x)), str(nn)
+            case 0x5000 | 0x9000:
+                left, right = builder.const(_v(x)), builder.const(_v(y))
+                lhs, rhs = builder.operand(_v(x)), builder.operand(_v(y))
+            case _:
+                # Calls, returns, DXYN, key instructions and memory access run through the interpreter handler.
+                builder.writeback()
+                tail.append(f"registers.PC = {next_pc}")
+                tail.append("return handler()")
+                return self.chip.decode(opcode)
+        equal = opcode & 0xF000 in (0x3000, 0x5000)
+        builder.writeback()
+        if left is not None and right is not None:
+            taken = (left == right) == equal
+            tail.append(f"registers.PC = {next_pc + 2 if taken else next_pc}")
+        else:
+            tail.append(f"registers.PC = {next_pc + 2} if {lhs} {'==' if equal else '!='} {rhs} else {next_pc}")
+        return None
+
+    def invalidate(self, start: int, stop: int) -> None:
+        start = max(start - 1, 0)
+        if not any(self.covered[start:stop]):
+            return
+        for entry, block in enumerate(self.blocks):
+            if block is not None and block.start < stop and start < block.stop:
+                self.blocks[entry] = None
+                self.invalidations += 1
+        self.covered[:] = bytes(len(self.covered))
+        for block in filter(None, self.blocks):
+            self.covered[block.start : block.stop] = b"\x01" * (block.stop - block.start)
+
+    def clear(self) -> None:
+        self.blocks = [None] * len(self.blocks)
+        self.covered[:] = bytes(len(self.covered))
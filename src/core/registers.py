@@ -1,7 +1,10 @@
+import array
 import typing as t
 
 import attrs
 
+from src.constants import CHIP_8_ROM_START
+
 if t.TYPE_CHECKING:
     type ValueT = attrs.Attribute[int]
 else:
@@ -72,12 +75,12 @@ class Register:
 @attrs.define(slots=True, kw_only=True)
 class Registers:
     V: dict[str, Register] = attrs.field(factory=lambda: {f"V{i:X}": Register(name=f"V{i:X}") for i in range(16)})
-    I: Register = Register(name="I", size=16)  # noqa: E741
-    DT: Register = Register(name="DT", size=8)
-    ST: Register = Register(name="ST", size=8)
+    I: Register = attrs.field(factory=lambda: Register(name="I", size=16))
+    DT: Register = attrs.field(factory=lambda: Register(name="DT", size=8))
+    ST: Register = attrs.field(factory=lambda: Register(name="ST", size=8))
 
-    PC: Register = Register(name="PC", size=16, value=0x200)
-    SP: Register = Register(name="SP", size=8)
+    PC: Register = attrs.field(factory=lambda: Register(name="PC", size=16, value=CHIP_8_ROM_START))
+    SP: Register = attrs.field(factory=lambda: Register(name="SP", size=8))
 
     def __getattr__(self, name: str) -> Register:
         if name in self.V:
@@ -99,3 +102,40 @@ class Registers:
     @program_counter.setter
     def program_counter(self, value: int) -> None:
         self.PC.value = value
+
+
+@attrs.define(slots=True, kw_only=True)
+class RegisterFile:
+    """Compact register file used by the CPU hot path.
+
+    ``V`` is a ``bytearray`` indexed by register number and every other register is a plain ``int``,
+    so executing an instruction never allocates. The call stack has a fixed 16 slots indexed by ``SP``.
+    Use :meth:`view` to get named :class:`Register` objects for display or inspection.
+    """
+
+    V: bytearray = attrs.field(factory=lambda: bytearray(16))
+    I: int = 0
+    PC: int = CHIP_8_ROM_START
+    SP: int = 0
+    DT: int = 0
+    ST: int = 0
+    stack: array.array[int] = attrs.field(factory=lambda: array.array("H", [0] * 16))
+
+    @property
+    def stack_pointer(self) -> int:
+        return self.SP
+
+    @property
+    def program_counter(self) -> int:
+        return self.PC
+
+    def view(self) -> Registers:
+        """Return a read-only copy of the current values as named registers."""
+        return Registers(
+            V={f"V{i:X}": Register(name=f"V{i:X}", value=value) for i, value in enumerate(self.V)},
+            I=Register(name="I", size=16, value=self.I),
+            DT=Register(name="DT", size=8, value=self.DT),
+            ST=Register(name="ST", size=8, value=self.ST),
+            PC=Register(name="PC", size=16, value=self.PC),
+            SP=Register(name="SP", size=8, value=self.SP),
+        )
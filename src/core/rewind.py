@@ -0,0 +1,137 @@
+import collections
+import re
+import struct
+import time
+
+from src.constants import CHIP_8_TIMER_CLOCK
+
+__all__: tuple[str, ...] = ("RewindBuffer", "apply_delta", "xor_delta")
+
+_RUN = struct.Struct("<HH")
+_NONZERO_RUNS = re.compile(rb"[^\x00]+")
+# States are compared in chunks first so only the chunks that changed are scanned for runs.
+_CHUNK = 512
+
+
+def xor_delta(old: bytes, new: bytes) -> bytes:
+    """Encode the difference between two equal-length states as run-length XOR runs.
+
+    The encoding is a sequence of ``(offset, length, xor bytes)`` records. XOR is its own inverse,
+    so the same delta turns ``old`` into ``new`` and ``new`` back into ``old``.
+    """
+    size = len(old)
+    records: list[bytes] = []
+    start = 0
+    while start < size:
+        stop = start + _CHUNK
+        if old[start:stop] == new[start:stop]:
+            start = stop
+            continue
+        # Extend over the changed chunks that follow; a run can never cross an unchanged chunk.
+        while stop < size and old[stop : stop + _CHUNK] != new[stop : stop + _CHUNK]:
+            stop += _CHUNK
+        stop = min(stop, size)
+        diff = (int.from_bytes(old[start:stop], "little") ^ int.from_bytes(new[start:stop], "little")).to_bytes(
+            stop - start, "little"
+        )
+        records += [
+            _RUN.pack(start + run.start(), run.end() - run.start()) + run.group()
+            for run in _NONZERO_RUNS.finditer(diff)
+        ]
+        start = stop
+    return b"".join(records)
+
+
+def apply_delta(state: bytes, delta: bytes) -> bytes:
+    diff = bytearray(len(state))
+    position = 0
+    while position < len(delta):
+        offset, length = _RUN.unpack_from(delta, position)
+        position += _RUN.size
+        diff[offset : offset + length] = delta[position : position + length]
+        position += length
+    return (int.from_bytes(state, "little") ^ int.from_bytes(diff, "little")).to_bytes(len(state), "little")
+
+
+class RewindBuffer:
+    """Bounded history of per-frame snapshots for hold-to-rewind.
+
+    Full copies are kept only for the oldest and the newest frame. Every frame in between is a XOR delta
+    from the frame before it. Stepping back applies the newest delta to the newest frame. Evicting applies
+    the oldest delta to the oldest frame. Both cost one delta and allocate no reference cycles.
+    The history is capped both by length (``seconds`` at ``frame_rate``) and by ``byte_budget``.
+    """
+
+    def __init__(
+        self, *, seconds: float = 10.0, frame_rate: int = CHIP_8_TIMER_CLOCK, byte_budget: int = 4 * 1024 * 1024
+    ) -> None:
+        self.max_frames = max(int(seconds * frame_rate), 1)
+        self.frame_rate = frame_rate
+        self.byte_budget = byte_budget
+        self._oldest: bytes | None = None
+        self._newest: bytes | None = None
+        self._deltas: collections.deque[bytes] = collections.deque()
+        self._delta_bytes = 0
+        self.frames_recorded = 0
+        self.record_time = 0.0
+
+    def __len__(self) -> int:
+        return 0 if self._newest is None else len(self._deltas) + 1
+
+    @property
+    def seconds(self) -> float:
+        return len(self) / self.frame_rate
+
+    @property
+    def memory_usage(self) -> int:
+        full = 0 if self._newest is None else len(self._newest) * (2 if self._deltas else 1)
+        return full + self._delta_bytes
+
+    @property
+    def average_record_time(self) -> float:
+        return self.record_time / self.frames_recorded if self.frames_recorded else 0.0
+
+    def record(self, state: bytes) -> None:
+        start = time.perf_counter()
+        if self._newest is None:
+            self._oldest = state
+        elif len(state) != len(self._newest):
+            raise ValueError("All recorded states must have the same size.")
+        else:
+            delta = xor_delta(self._newest, state)
+            self._deltas.append(delta)
+            self._delta_bytes += len(delta)
+        self._newest = state
+        while len(self._deltas) >= self.max_frames or (self._deltas and self.memory_usage > self.byte_budget):
+            self._evict_oldest()
+        self.frames_recorded += 1
+        self.record_time += time.perf_counter() - start
+
+    def _evict_oldest(self) -> None:
+        assert self._oldest is not None
+        delta = self._deltas.popleft()
+        self._delta_bytes -= len(delta)
+        self._oldest = apply_delta(self._oldest, delta)
+
+    def rewind(self) -> bytes | None:
+        """Drop the newest frame and return the one before it, or None once the history is exhausted."""
+        if not self._deltas:
+            return None
+        assert self._newest is not None
+        delta = self._deltas.pop()
+        self._delta_bytes -= len(delta)
+        self._newest = apply_delta(self._newest, delta)
+        return self._newest
+
+    def clear(self) -> None:
+        self._oldest = self._newest = None
+        self._deltas.clear()
+        self._delta_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "frames": len(self),
+            "seconds": self.seconds,
+            "memory_usage": self.memory_usage,
+            "average_record_time": self.average_record_time,
+        }
@@ -0,0 +1,106 @@
+"""Fixed-layout binary save states.
+
+A snapshot is a small header followed by one fixed-size body, so restoring is a single ``struct`` unpack
+and never runs arbitrary code the way unpickling would. Bump ``VERSION`` whenever the layout changes.
+"""
+
+import array
+import pathlib
+import struct
+import typing as t
+
+if t.TYPE_CHECKING:
+    from src.core.chip8 import Chip8
+
+__all__: tuple[str, ...] = ("VERSION", "load_state", "restore", "save_state", "snapshot")
+
+MAGIC = b"C8SS"
+VERSION = 1
+NO_KEY = 0xFF
+
+_MT_STATE_SIZE = 625
+HEADER = struct.Struct("<4sH")
+BODY = struct.Struct(
+    "<"
+    "4096s"  # memory
+    "16s"  # V0-VF
+    "HHBBB"  # I, PC, SP, DT, ST
+    "16H"  # stack
+    "BH"  # wait_for_key, pressed keys bitmask
+    "256s"  # framebuffer rows
+    "QIB"  # cycles, tick countdown, sound playing
+    f"{_MT_STATE_SIZE}I?d"  # RNG: Mersenne Twister state, has gauss_next, gauss_next
+)
+SIZE = HEADER.size + BODY.size
+
+
+def snapshot(chip: "Chip8") -> bytes:
+    registers = chip.registers
+    rng_version, rng_state, gauss_next = chip.random.getstate()
+    assert rng_version == 3, f"Unsupported RNG state version {rng_version}"
+    return HEADER.pack(MAGIC, VERSION) + BODY.pack(
+        bytes(chip.memory.memory),
+        bytes(registers.V),
+        registers.I,
+        registers.PC,
+        registers.SP,
+        registers.DT,
+        registers.ST,
+        *registers.stack,
+        NO_KEY if chip.wait_for_key is None else chip.wait_for_key,
+        chip.keyboard.state,
+        chip.framebuffer.to_bytes(),
+        chip.cycles,
+        chip._tick_countdown,
+        chip._beeping,
+        *rng_state,
+        gauss_next is not None,
+        gauss_next or 0.0,
+    )
+
+
+def restore(chip: "Chip8", data: bytes) -> None:
+    if len(data) != SIZE:
+        raise ValueError(f"Save state must be {SIZE} bytes, got {len(data)}.")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a CHIP-8 save state.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save state version {version} (expected {VERSION}).")
+    fields = BODY.unpack_from(data, HEADER.size)
+    memory, V, I, PC, SP, DT, ST = fields[:7]
+    stack = fields[7:23]
+    wait_for_key, keys, framebuffer, cycles, tick_countdown, beeping = fields[23:29]
+    rng_state = fields[29 : 29 + _MT_STATE_SIZE]
+    has_gauss, gauss_next = fields[29 + _MT_STATE_SIZE :]
+
+    # Everything is updated in place: decoded handlers and compiled blocks hold references to these objects.
+    if chip.memory.memory != memory:
+        chip.memory.memory[:] = memory
+        chip.memory._notify_write(0, chip.memory.size)
+    registers = chip.registers
+    registers.V[:] = V
+    registers.I, registers.PC, registers.SP, registers.DT, registers.ST = I, PC, SP, DT, ST
+    registers.stack[:] = array.array("H", stack)
+    chip.wait_for_key = None if wait_for_key == NO_KEY else wait_for_key
+    chip.keyboard.set_state(keys)
+    chip.framebuffer.load_bytes(framebuffer)
+    chip.cycles = cycles
+    chip._tick_countdown = tick_countdown
+    if bool(beeping) != chip._beeping:
+        chip._beeping = bool(beeping)
+        if chip._beeping:
+            chip.sound.start()
+        else:
+            chip.sound.stop()
+    chip.random.setstate((3, tuple(rng_state), gauss_next if has_gauss else None))
+
+
+def save_state(chip: "Chip8", path: str | pathlib.Path) -> None:
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(snapshot(chip))
+
+
+def load_state(chip: "Chip8", path: str | pathlib.Path) -> None:
+    restore(chip, pathlib.Path(path).read_bytes())
@@ -0,0 +1,127 @@
+import time
+import typing as t
+
+from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_TIMER_CLOCK
+
+if t.TYPE_CHECKING:
+    from src.core.chip8 import Chip8
+
+
+class FrameScheduler:
+    """Paces a machine in 60 Hz frames of host time.
+
+    Each frame runs the instructions owed at ``cpu_clock`` in one batch and ticks the timers once.
+    After a stall at most ``max_catch_up`` frames are replayed and the rest of the backlog is dropped.
+    In turbo mode pacing is off: every step runs ``turbo_frames`` frames back to back, never sleeps,
+    and frames are only presented at the host frame rate. A machine blocked in FX0A is always paced, so
+    the host sleeps until a key arrives instead of spinning through frames.
+    """
+
+    def __init__(
+        self,
+        chip: "Chip8",
+        *,
+        cpu_clock: int = CHIP_8_CPU_CLOCK,
+        frame_rate: int = CHIP_8_TIMER_CLOCK,
+        max_catch_up: int = 4,
+        turbo: bool = False,
+        turbo_frames: int = 16,
+        clock: t.Callable[[], float] = time.perf_counter,
+        sleep: t.Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.chip = chip
+        self.cpu_clock = cpu_clock
+        self.frame_rate = frame_rate
+        self.frame_time = 1 / frame_rate
+        self.max_catch_up = max_catch_up
+        self.turbo_frames = turbo_frames
+        self.clock = clock
+        self._sleep = sleep
+        self._owed = 0.0
+        self._turbo = turbo
+        self.next_frame = clock()
+        self.frames = 0
+        self.dropped_frames = 0
+        self.instructions_per_second = 0.0
+        self.frames_per_second = 0.0
+        self._meter_start = self.next_frame
+        self._meter_cycles = chip.cycles
+        self._meter_presented = 0
+        self._last_present = float("-inf")
+
+    @property
+    def turbo(self) -> bool:
+        return self._turbo
+
+    @turbo.setter
+    def turbo(self, value: bool) -> None:
+        self._turbo = value
+        # Resume pacing from now instead of replaying the time spent in turbo.
+        self.next_frame = self.clock()
+
+    @property
+    def cycles_per_frame(self) -> float:
+        return self.cpu_clock / self.frame_rate
+
+    def run_frame(self) -> int:
+        self._owed += self.cycles_per_frame
+        owed = int(self._owed)
+        self._owed -= owed
+        executed = self.chip.run_cycles(owed)
+        self.chip.timers_60Hz()
+        self.frames += 1
+        return executed
+
+    def step(self, frame: t.Callable[[], object] | None = None) -> int:
+        """Run every frame that is due and return how many ran.
+
+        ``frame`` replaces :meth:`run_frame` for this step, e.g. to record or rewind around it.
+        """
+        frame = frame or self.run_frame
+        if self._turbo and not self.chip.blocked:
+            for _ in range(self.turbo_frames):
+                frame()
+            # Keep the pacing origin current in case the machine blocks and gets paced.
+            self.next_frame = self.clock()
+            self._measure()
+            return self.turbo_frames
+        now = self.clock()
+        due = int((now - self.next_frame) / self.frame_time) + 1 if now >= self.next_frame else 0
+        if due > self.max_catch_up:
+            self.dropped_frames += due - self.max_catch_up
+            self.next_frame += (due - self.max_catch_up) * self.frame_time
+            due = self.max_catch_up
+        for _ in range(due):
+            frame()
+        self.next_frame += due * self.frame_time
+        self._measure()
+        return due
+
+    def present_due(self) -> bool:
+        now = self.clock()
+        if self._turbo and now - self._last_present < self.frame_time:
+            return False
+        self._last_present = now
+        self._meter_presented += 1
+        return True
+
+    def _measure(self) -> None:
+        now = self.clock()
+        elapsed = now - self._meter_start
+        if elapsed >= 0.5:
+            self.instructions_per_second = (self.chip.cycles - self._meter_cycles) / elapsed
+            self.frames_per_second = self._meter_presented / elapsed
+            self._meter_start = now
+            self._meter_cycles = self.chip.cycles
+            self._meter_presented = 0
+
+    def delay(self) -> float:
+        """Seconds until the next frame is due, or 0 when it is due now or pacing is off."""
+        if self._turbo and not self.chip.blocked:
+            return 0.0
+        return max(self.next_frame - self.clock(), 0.0)
+
+    def sleep(self) -> None:
+        delay = self.delay()
+        if delay > 0:
+            self._sleep(delay)
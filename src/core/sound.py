@@ -0,0 +1,34 @@
+import typing as t
+
+__all__: tuple[str, ...] = ("NullSound", "SoundBackend", "load_sound_backend")
+
+
+class SoundBackend(t.Protocol):
+    """Plays the CHIP-8 tone. ``start`` and ``stop`` are only called on sound timer edges and must not block."""
+
+    def start(self) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class NullSound:
+    """Silent backend for headless runs."""
+
+    def start(self) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+def load_sound_backend(name: str) -> SoundBackend:
+    match name:
+        case "null":
+            return NullSound()
+        case "pygame":
+            # Imported lazily so headless runs never load pygame.
+            from src.gui.sound import PygameSound
+
+            return PygameSound()
+        case _:
+            raise ValueError(f"Unknown sound backend: {name}")
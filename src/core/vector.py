@@ -0,0 +1,445 @@
+"""Many CHIP-8 machines stepped in lockstep as NumPy arrays.
+
+Every step runs one instruction on every live machine. Machines are grouped by opcode family with one
+stable sort, and each family runs as a handful of masked array operations over its group, so the Python
+overhead of a step is paid once per family instead of once per machine.
+
+The results match :class:`~src.core.chip8.Chip8` with the default (non-wrapping) framebuffer exactly,
+including the RNG: each machine keeps its own :class:`random.Random`, and ``CXNN`` is the one family that
+loops over its group in Python. An instruction that would make the scalar interpreter raise halts just
+that machine and records the error in :attr:`VectorChip8.errors`. Its registers and memory are left as the
+interpreter leaves them when it raises.
+"""
+
+import pathlib
+import random
+import typing as t
+
+import numpy as np
+import numpy.typing as npt
+
+from src.constants import (
+    CHIP_8_CPU_CLOCK,
+    CHIP_8_DISPLAY_HEIGHT,
+    CHIP_8_MEMORY_SIZE,
+    CHIP_8_ROM_START,
+    CHIP_8_TIMER_CLOCK,
+)
+from src.core import savestate
+from src.core.memory import Memory
+
+__all__: tuple[str, ...] = ("VectorChip8",)
+
+type Indices = npt.NDArray[np.intp]
+type Words = npt.NDArray[np.int32]
+
+_REGISTERS = np.arange(16)
+_DIGITS = np.array([100, 10, 1], dtype=np.int32)
+
+
+class VectorChip8:
+    """``len(roms)`` machines, machine ``i`` running ``roms[i]`` with its RNG seeded by ``seeds[i]``.
+
+    Registers are arrays with one entry per machine: ``V`` is ``(N, 16)``, ``memory`` is ``(N, 4096)``,
+    ``stack`` is ``(N, 16)`` and ``rows`` holds each framebuffer as 32 rows of 64 bits, leftmost pixel in
+    the most significant bit like :class:`~src.core.framebuffer.Framebuffer`. Keys are one 16-bit mask per
+    machine, set with :meth:`set_keys`.
+    """
+
+    def __init__(
+        self,
+        roms: t.Sequence[str | pathlib.Path],
+        *,
+        seeds: t.Sequence[int | None] | None = None,
+        instructions_per_tick: int | None = CHIP_8_CPU_CLOCK // CHIP_8_TIMER_CLOCK,
+    ) -> None:
+        count = len(roms)
+        if seeds is None:
+            seeds = [None] * count
+        if len(seeds) != count:
+            raise ValueError(f"Expected {count} seeds, got {len(seeds)}.")
+        self.count = count
+        self.instructions_per_tick = instructions_per_tick
+        self.rom_paths = list(roms)
+        self.seeds = list(seeds)
+        self.size = CHIP_8_MEMORY_SIZE
+        images: dict[str, bytes] = {}
+        for rom in roms:
+            if str(rom) not in images:
+                memory = Memory()
+                memory.load_rom(rom)
+                images[str(rom)] = bytes(memory.memory)
+        self.memory = np.array([np.frombuffer(images[str(rom)], dtype=np.uint8) for rom in roms], dtype=np.uint8)
+        self.memory = self.memory.reshape(count, self.size)
+        self.V = np.zeros((count, 16), dtype=np.uint8)
+        self.I = np.zeros(count, dtype=np.int32)
+        self.PC = np.full(count, CHIP_8_ROM_START, dtype=np.int32)
+        self.SP = np.zeros(count, dtype=np.int32)
+        self.DT = np.zeros(count, dtype=np.int32)
+        self.ST = np.zeros(count, dtype=np.int32)
+        self.stack = np.zeros((count, 16), dtype=np.int32)
+        self.rows = np.zeros((count, CHIP_8_DISPLAY_HEIGHT), dtype=np.uint64)
+        self.keys = np.zeros(count, dtype=np.int32)
+        self.wait_register = np.full(count, -1, dtype=np.int32)
+        self.key_event = np.zeros(count, dtype=np.bool_)
+        self.beeping = np.zeros(count, dtype=np.bool_)
+        self.halted = np.zeros(count, dtype=np.bool_)
+        self.cycles = np.zeros(count, dtype=np.int64)
+        self.errors: list[str | None] = [None] * count
+        self.randoms = [random.Random(seed) for seed in seeds]
+        self._tick_countdown = instructions_per_tick or 0
+        self._live: Indices = np.arange(count)
+        self._families: tuple[t.Callable[[Indices, Words], None], ...] = (
+            self._family_0,
+            self._family_1,
+            self._family_2,
+            self._family_3,
+            self._family_4,
+            self._family_5,
+            self._family_6,
+            self._family_7,
+            self._family_8,
+            self._family_9,
+            self._family_A,
+            self._family_B,
+            self._family_C,
+            self._family_D,
+            self._family_E,
+            self._family_F,
+        )
+
+    @property
+    def instructions(self) -> int:
+        """Instructions completed across all machines."""
+        return int(self.cycles.sum())
+
+    def set_keys(self, masks: int | npt.ArrayLike) -> None:
+        """Set every machine's keypad; a machine waiting in FX0A sees a newly pressed key as an event."""
+        masks = np.broadcast_to(np.asarray(masks, dtype=np.int32), (self.count,))
+        if ((masks < 0) | (masks > 0xFFFF)).any():
+            raise ValueError("Key masks must be between 0 and 0xFFFF.")
+        self.key_event |= (masks & ~self.keys) != 0
+        self.keys = masks.copy()
+
+    def framebuffer(self, machine: int) -> bytes:
+        """Machine ``machine``'s framebuffer in the layout of :meth:`Framebuffer.to_bytes`."""
+        return self.rows[machine].astype(">u8").tobytes()
+
+    def snapshot(self, machine: int) -> bytes:
+        """Machine ``machine``'s state as a save state that :meth:`Chip8.restore` accepts."""
+        rng_version, rng_state, gauss_next = self.randoms[machine].getstate()
+        assert rng_version == 3, f"Unsupported RNG state version {rng_version}"
+        register = int(self.wait_register[machine])
+        return savestate.HEADER.pack(savestate.MAGIC, savestate.VERSION) + savestate.BODY.pack(
+            self.memory[machine].tobytes(),
+            self.V[machine].tobytes(),
+            int(self.I[machine]),
+            int(self.PC[machine]),
+            int(self.SP[machine]),
+            int(self.DT[machine]),
+            int(self.ST[machine]),
+            *(int(value) for value in self.stack[machine]),
+            savestate.NO_KEY if register < 0 else register,
+            int(self.keys[machine]),
+            self.framebuffer(machine),
+            int(self.cycles[machine]),
+            self._tick_countdown,
+            bool(self.beeping[machine]),
+            *rng_state,
+            gauss_next is not None,
+            gauss_next or 0.0,
+        )
+
+    def run_cycles(self, n: int) -> int:
+        """Run ``n`` lockstep steps and return how many machine instructions completed."""
+        start = self.instructions
+        ticks = self.instructions_per_tick
+        for _ in range(n):
+            if not len(self._live):
+                break
+            self.step()
+            if ticks:
+                self._tick_countdown -= 1
+                if self._tick_countdown == 0:
+                    self.timers_60Hz()
+                    self._tick_countdown = ticks
+        return self.instructions - start
+
+    def timers_60Hz(self) -> None:
+        live = self._live
+        DT = self.DT[live]
+        self.DT[live] = np.where(DT > 0, DT - 1, DT)
+        ST = self.ST[live]
+        beeping = ST > 0
+        self.ST[live] = np.where(beeping, ST - 1, ST)
+        self.beeping[live] = beeping
+
+    def step(self) -> None:
+        """Run one instruction on every live machine; a machine blocked in FX0A spends the step waiting."""
+        live = self._live
+        running = live
+        waiting = self.wait_register[live] >= 0
+        if waiting.any():
+            self._resume_key_wait(live[waiting])
+            running = live[~waiting]
+        pc = self.PC[running]
+        self.PC[running] = pc + 2
+        outside = pc > self.size - 2
+        if outside.any():
+            self._fault(
+                running[outside], [f"IndexError: Program counter out of range at 0x{p:03X}" for p in pc[outside]]
+            )
+            running, pc = running[~outside], pc[~outside]
+        memory = self.memory
+        opcodes = memory[running, pc].astype(np.int32) << 8 | memory[running, pc + 1]
+        families = opcodes >> 12
+        order = np.argsort(families, kind="stable")
+        counts = np.bincount(families, minlength=16)
+        start = 0
+        for family in np.flatnonzero(counts):
+            stop = start + int(counts[family])
+            group = order[start:stop]
+            self._families[family](running[group], opcodes[group])
+            start = stop
+        self.cycles[live] += 1
+        if len(self._live) != len(live):
+            # Machines that faulted this step did not complete their instruction.
+            self.cycles[live[self.halted[live]]] -= 1
+
+    def _resume_key_wait(self, machines: Indices) -> None:
+        events = self.key_event[machines]
+        self.key_event[machines] = False
+        keys = self.keys[machines]
+        resumed = events & (keys != 0)
+        machines, keys = machines[resumed], keys[resumed]
+        lowest = keys & -keys
+        self.V[machines, self.wait_register[machines]] = np.log2(lowest).astype(np.uint8)
+        self.wait_register[machines] = -1
+
+    def _fault(self, machines: Indices, messages: t.Sequence[str]) -> None:
+        for machine, message in zip(machines.tolist(), messages):
+            self.errors[machine] = message
+        self.halted[machines] = True
+        self._live = np.flatnonzero(~self.halted)
+
+    def _unknown(self, machines: Indices, opcodes: Words) -> None:
+        self._fault(machines, [f"ValueError: Unknown opcode: {opcode:04X}" for opcode in opcodes.tolist()])
+
+    def _family_0(self, machines: Indices, opcodes: Words) -> None:
+        clear = opcodes == 0x00E0
+        self.rows[machines[clear]] = 0
+        ret = opcodes == 0x00EE
+        if ret.any():
+            returning = machines[ret]
+            underflow = self.SP[returning] == 0
+            if underflow.any():
+                at = self.PC[returning[underflow]] - 2
+                self._fault(returning[underflow], [f"IndexError: Stack underflow at 0x{a:03X}" for a in at.tolist()])
+                returning = returning[~underflow]
+            self.SP[returning] -= 1
+            self.PC[returning] = self.stack[returning, self.SP[returning]]
+        unknown = ~(clear | ret)
+        if unknown.any():
+            self._unknown(machines[unknown], opcodes[unknown])
+
+    def _family_1(self, machines: Indices, opcodes: Words) -> None:
+        self.PC[machines] = opcodes & 0x0FFF
+
+    def _family_2(self, machines: Indices, opcodes: Words) -> None:
+        overflow = self.SP[machines] == 16
+        if overflow.any():
+            at = self.PC[machines[overflow]] - 2
+            self._fault(machines[overflow], [f"IndexError: Stack overflow at 0x{a:03X}" for a in at.tolist()])
+            machines, opcodes = machines[~overflow], opcodes[~overflow]
+        SP = self.SP[machines]
+        self.stack[machines, SP] = self.PC[machines]
+        self.SP[machines] = SP + 1
+        self.PC[machines] = opcodes & 0x0FFF
+
+    def _family_3(self, machines: Indices, opcodes: Words) -> None:
+        skip = self.V[machines, opcodes >> 8 & 0x0F] == (opcodes & 0x00FF)
+        self.PC[machines[skip]] += 2
+
+    def _family_4(self, machines: Indices, opcodes: Words) -> None:
+        skip = self.V[machines, opcodes >> 8 & 0x0F] != (opcodes & 0x00FF)
+        self.PC[machines[skip]] += 2
+
+    def _family_5(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        skip = V[machines, opcodes >> 8 & 0x0F] == V[machines, opcodes >> 4 & 0x0F]
+        self.PC[machines[skip]] += 2
+
+    def _family_6(self, machines: Indices, opcodes: Words) -> None:
+        self.V[machines, opcodes >> 8 & 0x0F] = opcodes & 0x00FF
+
+    def _family_7(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        x = opcodes >> 8 & 0x0F
+        V[machines, x] = (V[machines, x] + (opcodes & 0x00FF)) & 0xFF
+
+    def _family_8(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        x = opcodes >> 8 & 0x0F
+        y = opcodes >> 4 & 0x0F
+        n = opcodes & 0x000F
+        vx = V[machines, x].astype(np.int32)
+        vy = V[machines, y].astype(np.int32)
+        for tail in np.unique(n).tolist():
+            m = n == tail
+            group, gx, a, b = machines[m], x[m], vx[m], vy[m]
+            # VF is written before VX, so an instruction with X = F keeps the scalar interpreter's result.
+            match tail:
+                case 0x0:
+                    V[group, gx] = b
+                case 0x1:
+                    V[group, gx] = a | b
+                case 0x2:
+                    V[group, gx] = a & b
+                case 0x3:
+                    V[group, gx] = a ^ b
+                case 0x4:
+                    result = a + b
+                    V[group, 0xF] = result > 0xFF
+                    V[group, gx] = result & 0xFF
+                case 0x5:
+                    result = a - b
+                    V[group, 0xF] = result >= 0
+                    V[group, gx] = result & 0xFF
+                case 0x6:
+                    V[group, 0xF] = a & 1
+                    V[group, gx] = V[group, gx] >> 1
+                case 0x7:
+                    result = b - a
+                    V[group, 0xF] = result >= 0
+                    V[group, gx] = result & 0xFF
+                case 0xE:
+                    V[group, 0xF] = a >> 7
+                    V[group, gx] = (V[group, gx].astype(np.int32) << 1) & 0xFF
+                case _:
+                    self._unknown(group, opcodes[m])
+
+    def _family_9(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        skip = V[machines, opcodes >> 8 & 0x0F] != V[machines, opcodes >> 4 & 0x0F]
+        self.PC[machines[skip]] += 2
+
+    def _family_A(self, machines: Indices, opcodes: Words) -> None:
+        self.I[machines] = opcodes & 0x0FFF
+
+    def _family_B(self, machines: Indices, opcodes: Words) -> None:
+        self.PC[machines] = (opcodes & 0x0FFF) + self.V[machines, 0]
+
+    def _family_C(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        randoms = self.randoms
+        for machine, opcode in zip(machines.tolist(), opcodes.tolist()):
+            V[machine, opcode >> 8 & 0x0F] = randoms[machine].randint(0, 255) & opcode
+
+    def _family_D(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        rows = self.rows
+        x = V[machines, opcodes >> 8 & 0x0F].astype(np.int64)
+        y = V[machines, opcodes >> 4 & 0x0F].astype(np.int64)
+        n = opcodes & 0x000F
+        I = self.I[machines]
+        # Sprites are clipped at the right and bottom edges, and their bytes at the end of memory.
+        visible = (x < 64) & (y < CHIP_8_DISPLAY_HEIGHT)
+        shift = 56 - x
+        left = np.maximum(shift, 0).astype(np.uint64)
+        right = np.maximum(-shift, 0).astype(np.uint64)
+        collision = np.zeros(len(machines), dtype=np.bool_)
+        for i in range(int(n.max(initial=0))):
+            drawn = visible & (i < n) & (y + i < CHIP_8_DISPLAY_HEIGHT) & (I + i < self.size)
+            if not drawn.any():
+                continue
+            group = machines[drawn]
+            row = y[drawn] + i
+            byte = self.memory[group, I[drawn] + i].astype(np.uint64)
+            mask = byte << left[drawn] >> right[drawn]
+            current = rows[group, row]
+            collision[drawn] |= (current & mask) != 0
+            rows[group, row] = current ^ mask
+        V[machines, 0xF] = collision
+
+    def _family_E(self, machines: Indices, opcodes: Words) -> None:
+        key = self.V[machines, opcodes >> 8 & 0x0F].astype(np.int32)
+        tail = opcodes & 0x00FF
+        known = (tail == 0x9E) | (tail == 0xA1)
+        if not known.all():
+            self._unknown(machines[~known], opcodes[~known])
+        invalid = known & (key > 15)
+        if invalid.any():
+            self._fault(
+                machines[invalid], [f"ValueError: Key value {k} out of range (0-15)." for k in key[invalid].tolist()]
+            )
+        valid = known & ~invalid
+        pressed = (self.keys[machines] >> np.minimum(key, 15) & 1) == 1
+        skip = valid & (pressed == (tail == 0x9E))
+        self.PC[machines[skip]] += 2
+
+    def _family_F(self, machines: Indices, opcodes: Words) -> None:
+        V = self.V
+        x = opcodes >> 8 & 0x0F
+        tail = opcodes & 0x00FF
+        for kind in np.unique(tail).tolist():
+            m = tail == kind
+            group, gx = machines[m], x[m]
+            match kind:
+                case 0x07:
+                    V[group, gx] = self.DT[group]
+                case 0x0A:
+                    self.wait_register[group] = gx
+                    self.key_event[group] = True
+                case 0x15:
+                    self.DT[group] = V[group, gx]
+                case 0x18:
+                    self.ST[group] = V[group, gx]
+                case 0x1E:
+                    result = self.I[group] + V[group, gx]
+                    V[group, 0xF] = result > 0xFFF
+                    self.I[group] = result & 0xFFF
+                case 0x29:
+                    self.I[group] = V[group, gx].astype(np.int32) * 5
+                case 0x33:
+                    value = V[group, gx].astype(np.int32)
+                    self._store(group, (value[:, None] // _DIGITS % 10).astype(np.uint8), np.full(len(group), 3))
+                case 0x55:
+                    stored = ~self._store(group, V[group], gx + 1)
+                    self.I[group[stored]] = (self.I[group[stored]] + gx[stored] + 1) & 0xFFFF
+                case 0x65:
+                    self._load(group, gx + 1)
+                case _:
+                    self._unknown(group, opcodes[m])
+
+    def _store(self, machines: Indices, values: npt.NDArray[np.uint8], lengths: Words) -> npt.NDArray[np.bool_]:
+        """Write ``values[k, :lengths[k]]`` at each machine's I and return which writes ran past memory.
+
+        Like :meth:`Memory.write`, the in-range part of an overrunning write is kept before the machine faults.
+        """
+        I = self.I[machines]
+        offsets = np.arange(int(values.shape[1]))
+        addresses = I[:, None] + offsets
+        written = (offsets < lengths[:, None]) & (addresses < self.size)
+        rows = np.broadcast_to(machines[:, None], addresses.shape)
+        self.memory[rows[written], addresses[written]] = values[written]
+        overrun = I + lengths > self.size
+        if overrun.any():
+            stop = np.minimum(I + lengths, self.size)[overrun]
+            self._fault(
+                machines[overrun], [f"IndexError: Memory write out of range at 0x{s:03X}" for s in stop.tolist()]
+            )
+        return overrun
+
+    def _load(self, machines: Indices, lengths: Words) -> None:
+        I = self.I[machines]
+        addresses = I[:, None] + _REGISTERS
+        read = (_REGISTERS < lengths[:, None]) & (addresses < self.size)
+        rows = np.broadcast_to(machines[:, None], addresses.shape)
+        registers = np.broadcast_to(_REGISTERS, addresses.shape)
+        self.V[rows[read], registers[read]] = self.memory[rows[read], addresses[read]]
+        short = I + lengths > self.size
+        if short.any():
+            at = I[short] + read[short].sum(axis=1)
+            self._fault(machines[short], [f"IndexError: Memory read out of range at 0x{a:03X}" for a in at.tolist()])
+        done = machines[~short]
+        self.I[done] = (self.I[done] + lengths[~short]) & 0xFFFF
@@ -1,50 +1,86 @@
 import pathlib
-import time
+import random
+import typing as t
 
 import pygame
 
-from src.constants import CHIP_8_CPU_CLOCK, CHIP_8_DEBUG_MODE, CHIP_8_TIMER_CLOCK, SCREEN_HEIGHT, SCREEN_WIDTH
+from src.constants import CHIP_8_DEBUG_MODE, SCREEN_HEIGHT, SCREEN_WIDTH
+from src.core.capture import FrameCapture
 from src.core.chip8 import Chip8
+from src.core.movie import MovieRecorder
+from src.core.rewind import RewindBuffer
+from src.core.savestate import load_state, save_state
+from src.core.scheduler import FrameScheduler
+from src.core.sound import NullSound, load_sound_backend
+from src.gui.overlay import DebugOverlay
 from src.gui.screen import Display
 
 
 class Window:
-    keymap = {
-        pygame.K_1: "KEY1",
-        pygame.K_2: "KEY2",
-        pygame.K_3: "KEY3",
-        pygame.K_4: "KEYC",
-        pygame.K_q: "KEY4",
-        pygame.K_w: "KEY5",
-        pygame.K_e: "KEY6",
-        pygame.K_r: "KEYD",
-        pygame.K_a: "KEY7",
-        pygame.K_s: "KEY8",
-        pygame.K_d: "KEY9",
-        pygame.K_f: "KEYE",
-        pygame.K_z: "KEYA",
-        pygame.K_x: "KEY0",
-        pygame.K_c: "KEYB",
-        pygame.K_v: "KEYF",
+    keymap: t.ClassVar[dict[int, int]] = {
+        pygame.K_1: 0x1,
+        pygame.K_2: 0x2,
+        pygame.K_3: 0x3,
+        pygame.K_4: 0xC,
+        pygame.K_q: 0x4,
+        pygame.K_w: 0x5,
+        pygame.K_e: 0x6,
+        pygame.K_r: 0xD,
+        pygame.K_a: 0x7,
+        pygame.K_s: 0x8,
+        pygame.K_d: 0x9,
+        pygame.K_f: 0xE,
+        pygame.K_z: 0xA,
+        pygame.K_x: 0x0,
+        pygame.K_c: 0xB,
+        pygame.K_v: 0xF,
     }
 
-    def __init__(self, rom_path: str | pathlib.Path) -> None:
+    turbo_key = pygame.K_TAB
+    rewind_key = pygame.K_BACKSPACE
+    save_key = pygame.K_F5
+    load_key = pygame.K_F9
+    slot_keys: t.ClassVar[dict[int, int]] = {pygame.K_F1: 1, pygame.K_F2: 2, pygame.K_F3: 3, pygame.K_F4: 4}
+    save_folder = pathlib.Path("saves")
+
+    def __init__(
+        self,
+        rom_path: str | pathlib.Path,
+        *,
+        turbo: bool = False,
+        sound: str = "pygame",
+        seed: int | None = None,
+        movie_path: str | pathlib.Path | None = None,
+        capture_path: str | pathlib.Path | None = None,
+        capture_scale: int = 1,
+    ) -> None:
         pygame.init()
         pygame.font.init()
 
         self.window = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("CHIP-8 Emulator")
 
-        self.clock = pygame.time.Clock()
-        self.chip = Chip8(rom_path)
-        self.display = Display()
-        self.last_timer_time = time.perf_counter()
-        self.last_cycle_time = time.perf_counter()
+        try:
+            self.sound = load_sound_backend(sound)
+        except pygame.error:
+            self.sound = NullSound()
+        if movie_path is not None and seed is None:
+            seed = random.getrandbits(32)
+        self.chip = Chip8(rom_path, instructions_per_tick=None, sound=self.sound, seed=seed)
+        self.display = Display(self.chip.framebuffer)
+        self.scheduler = FrameScheduler(self.chip, turbo=turbo)
+        self.movie_path = movie_path
+        self.recorder = MovieRecorder(self.chip, self.scheduler) if movie_path is not None else None
+        self.save_slot = 1
+        self.rewind = RewindBuffer()
+        self.rewinding = False
+        self.overlay = DebugOverlay(self.chip) if CHIP_8_DEBUG_MODE else None
+        self.capture = FrameCapture(capture_path, scale=capture_scale) if capture_path is not None else None
+        self._caption = ""
 
     def run(self):
         running = True
         while running:
-            now = time.perf_counter()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
@@ -52,62 +88,93 @@ class Window:
                     self.on_keydown(event.key)
                 if event.type == pygame.KEYUP:
                     self.on_keyup(event.key)
-
-            if now - self.last_timer_time >= 1 / CHIP_8_TIMER_CLOCK:
-                self.chip.timers_60Hz()
-                self.last_timer_time = now
-
-            if now - self.last_cycle_time >= 1 / CHIP_8_CPU_CLOCK:
-                self.chip.cycle(self.display)
-                self.last_cycle_time = now
-
-            self.window.fill((0, 0, 0))
-
-            surface = self.display.render()
-            cx = surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-            self.window.blit(surface, cx.topleft)
-            pygame.draw.rect(self.window, (255, 255, 255), cx, 2)
-
-            if CHIP_8_DEBUG_MODE:
-                status_text = f"PC: 0x{self.chip.registers.program_counter:X} SP: 0x{self.chip.registers.stack_pointer:X} DT: 0x{int(self.chip.registers.DT):X} ST: 0x{int(self.chip.registers.ST):X}"
-                font = pygame.font.SysFont("Arial", 20)
-                text_surface = font.render(status_text, False, (255, 255, 255))
-                text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 20))
-                self.window.blit(text_surface, text_rect.topleft)
-
-                for i in range(16):
-                    register_value = f"V{i}: 0x{int(self.chip.registers.V[f'V{i:X}']):X}"
-                    text_surface = font.render(register_value, False, (255, 255, 255))
-                    text_rect = text_surface.get_rect(topleft=(10, 30 + i * 20))
-                    self.window.blit(text_surface, text_rect.topleft)
-                text_surface = font.render("Registers", False, (255, 255, 255))
-                text_rect = text_surface.get_rect(topleft=(10, 10))
-                self.window.blit(text_surface, text_rect.topleft)
-
-                for i in range(len(self.chip.stack)):
-                    stack_value = f"0x{self.chip.stack[i]:X}"
-                    text_surface = font.render(stack_value, False, (255, 255, 255))
-                    text_rect = text_surface.get_rect(topleft=(SCREEN_WIDTH - 100, 30 + i * 20))
-                    self.window.blit(text_surface, text_rect.topleft)
-                text_surface = font.render("Stack", False, (255, 255, 255))
-                text_rect = text_surface.get_rect(topleft=(SCREEN_WIDTH - 100, 10))
-                self.window.blit(text_surface, text_rect.topleft)
-
-                rom_path_text = f"ROM: {pathlib.Path(self.chip.rom_path).name}"
-                text_surface = font.render(rom_path_text, False, (255, 255, 255))
-                text_rect = text_surface.get_rect(center=(SCREEN_WIDTH // 2, 10))
-                self.window.blit(text_surface, text_rect.topleft)
-
-            pygame.display.flip()
-
+            if self.recorder is not None:
+                self.recorder.capture()
+
+            self.rewinding = pygame.key.get_pressed()[self.rewind_key]
+            frame = self.hold_frame if self.rewinding else None
+            if self.scheduler.step(frame) and self.scheduler.present_due():
+                # History moves once per presented frame: every frame when paced, at the host frame rate in
+                # turbo, where snapshotting each of the uncapped frames would cost far more than running it.
+                if self.rewinding:
+                    self.rewind_frame()
+                else:
+                    self.rewind.record(self.chip.snapshot())
+                self.present()
+                self.update_caption()
+                # Rewound frames are not recorded; the capture resumes when play does.
+                if self.capture is not None and not self.rewinding:
+                    self.capture.push(self.chip.framebuffer.to_bytes(), self.scheduler.frames)
+            self.scheduler.sleep()
+
+        self.stop_recording()
+        if self.capture is not None:
+            self.capture.close()
+        self.sound.stop()
         pygame.quit()
 
+    def hold_frame(self) -> None:
+        """Stand in for a frame while rewinding, keeping the scheduler's pacing with the machine paused."""
+
+    def rewind_frame(self) -> None:
+        state = self.rewind.rewind()
+        if state is not None:
+            self.chip.restore(state)
+            if self.recorder is not None:
+                self.recorder.truncate()
+
+    def stop_recording(self) -> None:
+        if self.recorder is not None and self.movie_path is not None:
+            self.recorder.finish().save(self.movie_path)
+            self.recorder = None
+
+    def present(self) -> None:
+        self.window.fill((0, 0, 0))
+
+        surface = self.display.render()
+        cx = surface.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
+        self.window.blit(surface, cx.topleft)
+        pygame.draw.rect(self.window, (255, 255, 255), cx, 2)
+
+        if self.overlay is not None:
+            self.overlay.draw(self.window)
+
+        pygame.display.flip()
+
+    def update_caption(self) -> None:
+        scheduler = self.scheduler
+        caption = (
+            f"CHIP-8 Emulator - {scheduler.instructions_per_second:,.0f} IPS - {scheduler.frames_per_second:.0f} FPS"
+        )
+        caption += f" - rewind {self.rewind.average_record_time * 1e6:.0f} us/frame"
+        if scheduler.turbo:
+            caption += " [TURBO]"
+        if self.rewinding:
+            caption += f" [REWIND {self.rewind.seconds:.1f}s]"
+        if self.capture is not None and self.capture.dropped:
+            caption += f" [CAPTURE {self.capture.dropped} dropped]"
+        if caption != self._caption:
+            pygame.display.set_caption(caption)
+            self._caption = caption
+
+    @property
+    def save_path(self) -> pathlib.Path:
+        return self.save_folder / f"{pathlib.Path(self.chip.rom_path).stem}.slot{self.save_slot}.c8s"
+
     def on_keydown(self, key_code: int):
+        if key_code == self.turbo_key:
+            self.scheduler.turbo = not self.scheduler.turbo
+        elif key_code in self.slot_keys:
+            self.save_slot = self.slot_keys[key_code]
+        elif key_code == self.save_key:
+            save_state(self.chip, self.save_path)
+        elif key_code == self.load_key and self.save_path.exists():
+            # A loaded state is not on the recorded timeline, so the movie ends here.
+            self.stop_recording()
+            load_state(self.chip, self.save_path)
         if key_code in self.keymap:
-            key = self.keymap[key_code]
-            self.chip.keyboard.keymap[key].pressed = True
+            self.chip.keyboard.press(self.keymap[key_code])
 
     def on_keyup(self, key_code: int):
         if key_code in self.keymap:
-            key = self.keymap[key_code]
-            self.chip.keyboard.keymap[key].pressed = False
+            self.chip.keyboard.release(self.keymap[key_code])
@@ -0,0 +1,80 @@
+import pathlib
+import time
+import typing as t
+
+import pygame
+
+from src.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+if t.TYPE_CHECKING:
+    from src.core.chip8 import Chip8
+
+WHITE = (255, 255, 255)
+
+
+class DebugOverlay:
+    """Register, stack and ROM readout drawn over the window.
+
+    The font is loaded once and rendered text surfaces are cached by their text, so a line is only
+    rendered again when its value changes. Values are sampled at ``refresh_rate`` Hz, independent of
+    how often the window presents.
+    """
+
+    def __init__(
+        self,
+        chip: "Chip8",
+        *,
+        refresh_rate: float = 10,
+        font_name: str = "Arial",
+        font_size: int = 20,
+        cache_size: int = 1024,
+        clock: t.Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.chip = chip
+        self.refresh_interval = 1 / refresh_rate
+        self.font = pygame.font.SysFont(font_name, font_size)
+        self.cache_size = cache_size
+        self.clock = clock
+        self.renders = 0
+        self._surfaces: dict[str, pygame.Surface] = {}
+        self._lines: dict[str, tuple[str, pygame.Surface, pygame.Rect]] = {}
+        self._next_refresh = float("-inf")
+
+    def _render(self, text: str) -> pygame.Surface:
+        surface = self._surfaces.get(text)
+        if surface is None:
+            if len(self._surfaces) >= self.cache_size:
+                self._surfaces.clear()
+            surface = self._surfaces[text] = self.font.render(text, False, WHITE)
+            self.renders += 1
+        return surface
+
+    def _set_line(self, key: str, text: str, **position: tuple[int, int]) -> None:
+        line = self._lines.get(key)
+        if line is not None and line[0] == text:
+            return
+        surface = self._render(text)
+        self._lines[key] = (text, surface, surface.get_rect(**position))
+
+    def refresh(self) -> None:
+        registers = self.chip.registers
+        self._set_line(
+            "status",
+            f"PC: 0x{registers.PC:X} SP: 0x{registers.SP:X} DT: 0x{registers.DT:X} ST: 0x{registers.ST:X}",
+            center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 20),
+        )
+        self._set_line("registers", "Registers", topleft=(10, 10))
+        for i in range(16):
+            self._set_line(f"V{i:X}", f"V{i:X}: 0x{registers.V[i]:X}", topleft=(10, 30 + i * 20))
+        self._set_line("stack", "Stack", topleft=(SCREEN_WIDTH - 100, 10))
+        for i in range(len(registers.stack)):
+            text = f"0x{registers.stack[i]:X}" if i < registers.SP else ""
+            self._set_line(f"stack{i}", text, topleft=(SCREEN_WIDTH - 100, 30 + i * 20))
+        self._set_line("rom", f"ROM: {pathlib.Path(self.chip.rom_path).name}", center=(SCREEN_WIDTH // 2, 10))
+
+    def draw(self, target: pygame.Surface) -> None:
+        now = self.clock()
+        if now >= self._next_refresh:
+            self.refresh()
+            self._next_refresh = now + self.refresh_interval
+        target.blits([(surface, rect) for _, surface, rect in self._lines.values()], doreturn=False)
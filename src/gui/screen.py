@@ -1,46 +1,38 @@
 import pygame
 
-CHIP_8_DISPLAY_WIDTH = 64
-CHIP_8_DISPLAY_HEIGHT = 32
+from src.core.framebuffer import Framebuffer
+
 PIXEL_SIZE = 10
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
 
+# Maps a packed byte of eight pixels to eight palette indices.
+_EXPAND = tuple(bytes((byte >> (7 - bit)) & 1 for bit in range(8)) for byte in range(256))
+
 
 class Display:
-    def __init__(self):
-        self.surface = pygame.Surface((CHIP_8_DISPLAY_WIDTH * PIXEL_SIZE, CHIP_8_DISPLAY_HEIGHT * PIXEL_SIZE))
-        self.buffer = [[False] * CHIP_8_DISPLAY_WIDTH for _ in range(CHIP_8_DISPLAY_HEIGHT)]
-        self.dirty: set[tuple[int, int]] = set()
-
-    def set_pixel(self, x: int, y: int, value: bool) -> None:
-        if 0 <= x < CHIP_8_DISPLAY_WIDTH and 0 <= y < CHIP_8_DISPLAY_HEIGHT:
-            self.buffer[y][x] = value
-            self.dirty.add((x, y))
-
-    def get_pixel(self, x: int, y: int) -> bool:
-        if 0 <= x < CHIP_8_DISPLAY_WIDTH and 0 <= y < CHIP_8_DISPLAY_HEIGHT:
-            return self.buffer[y][x]
-        return False
-
-    def clear_display(self) -> None:
-        for y in range(CHIP_8_DISPLAY_HEIGHT):
-            for x in range(CHIP_8_DISPLAY_WIDTH):
-                self.buffer[y][x] = False
-        self.surface.fill(BLACK)
-        self.dirty.clear()
+    def __init__(self, framebuffer: Framebuffer) -> None:
+        self.framebuffer = framebuffer
+        self.pixels = bytearray(framebuffer.width * framebuffer.height)
+        # The native-resolution frame shares memory with `pixels`, so updating it needs no copy.
+        self.frame = pygame.image.frombuffer(self.pixels, (framebuffer.width, framebuffer.height), "P")
+        self.frame.set_palette([BLACK, WHITE])
+        self.surface = pygame.Surface((framebuffer.width * PIXEL_SIZE, framebuffer.height * PIXEL_SIZE), depth=8)
+        self.surface.set_palette([BLACK, WHITE])
+        self._rendered_version = -1
 
     def render(self) -> pygame.Surface:
-        for x, y in self.dirty:
-            color = WHITE if self.buffer[y][x] else BLACK
-            pygame.draw.rect(self.surface, color, (x * PIXEL_SIZE, y * PIXEL_SIZE, PIXEL_SIZE, PIXEL_SIZE))
-        self.dirty.clear()
+        framebuffer = self.framebuffer
+        if framebuffer.version != self._rendered_version:
+            self.pixels[:] = b"".join([_EXPAND[byte] for byte in framebuffer.to_bytes()])
+            pygame.transform.scale(self.frame, self.surface.get_size(), self.surface)
+            self._rendered_version = framebuffer.version
         return self.surface
 
     @property
     def width(self) -> int:
-        return CHIP_8_DISPLAY_WIDTH
+        return self.framebuffer.width
 
     @property
     def height(self) -> int:
-        return CHIP_8_DISPLAY_HEIGHT
+        return self.framebuffer.height
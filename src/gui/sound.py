@@ -0,0 +1,33 @@
+import array
+
+import pygame
+
+SAMPLE_RATE = 44100
+TONE_FREQUENCY = 440
+VOLUME = 0.25
+
+
+class PygameSound:
+    """Loops a pre-generated square wave on a mixer channel while the sound timer is running."""
+
+    def __init__(self, frequency: int = TONE_FREQUENCY, volume: float = VOLUME) -> None:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=SAMPLE_RATE, size=-16, channels=1)
+        sample_rate, _, channels = pygame.mixer.get_init()
+        # A whole number of periods per buffer keeps the loop seamless.
+        period = max(round(sample_rate / frequency), 2)
+        amplitude = int(0x7FFF * volume)
+        wave = [amplitude if i < period // 2 else -amplitude for i in range(period)] * max(
+            sample_rate // period // 10, 1
+        )
+        samples = array.array("h", [sample for sample in wave for _ in range(channels)])
+        self.tone = pygame.mixer.Sound(buffer=samples.tobytes())
+        self.channel: pygame.mixer.Channel | None = None
+
+    def start(self) -> None:
+        if self.channel is None or not self.channel.get_busy():
+            self.channel = self.tone.play(loops=-1)
+
+    def stop(self) -> None:
+        self.tone.stop()
+        self.channel = None
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import struct
+import time
+import typing as t
+
+from src.core.rewind import apply_delta
+from src.net.protocol import FRAME, HEADER, OPEN, MessageType, encode, read_message
+
+__all__: tuple[str, ...] = ("Client",)
+
+_PING = struct.Struct("<d")
+
+
+class Client:
+    """Minimal client for :class:`~src.net.server.EmulationServer` that keeps a copy of the framebuffer.
+
+    Messages are read on a background task: frames and deltas update :attr:`framebuffer`, and replies to
+    :meth:`ping` and :meth:`stats` resolve the call that is waiting for them.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.framebuffer: bytes | None = None
+        self.frame = -1
+        self.frames = 0
+        self.bytes_received = 0
+        self.error: str | None = None
+        self.closed = False
+        self._updated = asyncio.Condition()
+        self._replies: dict[MessageType, asyncio.Future[bytes]] = {}
+        self._task = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host: str, port: int, rom: str, *, seed: int | None = None) -> "Client":
+        reader, writer = await asyncio.open_connection(host, port)
+        writer.write(encode(MessageType.OPEN, OPEN.pack(-1 if seed is None else seed) + rom.encode()))
+        await writer.drain()
+        return cls(reader, writer)
+
+    async def _receive(self) -> None:
+        try:
+            while True:
+                kind, payload = await read_message(self.reader)
+                self.bytes_received += HEADER.size + len(payload)
+                if kind in (MessageType.FRAME, MessageType.DELTA):
+                    (frame,) = FRAME.unpack_from(payload)
+                    data = payload[FRAME.size :]
+                    if kind == MessageType.FRAME:
+                        self.framebuffer = data
+                    elif self.framebuffer is not None:
+                        self.framebuffer = apply_delta(self.framebuffer, data)
+                    else:
+                        raise ValueError("Delta received before a full frame.")
+                    async with self._updated:
+                        self.frame = frame
+                        self.frames += 1
+                        self._updated.notify_all()
+                elif kind == MessageType.ERROR:
+                    self.error = payload.decode()
+                elif kind in self._replies:
+                    self._replies.pop(kind).set_result(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.closed = True
+            for future in self._replies.values():
+                future.cancel()
+            async with self._updated:
+                self._updated.notify_all()
+
+    async def wait_frame(self, frame: int = 0) -> bool:
+        """Wait until a frame numbered ``frame`` or later has arrived; False if the connection closed first."""
+        async with self._updated:
+            await self._updated.wait_for(lambda: self.frame >= frame or self.closed)
+        return self.frame >= frame
+
+    async def _request(self, kind: MessageType, reply: MessageType, payload: bytes = b"") -> bytes:
+        future = self._replies[reply] = asyncio.get_running_loop().create_future()
+        self.writer.write(encode(kind, payload))
+        await self.writer.drain()
+        return await future
+
+    async def send_keys(self, mask: int) -> None:
+        self.writer.write(encode(MessageType.KEYS, struct.pack("<H", mask)))
+        await self.writer.drain()
+
+    async def ping(self) -> float:
+        """Return the round trip time to the server in seconds."""
+        (sent,) = _PING.unpack(await self._request(MessageType.PING, MessageType.PONG, _PING.pack(time.perf_counter())))
+        return time.perf_counter() - sent
+
+    async def stats(self) -> dict[str, t.Any]:
+        return json.loads(await self._request(MessageType.STATS, MessageType.STATS_REPLY))
+
+    async def close(self) -> None:
+        self.writer.close()
+        await asyncio.gather(self._task, return_exceptions=True)
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
@@ -0,0 +1,58 @@
+"""Binary wire protocol shared by the emulation server and its clients.
+
+Every message is a ``<BI`` header (message type, payload length) followed by the payload. Frames are sent
+once in full and then as :func:`~src.core.rewind.xor_delta` runs against the last frame the client got,
+so a frame in which nothing moved costs nothing and a moving sprite costs a few bytes.
+"""
+
+import asyncio
+import enum
+import struct
+
+__all__: tuple[str, ...] = (
+    "FRAME",
+    "HEADER",
+    "MAX_PAYLOAD",
+    "OPEN",
+    "MessageType",
+    "encode",
+    "read_message",
+)
+
+HEADER = struct.Struct("<BI")
+MAX_PAYLOAD = 1 << 16
+OPEN = struct.Struct("<q")
+FRAME = struct.Struct("<Q")
+
+
+class MessageType(enum.IntEnum):
+    # Client to server.
+    OPEN = 1
+    KEYS = 2
+    PING = 3
+    STATS = 4
+    # Server to client.
+    FRAME = 16
+    DELTA = 17
+    PONG = 18
+    STATS_REPLY = 19
+    ERROR = 20
+
+
+def encode(kind: MessageType, payload: bytes = b"") -> bytes:
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[MessageType, bytes]:
+    """Read one message, raising :class:`asyncio.IncompleteReadError` at end of stream.
+
+    Unknown message types and payloads over :data:`MAX_PAYLOAD` raise :class:`ValueError`.
+    """
+    kind, length = HEADER.unpack(await reader.readexactly(HEADER.size))
+    if length > MAX_PAYLOAD:
+        raise ValueError(f"Message payload of {length} bytes exceeds {MAX_PAYLOAD}.")
+    try:
+        message_type = MessageType(kind)
+    except ValueError:
+        raise ValueError(f"Unknown message type {kind}.") from None
+    return message_type, await reader.readexactly(length) if length else b""
@@ -0,0 +1,239 @@
+"""Many paced machines behind one asyncio TCP server, one session per connection."""
+
+import asyncio
+import itertools
+import json
+import pathlib
+import struct
+import time
+import typing as t
+
+from src.constants import CHIP_8_CPU_CLOCK
+from src.core.chip8 import Chip8, Engine
+from src.core.rewind import xor_delta
+from src.core.scheduler import FrameScheduler
+from src.net.protocol import FRAME, OPEN, MessageType, encode, read_message
+
+__all__: tuple[str, ...] = ("EmulationServer", "Session")
+
+_KEYS = struct.Struct("<H")
+
+
+class Session:
+    """One machine paced in real time on its own task and streamed to one client.
+
+    A frame is only sent when the framebuffer changed, as a delta against the last frame the client got.
+    While more than ``max_buffer`` bytes wait in the transport, changed frames are not queued behind them:
+    emulation keeps its pace and the next frame that fits goes out as one delta that covers everything
+    the client missed.
+    """
+
+    def __init__(
+        self,
+        chip: Chip8,
+        writer: asyncio.StreamWriter,
+        *,
+        session_id: int = 0,
+        cpu_clock: int = CHIP_8_CPU_CLOCK,
+        max_buffer: int = 64 * 1024,
+        clock: t.Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.chip = chip
+        self.writer = writer
+        self.session_id = session_id
+        self.max_buffer = max_buffer
+        self.clock = clock
+        self.scheduler = FrameScheduler(chip, cpu_clock=cpu_clock, clock=clock)
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+        self.latency = 0.0
+        self.max_latency = 0.0
+        self.error: str | None = None
+        self._latency_total = 0.0
+        self._latency_samples = 0
+        self._input_at: float | None = None
+        self._sent: bytes | None = None
+        self._sent_version = -1
+
+    def set_keys(self, mask: int) -> None:
+        self.chip.keyboard.set_state(mask)
+        if self._input_at is None:
+            self._input_at = self.clock()
+
+    def send(self, kind: MessageType, payload: bytes = b"") -> None:
+        message = encode(kind, payload)
+        self.writer.write(message)
+        self.bytes_sent += len(message)
+
+    def publish(self) -> None:
+        """Send the current frame if it changed and the client is keeping up."""
+        if self._input_at is not None:
+            # Input latency: from the keys arriving to the end of the first frame that ran with them.
+            latency = self.clock() - self._input_at
+            self._input_at = None
+            self._latency_total += latency
+            self._latency_samples += 1
+            self.latency = self._latency_total / self._latency_samples
+            self.max_latency = max(self.max_latency, latency)
+        framebuffer = self.chip.framebuffer
+        if framebuffer.version == self._sent_version:
+            return
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.frames_dropped += 1
+            return
+        frame = framebuffer.to_bytes()
+        self._sent_version = framebuffer.version
+        if frame == self._sent:
+            return
+        header = FRAME.pack(self.scheduler.frames)
+        if self._sent is None:
+            self.send(MessageType.FRAME, header + frame)
+        else:
+            self.send(MessageType.DELTA, header + xor_delta(self._sent, frame))
+        self._sent = frame
+        self.frames_sent += 1
+
+    async def run(self) -> None:
+        scheduler = self.scheduler
+        try:
+            while not self.writer.is_closing():
+                if scheduler.step():
+                    self.publish()
+                await asyncio.sleep(scheduler.delay())
+        except (ValueError, IndexError) as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.send(MessageType.ERROR, self.error.encode())
+            self.writer.close()
+
+    def stats(self) -> dict[str, t.Any]:
+        return {
+            "session": self.session_id,
+            "rom": pathlib.Path(self.chip.rom_path).name,
+            "cycles": self.chip.cycles,
+            "frames": self.scheduler.frames,
+            "instructions_per_second": self.scheduler.instructions_per_second,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "bytes_sent": self.bytes_sent,
+            "latency_ms": self.latency * 1000,
+            "max_latency_ms": self.max_latency * 1000,
+            "error": self.error,
+        }
+
+
+class EmulationServer:
+    """Accepts TCP clients, each of which opens one ROM from ``rom_directory`` and plays it.
+
+    A client sends ``OPEN`` (seed, ROM name) first, then any number of ``KEYS`` (16-bit keypad mask),
+    ``PING`` (echoed back as ``PONG``) and ``STATS`` (answered with the server-wide stats as JSON).
+    """
+
+    def __init__(
+        self,
+        rom_directory: str | pathlib.Path,
+        *,
+        engine: Engine = "interpreter",
+        cpu_clock: int = CHIP_8_CPU_CLOCK,
+        max_buffer: int = 64 * 1024,
+        max_sessions: int = 64,
+    ) -> None:
+        self.rom_directory = pathlib.Path(rom_directory).resolve()
+        self.engine: Engine = engine
+        self.cpu_clock = cpu_clock
+        self.max_buffer = max_buffer
+        self.max_sessions = max_sessions
+        self.sessions: dict[int, Session] = {}
+        self._ids = itertools.count(1)
+        self._connections: dict[asyncio.StreamWriter, asyncio.Task[t.Any]] = {}
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.Server:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server
+
+    @property
+    def address(self) -> tuple[str, int]:
+        if self._server is None:
+            raise RuntimeError("Server is not started.")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return host, port
+
+    async def close(self) -> None:
+        """Stop accepting clients and end every open connection."""
+        if self._server is not None:
+            self._server.close()
+        # Closing the transport ends the handler's read loop, which then tears its session down.
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*self._connections.values(), return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    def _find_rom(self, name: str) -> pathlib.Path:
+        path = (self.rom_directory / name).resolve()
+        if path.parent != self.rom_directory or not path.is_file():
+            raise ValueError(f"Unknown ROM {name!r}.")
+        return path
+
+    def _open(self, payload: bytes, writer: asyncio.StreamWriter) -> Session:
+        if len(self.sessions) >= self.max_sessions:
+            raise ValueError(f"Server is full ({self.max_sessions} sessions).")
+        if len(payload) < OPEN.size:
+            raise ValueError("Malformed OPEN message.")
+        (seed,) = OPEN.unpack_from(payload)
+        path = self._find_rom(payload[OPEN.size :].decode())
+        chip = Chip8(path, instructions_per_tick=None, engine=self.engine, seed=None if seed < 0 else seed)
+        session = Session(
+            chip, writer, session_id=next(self._ids), cpu_clock=self.cpu_clock, max_buffer=self.max_buffer
+        )
+        self.sessions[session.session_id] = session
+        return session
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._connections[writer] = task
+        session: Session | None = None
+        runner: asyncio.Task[None] | None = None
+        try:
+            kind, payload = await read_message(reader)
+            if kind != MessageType.OPEN:
+                raise ValueError(f"Expected OPEN, got {kind.name}.")
+            session = self._open(payload, writer)
+            runner = asyncio.create_task(session.run())
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MessageType.KEYS:
+                    session.set_keys(*_KEYS.unpack(payload))
+                elif kind == MessageType.PING:
+                    session.send(MessageType.PONG, payload)
+                elif kind == MessageType.STATS:
+                    session.send(MessageType.STATS_REPLY, json.dumps(self.stats()).encode())
+                else:
+                    raise ValueError(f"Unexpected {kind.name} from client.")
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except (ValueError, struct.error) as exc:
+            writer.write(encode(MessageType.ERROR, str(exc).encode()))
+        finally:
+            writer.close()
+            self._connections.pop(writer, None)
+            if session is not None:
+                del self.sessions[session.session_id]
+            if runner is not None:
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+
+    def stats(self) -> dict[str, t.Any]:
+        """Per-session stats plus totals; latency is averaged over sessions that have seen input."""
+        sessions = [session.stats() for session in self.sessions.values()]
+        latencies = [session.latency for session in self.sessions.values() if session.latency]
+        return {
+            "sessions": sessions,
+            "instructions_per_second": sum(session["instructions_per_second"] for session in sessions),
+            "frames_sent": sum(session["frames_sent"] for session in sessions),
+            "frames_dropped": sum(session["frames_dropped"] for session in sessions),
+            "bytes_sent": sum(session["bytes_sent"] for session in sessions),
+            "latency_ms": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        }
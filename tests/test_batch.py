@@ -0,0 +1,43 @@
+import json
+import pathlib
+
+import pytest
+
+from src.core.batch import check_golden, find_roms, run_batch, run_rom, to_csv, to_json
+from src.core.chip8 import Engine
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+GOLDEN = pathlib.Path(__file__).parent / "golden_framebuffers.json"
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "recompiler"])
+def test_batch_matches_golden(engine: Engine) -> None:
+    """Test that every ROM still draws its golden framebuffer after 20k cycles."""
+    results = run_batch(find_roms(ROMS), 20_000, engine=engine)
+    golden = json.loads(GOLDEN.read_text())
+    assert {result.rom for result in results} == set(golden)
+    assert check_golden(results, golden) == []
+    assert all(result.error is None and result.instructions == 20_000 for result in results)
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "recompiler"])
+def test_run_rom_reports_errors(tmp_path: pathlib.Path, engine: Engine) -> None:
+    """Test that an unknown opcode is reported instead of raised, with the instructions run before it."""
+    rom = tmp_path / "bad.ch8"
+    rom.write_bytes(bytes([0x60, 0x01, 0x70, 0x01, 0x70, 0x01, 0x00, 0x00]))
+    result = run_rom(rom, 100, engine=engine)
+    assert result.error == "ValueError: Unknown opcode: 0000"
+    assert result.final_pc == 0x208
+    assert result.instructions == 3 and result.instructions_per_second > 0
+    assert check_golden([result], {"bad.ch8": "0" * 40}) == [
+        f"bad.ch8: framebuffer {result.framebuffer_hash} != golden {'0' * 40}"
+    ]
+
+
+def test_reports() -> None:
+    """Test the JSON and CSV reports."""
+    results = [run_rom(ROMS / "IBM Logo.ch8", 1_000)]
+    assert json.loads(to_json(results))[0]["final_pc"] == results[0].final_pc
+    lines = to_csv(results).splitlines()
+    assert lines[0].startswith("rom,instructions,wall_time")
+    assert len(lines) == 2
@@ -0,0 +1,34 @@
+import pathlib
+
+from src.core.benchmark import FAMILY_OPCODES, compare, machine_info, run_macro, run_micro, scripted_keys
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+def test_micro_benchmarks_run() -> None:
+    """Test that every micro-benchmark runs and reports a time per operation."""
+    results = run_micro(ROMS / "IBM Logo.ch8", number=20, repeat=1)
+    names = {result.name for result in results}
+    assert {"fetch_opcode", "draw_sprite", "memory_getitem", "memory_setitem"} <= names
+    assert {f"execute_opcode[{family}]" for family in FAMILY_OPCODES} <= names
+    assert all(result.ns_per_op > 0 and result.ops == 20 for result in results)
+
+
+def test_macro_benchmarks_run() -> None:
+    """Test that a ROM benchmark runs at least the requested cycles."""
+    (result,) = run_macro([ROMS / "Pong [Paul Vervalin, 1990].ch8"], cycles=1_000, repeat=1)
+    assert result.name == "rom[interpreter:Pong [Paul Vervalin, 1990]]"
+    assert result.ops >= 1_000
+
+
+def test_scripted_keys() -> None:
+    """Test that the scripted keypad holds each key in turn."""
+    assert [scripted_keys(frame) for frame in (0, 30, 60, 90, 150)] == [0, 1, 0, 2, 4]
+
+
+def test_compare() -> None:
+    """Test that only benchmarks present in both runs are compared."""
+    (comparison,) = compare({"a": 100.0, "b": 50.0}, {"a": 125.0, "c": 1.0})
+    assert comparison.name == "a"
+    assert comparison.change == 0.25
+    assert machine_info()["cpu_count"]
@@ -0,0 +1,172 @@
+import pathlib
+import struct
+import threading
+import zlib
+
+import pytest
+
+from src.core import capture
+from src.core.capture import FrameCapture, format_for
+
+BLANK = bytes(256)
+
+
+def frame(*pixels: tuple[int, int]) -> bytes:
+    bitmap = bytearray(256)
+    for x, y in pixels:
+        bitmap[y * 8 + x // 8] |= 0x80 >> (x % 8)
+    return bytes(bitmap)
+
+
+def read_png(path: pathlib.Path) -> tuple[int, int, bytes]:
+    data = path.read_bytes()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    offset = 8
+    chunks: dict[bytes, bytes] = {}
+    while offset < len(data):
+        (length,) = struct.unpack_from(">I", data, offset)
+        kind = data[offset + 4 : offset + 8]
+        body = data[offset + 8 : offset + 8 + length]
+        assert struct.unpack_from(">I", data, offset + 8 + length)[0] == zlib.crc32(kind + body)
+        chunks[kind] = chunks.get(kind, b"") + body
+        offset += length + 12
+    width, height, depth, colour = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    assert (depth, colour) == (1, 0)
+    return width, height, zlib.decompress(chunks[b"IDAT"])
+
+
+def read_gif(path: pathlib.Path) -> tuple[list[int], list[bytes]]:
+    """Return the frame delays and the decoded colour indices of every frame."""
+    data = path.read_bytes()
+    assert data[:6] == b"GIF89a" and data[-1:] == b"\x3b"
+    width, height = struct.unpack_from("<HH", data, 6)
+    offset = 13 + 6
+    delays: list[int] = []
+    images: list[bytes] = []
+    while data[offset] != 0x3B:
+        if data[offset] == 0x21:
+            if data[offset + 1] == 0xF9:
+                delays.append(struct.unpack_from("<H", data, offset + 4)[0])
+            offset += 2
+            while data[offset]:
+                offset += data[offset] + 1
+            offset += 1
+            continue
+        assert data[offset] == 0x2C
+        min_code_size = data[offset + 10]
+        offset += 11
+        blocks = bytearray()
+        while data[offset]:
+            blocks += data[offset + 1 : offset + 1 + data[offset]]
+            offset += data[offset] + 1
+        offset += 1
+        images.append(unlzw(bytes(blocks), min_code_size))
+        assert len(images[-1]) == width * height
+    return delays, images
+
+
+def unlzw(data: bytes, min_code_size: int) -> bytes:
+    clear, end = 1 << min_code_size, (1 << min_code_size) + 1
+    stream = int.from_bytes(data, "little")
+    position = 0
+    table: list[bytes] = []
+    previous: bytes | None = None
+    out = bytearray()
+    code_size = min_code_size + 1
+    while True:
+        code = stream >> position & ((1 << code_size) - 1)
+        position += code_size
+        if code == clear:
+            table = [bytes((i,)) for i in range(clear)] + [b"", b""]
+            code_size = min_code_size + 1
+            previous = None
+            continue
+        if code == end:
+            return bytes(out)
+        if code < len(table):
+            entry = table[code]
+        else:
+            assert previous is not None and code == len(table)
+            entry = previous + previous[:1]
+        out += entry
+        if previous is not None:
+            table.append(previous + entry[:1])
+            if len(table) == 1 << code_size and code_size < 12:
+                code_size += 1
+        previous = entry
+
+
+def test_png_sequence_roundtrip(tmp_path: pathlib.Path) -> None:
+    """Test that every distinct frame becomes a 1-bit PNG named by its frame number, scaled up."""
+    moving = [frame((i, i), (63, 31)) for i in range(3)]
+    with FrameCapture(tmp_path / "frames", scale=2) as recording:
+        for bitmap in [moving[0], moving[0], moving[1], moving[2], moving[2]]:
+            recording.push(bitmap)
+    assert (recording.pushed, recording.duplicates, recording.dropped) == (3, 2, 0)
+    assert sorted(path.name for path in (tmp_path / "frames").iterdir()) == [
+        "frame_000000.png",
+        "frame_000002.png",
+        "frame_000003.png",
+    ]
+    width, height, raw = read_png(tmp_path / "frames" / "frame_000002.png")
+    assert (width, height) == (128, 64)
+    rows = [raw[y * 17 + 1 : (y + 1) * 17] for y in range(64)]
+    assert all(raw[y * 17] == 0 for y in range(64))
+    assert rows[2][0] == rows[3][0] == 0b00110000
+    assert rows[62][15] == rows[63][15] == 0b00000011
+    assert sum(map(int.bit_count, b"".join(rows))) == 8
+
+
+def test_gif_timing_and_frames(tmp_path: pathlib.Path) -> None:
+    """Test that a GIF holds each distinct frame until the next one and decodes back to the pixels."""
+    noise = bytes((i * 37 + i // 7) & 0xFF for i in range(256))
+    path = tmp_path / "clip.gif"
+    assert format_for(path) == "gif" and format_for(tmp_path / "clip.Y4M") == "y4m"
+    with FrameCapture(path, worker="process") as recording:
+        for number in range(120):
+            recording.push(noise if number >= 45 else frame((number // 15, 0)))
+    delays, images = read_gif(path)
+    assert len(images) == 4 and sum(delays) == 200
+    assert delays == [25, 25, 25, 125]
+    assert images[1] == bytes(1) + bytes((1,)) + bytes(62) + bytes(64 * 31)
+    bits = "".join(f"{byte:08b}" for byte in noise)
+    assert images[3] == bytes(int(bit) for bit in bits)
+
+
+def test_y4m_repeats_deduplicated_frames(tmp_path: pathlib.Path) -> None:
+    """Test that a raw video fills the gaps between distinct frames to keep its frame rate."""
+    path = tmp_path / "clip.y4m"
+    with FrameCapture(path, frame_rate=30) as recording:
+        recording.push(frame((0, 0)), 5)
+        recording.push(frame((0, 0)), 6)
+        recording.push(frame((1, 0)), 10)
+        with pytest.raises(ValueError):
+            recording.push(BLANK, 9)
+        recording.push(frame((1, 0)))
+    with pytest.raises(ValueError):
+        recording.push(BLANK)
+    header, _, body = path.read_bytes().partition(b"\n")
+    assert header == b"YUV4MPEG2 W64 H32 F30:1 Ip A1:1 Cmono"
+    frames = body.split(b"FRAME\n")[1:]
+    assert len(frames) == 7
+    assert all(len(data) == 64 * 32 for data in frames)
+    assert [data.index(0xFF) for data in frames] == [0] * 5 + [1] * 2
+
+
+def test_drop_policy_never_waits_for_the_encoder(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that a stalled encoder costs dropped frames rather than a blocked caller."""
+    release = threading.Event()
+    write = capture.PngSequenceEncoder.write
+
+    def stalled(self: capture.PngSequenceEncoder, number: int, bitmap: bytes) -> None:
+        release.wait()
+        write(self, number, bitmap)
+
+    monkeypatch.setattr(capture.PngSequenceEncoder, "write", stalled)
+    recording = FrameCapture(tmp_path, queue_size=2)
+    queued = [recording.push(frame((i, 0))) for i in range(10)]
+    release.set()
+    recording.close()
+    assert queued[:2] == [True, True] and recording.dropped >= 5
+    assert recording.pushed + recording.dropped == 10
+    assert len(list(tmp_path.iterdir())) == recording.pushed
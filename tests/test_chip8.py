@@ -0,0 +1,159 @@
+import pathlib
+import typing as t
+
+import pytest
+
+from src.core.chip8 import Chip8
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+@pytest.fixture
+def chip() -> Chip8:
+    """Fixture for a machine running the IBM logo ROM."""
+    return Chip8(ROMS / "IBM Logo.ch8")
+
+
+def test_run_cycles(chip: Chip8) -> None:
+    """Test that a batch executes exactly the requested number of cycles."""
+    assert chip.run_cycles(100) == 100
+    assert chip.cycles == 100
+    assert any(any(row) for row in chip.framebuffer.buffer)
+
+
+def test_run_cycles_ticks_timers(chip: Chip8) -> None:
+    """Test that timers tick once every `instructions_per_tick` cycles."""
+    ticks = chip.instructions_per_tick
+    assert ticks is not None
+    chip.registers.DT = 10
+    chip.run_cycles(ticks * 3 - 1)
+    assert chip.registers.DT == 8
+    chip.run_cycles(1)
+    assert chip.registers.DT == 7
+
+
+def test_run_until(chip: Chip8) -> None:
+    """Test that `run_until` stops as soon as the predicate holds."""
+    executed = chip.run_until(lambda c: c.registers.program_counter >= 0x210)
+    assert chip.registers.program_counter >= 0x210
+    assert executed == chip.cycles
+    assert chip.run_until(lambda _: False, max_cycles=50) == 50
+
+
+@pytest.mark.parametrize("engine, profile", [("interpreter", False), ("recompiler", False), ("interpreter", True)])
+@pytest.mark.parametrize(
+    "program, executed, error",
+    [
+        ("6001 7001 7001 0000", 3, "Unknown opcode: 0000"),
+        ("2200", 16, "Stack overflow at 0x200"),
+        ("6001 AFFF 7001 F165", 3, "Memory read out of range at 0x1000"),
+    ],
+)
+def test_run_cycles_counts_up_to_a_fault(
+    tmp_path: pathlib.Path, engine: t.Any, profile: bool, program: str, executed: int, error: str
+) -> None:
+    """Test that the instructions before one that raises are counted in cycles and toward the next tick."""
+    rom = tmp_path / "fault.ch8"
+    rom.write_bytes(bytes.fromhex(program))
+    chip = Chip8(rom, engine=engine, profile=profile, instructions_per_tick=executed + 1)
+    chip.registers.DT = 5
+    with pytest.raises((ValueError, IndexError), match=error):
+        chip.run_cycles(100)
+    assert chip.cycles == executed
+    assert chip.registers.DT == 5 and chip._tick_countdown == 1
+
+
+def test_stack_bounds(chip: Chip8) -> None:
+    """Test that the fixed 16-slot stack rejects overflow and underflow."""
+    for _ in range(16):
+        chip.execute_opcode(0x2300)
+    assert chip.registers.SP == 16
+    with pytest.raises(IndexError):
+        chip.execute_opcode(0x2300)
+    for _ in range(16):
+        chip.execute_opcode(0x00EE)
+    with pytest.raises(IndexError):
+        chip.execute_opcode(0x00EE)
+
+
+def test_decode_cache_invalidation(chip: Chip8) -> None:
+    """Test that memory writes invalidate cached handlers for the overwritten opcode."""
+    chip.memory[0x200:0x204] = bytes([0x60, 0x01, 0x12, 0x00])  # V0 = 1; jump 0x200
+    chip.run_cycles(4)
+    assert chip.registers.V[0] == 1
+    assert chip.decode_cache.misses == 2
+    assert chip.decode_cache.hits == 2
+    chip.memory[0x201] = 0x02  # V0 = 2
+    chip.run_cycles(2)
+    assert chip.registers.V[0] == 2
+    assert chip.decode_cache.misses == 3
+
+
+class RecordingSound:
+    def __init__(self) -> None:
+        self.events: list[str] = []
+
+    def start(self) -> None:
+        self.events.append("start")
+
+    def stop(self) -> None:
+        self.events.append("stop")
+
+
+def test_sound_follows_timer_edges() -> None:
+    """Test that the sound backend is only started and stopped on sound timer edges."""
+    sound = RecordingSound()
+    chip = Chip8(ROMS / "IBM Logo.ch8", sound=sound)
+    chip.registers.ST = 3
+    for _ in range(5):
+        chip.timers_60Hz()
+    assert sound.events == ["start", "stop"]
+
+
+@pytest.fixture
+def key_wait_rom(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a ROM that waits for a key into V3 and then spins."""
+    path = tmp_path / "wait_key.ch8"
+    path.write_bytes(bytes.fromhex("F30A 1202"))
+    return path
+
+
+def test_key_wait_blocks_until_press(key_wait_rom: pathlib.Path) -> None:
+    """Test that FX0A blocks without resuming until a key goes down."""
+    chip = Chip8(key_wait_rom)
+    assert chip.run_cycles(100) == 100
+    assert chip.blocked and chip.wait_for_key == 3
+    assert chip.registers.PC == 0x202
+    chip.keyboard.KEYA.pressed = True
+    assert not chip.blocked
+    chip.run_cycles(1)
+    assert chip.wait_for_key is None and chip.registers.V[3] == 0xA
+
+
+def test_key_wait_sees_held_key(key_wait_rom: pathlib.Path) -> None:
+    """Test that a key held before FX0A runs resumes the wait, also after restoring a state."""
+    chip = Chip8(key_wait_rom)
+    chip.keyboard.KEY7.pressed = True
+    chip.run_cycles(2)
+    assert chip.wait_for_key is None and chip.registers.V[3] == 7
+
+    chip.reset()
+    chip.run_cycles(5)
+    state = chip.snapshot()
+    chip.keyboard.KEY2.pressed = True
+    chip.keyboard.KEY2.pressed = False
+    chip.run_cycles(1)
+    assert chip.blocked
+    chip.keyboard.KEY5.pressed = True
+    chip.restore(state)
+    assert not chip.blocked
+
+
+def test_keyboard_notifies_transitions(chip: Chip8) -> None:
+    """Test that key listeners hear each transition once."""
+    events: list[tuple[int, bool]] = []
+    chip.keyboard.add_listener(lambda value, pressed: events.append((value, pressed)))
+    chip.keyboard.KEY1.pressed = True
+    chip.keyboard.KEY1.pressed = True
+    chip.keyboard.set_state(0b110)
+    assert events == [(1, True), (2, True)]
@@ -0,0 +1,96 @@
+import pathlib
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.scheduler import FrameScheduler
+
+np = pytest.importorskip("numpy")
+
+from src.core.env import Chip8Env, Chip8VectorEnv
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+PONG = ROMS / "Pong [Paul Vervalin, 1990].ch8"
+ACTIONS = [0, 1 << 1, 1 << 4, 0, 1 << 0xC, 1 << 0xD] * 5
+
+
+def score(chip: Chip8) -> float:
+    """A module-level reward, which worker processes can unpickle under every start method."""
+    return float(chip.registers.V[0] + chip.registers.V[1])
+
+
+def test_step_runs_frame_skip_frames() -> None:
+    """Test that a step holds the keys for frame_skip frames and matches a scheduler run frame by frame."""
+    env = Chip8Env(PONG, frame_skip=3)
+    observation, info = env.reset(seed=7)
+    assert observation.shape == (32, 64) and not observation.flags.writeable
+    assert info["frames"] == 0
+    chip = Chip8(PONG, instructions_per_tick=None, seed=7)
+    scheduler = FrameScheduler(chip)
+    for action in ACTIONS:
+        observation, reward, terminated, truncated, info = env.step(action)
+        chip.keyboard.set_state(action)
+        for _ in range(3):
+            scheduler.run_frame()
+        assert (reward, terminated, truncated) == (0.0, False, False)
+    assert info["frames"] == 3 * len(ACTIONS)
+    assert info["cycles"] == chip.cycles
+    assert env.chip.snapshot() == chip.snapshot()
+    assert np.packbits(observation, axis=1).tobytes() == chip.framebuffer.to_bytes()
+
+
+def test_observation_is_a_view_over_the_buffer() -> None:
+    """Test that observations are views over the caller's buffer and that packed frames match pixels."""
+    buffer = bytearray(32 * 8)
+    packed = Chip8Env(PONG, observation="packed", buffer=buffer)
+    pixels = Chip8Env(PONG)
+    first, _ = packed.reset(seed=1)
+    pixel_observation, _ = pixels.reset(seed=1)
+    for action in ACTIONS:
+        observation, *_ = packed.step(action, frame_skip=2)
+        assert observation is first
+        pixel_observation, *_ = pixels.step(action, frame_skip=2)
+    assert np.shares_memory(first, np.frombuffer(buffer, dtype=np.uint8))
+    assert bytes(buffer) == np.packbits(pixel_observation, axis=1).tobytes()
+
+
+def test_fault_terminates_and_max_steps_truncates(tmp_path: pathlib.Path) -> None:
+    """Test that an instruction that raises ends the episode and that max_steps truncates it."""
+    rom = tmp_path / "recursion.ch8"
+    rom.write_bytes(bytes.fromhex("2200"))
+    env = Chip8Env(rom)
+    env.reset()
+    _, _, terminated, truncated, info = env.step(0, frame_skip=5)
+    assert (terminated, truncated) == (True, False)
+    assert info["error"] == "IndexError: Stack overflow at 0x200"
+    with pytest.raises(RuntimeError):
+        env.step(0)
+    env = Chip8Env(PONG, max_steps=2, reward=lambda chip: float(chip.registers.V[0]))
+    env.reset()
+    assert env.step(0)[3] is False
+    _, reward, terminated, truncated, _ = env.step(0)
+    assert (terminated, truncated) == (False, True)
+    assert reward == env.chip.registers.V[0]
+
+
+def test_vector_env_matches_single_env() -> None:
+    """Test that environments in worker processes match single ones and reset when an episode ends."""
+    single = [Chip8Env(PONG, frame_skip=2, reward=score), Chip8Env(ROMS / "IBM Logo.ch8", frame_skip=2, reward=score)]
+    for i, env in enumerate(single):
+        env.reset(seed=5 + i)
+    roms = [PONG, ROMS / "IBM Logo.ch8"]
+    with Chip8VectorEnv(roms, workers=2, frame_skip=2, max_steps=len(ACTIONS), reward=score) as vector:
+        observations, infos = vector.reset(seed=5)
+        assert observations.shape == (2, 32, 64) and len(infos) == 2
+        for action in ACTIONS[:-1]:
+            observations, rewards, *_ = vector.step([action, 0])
+            expected = [env.step(mask)[:2] for env, mask in zip(single, [action, 0])]
+            assert all((observation == frame).all() for observation, (frame, _) in zip(observations, expected))
+            assert rewards.tolist() == [reward for _, reward in expected]
+        observations, rewards, terminated, truncated, infos = vector.step([ACTIONS[-1], 0])
+        expected = [env.step(mask)[:2] for env, mask in zip(single, [ACTIONS[-1], 0])]
+        assert truncated.tolist() == [True, True] and not terminated.any()
+        assert rewards.tolist() == [reward for _, reward in expected]
+        assert all((info["final_observation"] == frame).all() for info, (frame, _) in zip(infos, expected))
+        assert not observations.any()
+    assert vector.closed
@@ -0,0 +1,42 @@
+import pytest
+
+from core.framebuffer import Framebuffer
+
+
+@pytest.fixture
+def framebuffer() -> Framebuffer:
+    """Fixture for a blank 64x32 framebuffer."""
+    return Framebuffer()
+
+
+def test_draw_sprite_collision(framebuffer: Framebuffer) -> None:
+    """Test that drawing XORs pixels and reports collisions."""
+    assert not framebuffer.draw_sprite(2, 1, bytes([0b10100000]))
+    assert framebuffer.get_pixel(2, 1) and framebuffer.get_pixel(4, 1)
+    assert not framebuffer.get_pixel(3, 1)
+    assert framebuffer.draw_sprite(2, 1, bytes([0b10000000]))
+    assert not framebuffer.get_pixel(2, 1)
+    assert framebuffer.buffer[1][4]
+
+
+def test_draw_sprite_clips(framebuffer: Framebuffer) -> None:
+    """Test that sprites are clipped at the right and bottom edges by default."""
+    framebuffer.draw_sprite(60, 31, bytes([0xFF, 0xFF]))
+    assert framebuffer.rows[31] == 0xF
+    assert framebuffer.rows[0] == 0
+
+
+def test_draw_sprite_wraps() -> None:
+    """Test that sprites wrap around the edges when wrapping is enabled."""
+    framebuffer = Framebuffer(wrap=True)
+    framebuffer.draw_sprite(60, 31, bytes([0xFF, 0xFF]))
+    assert framebuffer.rows[31] == framebuffer.rows[0] == 0xF00000000000000F
+
+
+def test_clear(framebuffer: Framebuffer) -> None:
+    """Test that clearing resets every row and bumps the version."""
+    framebuffer.set_pixel(5, 5, True)
+    version = framebuffer.version
+    framebuffer.clear()
+    assert not any(framebuffer.rows)
+    assert framebuffer.version > version
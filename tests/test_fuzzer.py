@@ -0,0 +1,78 @@
+import pathlib
+import random
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.fuzzer import Coverage, CoverageTracer, execute, fuzz, fuzz_worker, mutate
+from src.core.movie import Movie, replay, rom_hash
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+PONG = ROMS / "Pong [Paul Vervalin, 1990].ch8"
+
+
+@pytest.fixture
+def trap(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a ROM that spins until key 5 is pressed and then runs an unknown opcode."""
+    rom = tmp_path / "trap.ch8"
+    rom.write_bytes(bytes.fromhex("6005" "E0A1" "0000" "1202"))
+    return rom
+
+
+def test_tracer_does_not_change_execution() -> None:
+    """Test that a traced machine ends in the same state as a plain one and covers what it ran."""
+    chip = Chip8(PONG, seed=3)
+    tracer = CoverageTracer(chip)
+    chip.run_cycles(20_000)
+    plain = Chip8(PONG, seed=3)
+    plain.run_cycles(20_000)
+    assert chip.snapshot() == plain.snapshot()
+    assert chip.idle_cycles > 0 and chip.decode_cache.lookups + chip.idle_cycles == 20_000
+    coverage = tracer.coverage
+    assert {"DXYN", "2NNN", "00EE", "FX29"} <= coverage.variants
+    pcs = int.from_bytes(coverage.pcs, "big")
+    assert pcs >> (4095 - 0x200) & 1 and pcs.bit_count() == coverage.addresses
+    assert not Coverage(edges=set(coverage.edges)).merge(Coverage(edges={min(coverage.edges)}))
+
+
+def test_mutate_keeps_movie_valid() -> None:
+    """Test that mutations are reproducible and keep the timeline sorted and within the movie."""
+    movie = Movie(rom_hash=rom_hash(PONG), seed=1, length=5_400, events=[(100, 2), (900, 0)])
+    donor = Movie(rom_hash=movie.rom_hash, seed=2, length=5_400, events=[(3_000, 16), (4_000, 0)])
+    mutants = [mutate(movie, random.Random(i), donor) for i in range(200)]
+    assert mutants == [mutate(movie, random.Random(i), donor) for i in range(200)]
+    for mutant in mutants:
+        cycles = [cycle for cycle, _ in mutant.events]
+        assert cycles == sorted(cycles) and all(0 <= cycle < 5_400 for cycle in cycles)
+        assert all(0 <= mask <= 0xFFFF for _, mask in mutant.events)
+        assert (mutant.rom_hash, mutant.length) == (movie.rom_hash, movie.length)
+    assert len({(mutant.seed, tuple(mutant.events)) for mutant in mutants}) > 150
+    assert movie.events == [(100, 2), (900, 0)]
+
+
+def test_worker_finds_crash(trap: pathlib.Path, tmp_path: pathlib.Path) -> None:
+    """Test that a worker keeps the input that reaches the fault and that it replays the crash."""
+    stats = fuzz_worker(trap, tmp_path / "corpus", executions=300, frames=30)
+    assert list(stats.crashes) == ["ValueError: Unknown opcode: 0000"]
+    assert stats.executions == 300 and stats.coverage.addresses == 4
+    crash = tmp_path / "corpus" / "crashes" / stats.crashes["ValueError: Unknown opcode: 0000"]
+    assert crash.with_suffix(".txt").read_text() == "ValueError: Unknown opcode: 0000\n"
+    with pytest.raises(ValueError, match="Unknown opcode"):
+        replay(Movie.load(crash), trap, verify=False)
+    result = execute(Movie.load(crash), trap)
+    assert result.error == "ValueError: Unknown opcode: 0000"
+    # One load, two instructions per spin until the key is seen, then the key check that falls through.
+    assert result.cycles >= 2 and result.cycles % 2 == 0
+
+
+def test_pool_shares_the_corpus(tmp_path: pathlib.Path) -> None:
+    """Test that workers save new coverage to the shared corpus and pick up each other's entries."""
+    corpus = tmp_path / "corpus"
+    stats = fuzz(PONG, corpus, workers=2, executions=40, frames=120)
+    entries = sorted(corpus.glob("*.c8mv"))
+    assert stats.executions >= 80 and stats.executions_per_second > 0
+    assert 0 < len(entries) <= stats.corpus
+    assert stats.coverage.addresses > 50 and not stats.crashes
+    resumed = fuzz_worker(PONG, corpus, executions=len(entries), frames=120)
+    assert resumed.corpus == 0
+    assert resumed.coverage.edges >= execute(Movie.load(entries[0]), PONG).coverage.edges
@@ -0,0 +1,79 @@
+import pathlib
+import typing as t
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.idle import IdleLoop, find_idle_loop
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+# V0 = 5, DT = V0, then wait at 0x204 until DT reaches zero and spin at 0x20A.
+TIMER_WAIT = bytes.fromhex("6005 F015 F007 3000 1204 120A")
+
+
+@pytest.fixture
+def rom(tmp_path: pathlib.Path) -> pathlib.Path:
+    """Fixture for a ROM that waits on the delay timer and then spins forever."""
+    path = tmp_path / "wait.ch8"
+    path.write_bytes(TIMER_WAIT)
+    return path
+
+
+@pytest.mark.parametrize(
+    "program, address, expected",
+    [
+        (TIMER_WAIT, 0x20A, IdleLoop(kind="spin", length=1, size=2)),
+        (TIMER_WAIT, 0x204, IdleLoop(kind="timer", length=3, size=6)),
+        (bytes.fromhex("E19E 1200"), 0x200, IdleLoop(kind="key", length=2, size=4)),
+        (bytes.fromhex("E1A1 1200"), 0x200, IdleLoop(kind="key", length=2, size=4)),
+        (bytes.fromhex("F007 3100 1200"), 0x200, None),
+        (TIMER_WAIT, 0x200, None),
+    ],
+)
+def test_find_idle_loop(program: bytes, address: int, expected: IdleLoop | None) -> None:
+    """Test which loops are recognised as idle."""
+    ram = bytearray(0x200) + program
+    assert find_idle_loop(ram, address) == expected
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "recompiler"])
+def test_idle_skip_is_exact(rom: pathlib.Path, engine: t.Any) -> None:
+    """Test that skipping idle loops ends in the same state and cycle count as running them."""
+    fast = Chip8(rom, engine=engine, seed=0)
+    slow = Chip8(rom, engine=engine, seed=0, skip_idle=False)
+    for budget in (7, 20, 45, 1_000):
+        fast.run_cycles(budget)
+        slow.run_cycles(budget)
+        assert fast.snapshot() == slow.snapshot()
+    assert fast.registers.PC == 0x20A
+    assert fast.idle_cycles > 0 and slow.idle_cycles == 0
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "recompiler"])
+def test_idle_skip_on_roms(engine: t.Any) -> None:
+    """Test that ROMs that idle reach the same state with skipping on."""
+    for name in ("IBM Logo.ch8", "Pong [Paul Vervalin, 1990].ch8", "Jumping X and O [Harry Kleinberg, 1977].ch8"):
+        fast = Chip8(ROMS / name, engine=engine, seed=0)
+        slow = Chip8(ROMS / name, engine=engine, seed=0, skip_idle=False)
+        fast.run_cycles(30_000)
+        slow.run_cycles(30_000)
+        assert fast.snapshot() == slow.snapshot()
+
+
+def test_headless_spin_is_skipped(rom: pathlib.Path) -> None:
+    """Test that a spinning machine without timer ticks skips the whole budget at once."""
+    chip = Chip8(rom, instructions_per_tick=None)
+    chip.registers.PC = 0x20A
+    assert chip.run_cycles(1_000_000) == 1_000_000
+    assert chip.idle_cycles == 999_999
+    assert chip.decode_cache.lookups == 1
+
+
+def test_writes_into_loop_invalidate_it(rom: pathlib.Path) -> None:
+    """Test that patching the back jump of an idle loop drops its cached handler."""
+    chip = Chip8(rom)
+    chip.run_cycles(20)
+    assert chip.decode_cache.entries[0x204] is not None
+    chip.memory[0x208:0x20A] = bytes.fromhex("120A")
+    assert chip.decode_cache.entries[0x204] is None
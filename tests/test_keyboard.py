@@ -0,0 +1,50 @@
+import pytest
+
+from src.core.keyboard import Keyboard
+
+
+@pytest.fixture
+def keyboard() -> Keyboard:
+    """Fixture for a keypad with no key down."""
+    return Keyboard()
+
+
+def test_bitmask_state(keyboard: Keyboard) -> None:
+    """Test that keys, bit tests and the mask agree."""
+    keyboard.press(0x3)
+    keyboard.KEYF.pressed = True
+    assert keyboard.state == 0x8008
+    assert keyboard.is_key_pressed(0x3) and keyboard.is_key_pressed(0xF)
+    assert not keyboard.is_key_pressed(0x0)
+    assert keyboard.KEY3.pressed and not keyboard.KEY4.pressed
+    keyboard.release(0x3)
+    assert keyboard.state == 0x8000
+
+
+def test_bulk_updates(keyboard: Keyboard) -> None:
+    """Test that bulk updates notify once per changed key."""
+    events: list[tuple[int, bool]] = []
+    keyboard.add_listener(lambda value, pressed: events.append((value, pressed)))
+    keyboard.set_state(0b1010)
+    keyboard.apply_events([(1, False), (4, True), (4, False), (5, True)])
+    assert keyboard.state == 0b101000
+    assert events == [(1, True), (3, True), (1, False), (5, True)]
+
+
+def test_layout_view(keyboard: Keyboard) -> None:
+    """Test that the keypad layout view reflects the mask."""
+    keyboard.set_state(1 << 0xA)
+    assert [[str(key) for key in row] for row in keyboard.keys][3] == ["A", "0", "B", "F"]
+    assert keyboard.keys[3][0].pressed
+
+
+def test_rejects_bad_input(keyboard: Keyboard) -> None:
+    """Test that out-of-range keys and masks are rejected."""
+    with pytest.raises(ValueError):
+        keyboard.is_key_pressed(16)
+    with pytest.raises(ValueError):
+        keyboard.set_state(0x10000)
+    with pytest.raises(ValueError):
+        keyboard.apply_events([(16, True)])
+    with pytest.raises(TypeError):
+        keyboard.KEY1.pressed = 1  # type: ignore[assignment]
@@ -0,0 +1,53 @@
+import os
+import pathlib
+
+import pytest
+
+from src.core.memory import Memory, read_rom
+
+
+@pytest.fixture
+def memory() -> Memory:
+    """Fixture for an empty memory with the fontset loaded."""
+    return Memory()
+
+
+def test_bulk_read_write(memory: Memory) -> None:
+    """Test zero-copy reads and unchecked writes, and that writes notify listeners once."""
+    writes: list[tuple[int, int]] = []
+    memory.add_write_listener(lambda start, stop: writes.append((start, stop)))
+    memory.write(0x300, b"\x01\x02\x03")
+    view = memory.read(0x300, 3)
+    assert isinstance(view, memoryview) and bytes(view) == b"\x01\x02\x03"
+    assert writes == [(0x300, 0x303)]
+
+
+def test_write_past_end(memory: Memory) -> None:
+    """Test that a write running off the end stores what fits and then raises."""
+    with pytest.raises(IndexError):
+        memory.write(memory.size - 2, b"\x0a\x0b\x0c")
+    assert memory.memory[-2:] == b"\x0a\x0b"
+    assert len(memory.memory) == memory.size
+
+
+def test_checked_access(memory: Memory) -> None:
+    """Test that item access keeps validating its arguments."""
+    with pytest.raises(ValueError):
+        memory[0x300] = 0x100
+    with pytest.raises(TypeError):
+        memory[0x300:0x302] = [1, 2]  # type: ignore[assignment]
+    with pytest.raises(ValueError):
+        memory[0x300:0x302] = b"\x01"
+    assert len(memory.memory) == memory.size
+
+
+def test_rom_images_are_cached(tmp_path: pathlib.Path) -> None:
+    """Test that a ROM is read once and re-read when its file changes."""
+    rom = tmp_path / "rom.ch8"
+    rom.write_bytes(b"\x12\x00")
+    first = read_rom(rom)
+    assert read_rom(rom) is first
+    rom.write_bytes(b"\x12\x02\x00")
+    stat = rom.stat()
+    os.utime(rom, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert read_rom(rom) == b"\x12\x02\x00"
@@ -0,0 +1,93 @@
+import pathlib
+import typing as t
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.movie import Movie, MovieRecorder, replay
+from src.core.scheduler import FrameScheduler
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+PONG = ROMS / "Pong [Paul Vervalin, 1990].ch8"
+
+
+def record(frames: int, presses: dict[int, int]) -> tuple[Chip8, MovieRecorder]:
+    chip = Chip8(PONG, instructions_per_tick=None, seed=1234)
+    scheduler = FrameScheduler(chip)
+    recorder = MovieRecorder(chip, scheduler)
+    for frame in range(frames):
+        if frame in presses:
+            chip.keyboard.set_state(presses[frame])
+        recorder.capture()
+        scheduler.run_frame()
+    return chip, recorder
+
+
+@pytest.fixture
+def movie() -> Movie:
+    """Fixture for a recorded session of Pong with the paddle moving both ways."""
+    _, recorder = record(600, {30: 0x0002, 120: 0x0000, 200: 0x0010, 400: 0x0012, 450: 0x0000})
+    return recorder.finish()
+
+
+def test_seeded_rng() -> None:
+    """Test that machines with the same seed draw the same numbers, also after a reset."""
+    chip = Chip8(PONG, seed=7)
+    other = Chip8(PONG, seed=7)
+    numbers = [chip.random.randint(0, 255) for _ in range(8)]
+    assert numbers == [other.random.randint(0, 255) for _ in range(8)]
+    chip.reset()
+    assert numbers == [chip.random.randint(0, 255) for _ in range(8)]
+
+
+def test_movie_roundtrip(movie: Movie) -> None:
+    """Test that a movie survives serialization."""
+    assert len(movie.events) == 5
+    assert Movie.from_bytes(movie.to_bytes()) == movie
+
+
+@pytest.mark.parametrize("engine", ["interpreter", "recompiler"])
+def test_replay_reproduces_state(movie: Movie, engine: t.Any) -> None:
+    """Test that replaying a movie ends in exactly the recorded state."""
+    started: list[tuple[Chip8, int]] = []
+    chip = replay(
+        Movie.from_bytes(movie.to_bytes()),
+        PONG,
+        engine=engine,
+        on_start=lambda chip: started.append((chip, chip.cycles)),
+    )
+    assert chip.cycles == movie.length
+    assert started == [(chip, 0)]
+
+
+def test_replay_detects_divergence(movie: Movie) -> None:
+    """Test that a replay with different input is rejected."""
+    del movie.events[:2]
+    with pytest.raises(ValueError):
+        replay(movie, PONG)
+
+
+def test_replay_rejects_other_rom(movie: Movie) -> None:
+    """Test that a movie only replays against the ROM it was recorded with."""
+    with pytest.raises(ValueError):
+        replay(movie, ROMS / "IBM Logo.ch8")
+
+
+def test_truncate_after_rewind() -> None:
+    """Test that rewinding drops the input recorded after the restored point."""
+    chip, recorder = record(100, {10: 0x0002, 50: 0x0000})
+    state = chip.snapshot()
+    chip.keyboard.set_state(0x0010)
+    recorder.capture()
+    FrameScheduler(chip).run_frame()
+    chip.restore(state)
+    recorder.truncate()
+    assert recorder.movie.events == [(90, 0x0002), (450, 0x0000)]
+    replay(recorder.finish(), PONG)
+
+
+def test_recording_needs_seed() -> None:
+    """Test that a machine without a seed cannot be recorded."""
+    chip = Chip8(PONG, instructions_per_tick=None)
+    with pytest.raises(ValueError):
+        MovieRecorder(chip, FrameScheduler(chip))
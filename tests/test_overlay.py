@@ -0,0 +1,57 @@
+import os
+import pathlib
+
+import pygame
+import pytest
+
+from src.core.chip8 import Chip8
+from src.gui.overlay import DebugOverlay
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def overlay() -> DebugOverlay:
+    """Fixture for an overlay of a machine running Pong, refreshed at 10 Hz by a fake clock."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.font.init()
+    return DebugOverlay(Chip8(ROMS / "Pong [Paul Vervalin, 1990].ch8"), refresh_rate=10, clock=FakeClock())
+
+
+def test_overlay_renders_only_changed_lines(overlay: DebugOverlay) -> None:
+    """Test that an unchanged machine costs no renders and a changed register costs one."""
+    target = pygame.Surface((640, 480))
+    overlay.draw(target)
+    first = overlay.renders
+    assert first > 0
+    clock = overlay.clock
+    assert isinstance(clock, FakeClock)
+    clock.now += 1
+    overlay.draw(target)
+    assert overlay.renders == first
+    overlay.chip.registers.V[3] = 0x42
+    clock.now += 1
+    overlay.draw(target)
+    assert overlay.renders == first + 1
+
+
+def test_overlay_refresh_rate(overlay: DebugOverlay) -> None:
+    """Test that values are only sampled at the refresh rate."""
+    target = pygame.Surface((640, 480))
+    overlay.draw(target)
+    renders = overlay.renders
+    overlay.chip.registers.V[3] = 0x42
+    overlay.draw(target)
+    assert overlay.renders == renders
+    assert isinstance(overlay.clock, FakeClock)
+    overlay.clock.now += 0.1
+    overlay.draw(target)
+    assert overlay.renders == renders + 1
@@ -0,0 +1,71 @@
+import pathlib
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.disassembler import disassemble, pattern
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+PONG = ROMS / "Pong [Paul Vervalin, 1990].ch8"
+
+
+@pytest.fixture
+def chip() -> Chip8:
+    """Fixture for a profiled machine that has run part of Pong."""
+    chip = Chip8(PONG, seed=0, profile=True)
+    chip.run_cycles(20_000)
+    return chip
+
+
+def test_profiler_counts_everything(chip: Chip8) -> None:
+    """Test that every executed instruction is counted by pattern, family and address."""
+    profiler = chip.profiler
+    assert profiler is not None
+    assert profiler.total == 20_000
+    assert sum(profiler.hits) == 20_000
+    assert sum(count for count, _ in profiler.families().values()) == 20_000
+    assert profiler.calls == profiler.counts["2NNN"] > 0
+    assert profiler.returns == profiler.counts["00EE"] > 0
+    assert profiler.hot_addresses(1)[0][1] == max(profiler.hits)
+
+
+def test_profiler_does_not_change_execution(chip: Chip8) -> None:
+    """Test that a profiled machine ends in the same state as an unprofiled one."""
+    plain = Chip8(PONG, seed=0, engine="recompiler")
+    plain.run_cycles(20_000)
+    assert plain.profiler is None
+    assert plain.snapshot() == chip.snapshot()
+
+
+def test_profiler_survives_reset(chip: Chip8) -> None:
+    """Test that a reset keeps the instrumented dispatch."""
+    chip.reset()
+    chip.run_cycles(1_000)
+    assert chip.profiler is not None and chip.profiler.total == 21_000
+
+
+def test_report(chip: Chip8) -> None:
+    """Test that the report lists hot addresses with their disassembly."""
+    assert chip.profiler is not None
+    report = chip.profiler.report(top=3)
+    assert "20,000 instructions" in report
+    address, _ = chip.profiler.hot_addresses(1)[0]
+    opcode = chip.memory.memory[address] << 8 | chip.memory.memory[address + 1]
+    assert f"0x{address:03X}" in report and disassemble(opcode) in report
+
+
+@pytest.mark.parametrize(
+    "opcode, expected_pattern, expected_text",
+    [
+        (0x00E0, "00E0", "CLS"),
+        (0x2ABC, "2NNN", "CALL 0xABC"),
+        (0x8AB4, "8XY4", "ADD VA, VB"),
+        (0xD125, "DXYN", "DRW V1, V2, 5"),
+        (0xF333, "FX33", "LD B, V3"),
+        (0xF0FF, "FXFF", "DW 0xF0FF"),
+    ],
+)
+def test_disassemble(opcode: int, expected_pattern: str, expected_text: str) -> None:
+    """Test opcode patterns and mnemonics."""
+    assert pattern(opcode) == expected_pattern
+    assert disassemble(opcode) == expected_text
@@ -0,0 +1,70 @@
+import pathlib
+
+import pytest
+
+from src.core.chip8 import Chip8
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+def _state(chip: Chip8) -> tuple[object, ...]:
+    registers = chip.registers
+    return (
+        bytes(chip.memory.memory),
+        bytes(registers.V),
+        (registers.I, registers.PC, registers.SP, registers.DT, registers.ST),
+        registers.stack.tolist(),
+        chip.wait_for_key,
+        chip.framebuffer.rows,
+    )
+
+
+@pytest.mark.parametrize("rom", sorted(ROMS.glob("*.ch8")), ids=lambda path: path.stem)
+def test_engines_match(rom: pathlib.Path) -> None:
+    """Test that the recompiler ends in the same state as the interpreter for a fixed cycle budget."""
+    states: list[tuple[object, ...]] = []
+    for engine in ("interpreter", "recompiler"):
+        chip = Chip8(rom, engine=engine)
+        chip.random.seed(0)
+        chip.run_cycles(20_000)
+        states.append(_state(chip))
+    assert states[0] == states[1]
+
+
+@pytest.mark.parametrize("ticks", [1, 3, 9])
+def test_blocks_cross_ticks_exactly(tmp_path: pathlib.Path, ticks: int) -> None:
+    """Test that blocks running past a tick leave the timers as the interpreter does, with one block per entry."""
+    rom = tmp_path / "timers.ch8"
+    # A long untimed block, then one that sets and reads DT and ST, in a loop.
+    rom.write_bytes(bytes.fromhex("6000 7001 7103 8014 8125 8206 A300 F01E 8310 8334 F015 F107 F118 8E10 1202"))
+    states: list[tuple[object, ...]] = []
+    for engine in ("interpreter", "recompiler"):
+        chip = Chip8(rom, engine=engine, instructions_per_tick=ticks)
+        trace: list[tuple[object, ...]] = []
+        for budget in [1, 2, 5, 7, 11, 13, 40] * 20:
+            chip.run_cycles(budget)
+            trace.append(_state(chip))
+        states.append((chip.cycles, trace))
+        if chip.recompiler is not None:
+            # Blocks are compiled per entry address, never per remaining budget.
+            assert chip.recompiler.compiled <= 15 and chip.recompiler.invalidations == 0
+    assert states[0] == states[1]
+
+
+def test_recompiler_self_modifying_code() -> None:
+    """Test that writing over a compiled block drops it."""
+    chip = Chip8(ROMS / "IBM Logo.ch8", engine="recompiler", instructions_per_tick=None)
+    chip.memory[0x200:0x206] = bytes([0x60, 0x01, 0x70, 0x01, 0x12, 0x00])  # V0 = 1; V0 += 1; jump 0x200
+    chip.run_cycles(3)
+    assert chip.registers.V[0] == 2
+    chip.memory[0x203] = 0x05  # V0 += 5
+    chip.run_cycles(3)
+    assert chip.registers.V[0] == 6
+    assert chip.recompiler is not None
+    assert chip.recompiler.invalidations == 1
+
+
+def test_unknown_engine() -> None:
+    """Test that an unknown engine name is rejected."""
+    with pytest.raises(ValueError):
+        Chip8(ROMS / "IBM Logo.ch8", engine="jit")  # type: ignore[arg-type]
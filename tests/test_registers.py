@@ -1,6 +1,6 @@
 import pytest
 
-from core.registers import Register, Registers
+from core.registers import Register, RegisterFile, Registers
 
 
 @pytest.fixture
@@ -49,3 +49,16 @@ def test_register_size(register: Register) -> None:
         register.size = 32
     with pytest.raises(TypeError):
         register.size = "not an int"  # type: ignore[assignment]
+
+
+def test_register_file_view() -> None:
+    """Test that the register file exposes its values as named registers."""
+    register_file = RegisterFile()
+    register_file.V[5] = 42
+    register_file.I = 0x300
+    view = register_file.view()
+    assert view.V5 == 42
+    assert view.I == Register(name="I", size=16, value=0x300)
+    assert view.program_counter == register_file.PC
+    view.V5.value = 7
+    assert register_file.V[5] == 42
@@ -0,0 +1,64 @@
+import pathlib
+import struct
+
+from src.core.chip8 import Chip8
+from src.core.rewind import RewindBuffer, apply_delta, xor_delta
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+def test_xor_delta_roundtrip() -> None:
+    """Test that a delta converts between two states in both directions."""
+    old = bytes(64) + b"\x01\x02\x03" + bytes(64)
+    new = b"\xff" + bytes(63) + b"\x01\x07\x03" + bytes(63) + b"\x10"
+    delta = xor_delta(old, new)
+    assert len(delta) < len(new)
+    assert apply_delta(old, delta) == new
+    assert apply_delta(new, delta) == old
+    assert xor_delta(old, old) == b""
+
+
+def test_xor_delta_matches_a_full_scan() -> None:
+    """Test that skipping unchanged chunks finds the same runs as scanning the whole state."""
+    size = 4096 + 300
+    old = bytes(range(256)) * (size // 256) + bytes(size % 256)
+    for changes in ([0], [511, 512], [100, 1600, 1601, 1602], [size - 1], list(range(500, 1100)), [1023, 2048]):
+        new = bytearray(old)
+        for index in changes:
+            new[index] ^= 0x5A
+        diff = bytes(a ^ b for a, b in zip(old, new))
+        expected = b""
+        start = None
+        for index in range(size + 1):
+            changed = index < size and diff[index] != 0
+            if changed and start is None:
+                start = index
+            elif not changed and start is not None:
+                expected += struct.pack("<HH", start, index - start) + diff[start:index]
+                start = None
+        assert xor_delta(old, bytes(new)) == expected
+
+
+def test_rewind_steps_back_through_frames() -> None:
+    """Test that rewinding returns every recorded frame in reverse order."""
+    chip = Chip8(ROMS / "Pong [Paul Vervalin, 1990].ch8")
+    buffer = RewindBuffer(seconds=1)
+    states: list[bytes] = []
+    for _ in range(90):
+        chip.run_cycles(9)
+        states.append(chip.snapshot())
+        buffer.record(states[-1])
+    assert len(buffer) == buffer.max_frames == 60
+    for state in reversed(states[-60:-1]):
+        assert buffer.rewind() == state
+    assert buffer.rewind() is None
+
+
+def test_rewind_respects_byte_budget() -> None:
+    """Test that the oldest frames are evicted to stay within the byte budget."""
+    buffer = RewindBuffer(byte_budget=2_000)
+    for i in range(100):
+        buffer.record(bytes([i]) * 500)
+    assert buffer.memory_usage <= 2_000
+    assert 1 < len(buffer) < 100
+    assert buffer.rewind() == bytes([98]) * 500
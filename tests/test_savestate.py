@@ -0,0 +1,57 @@
+import pathlib
+
+import pytest
+
+from src.core import savestate
+from src.core.chip8 import Chip8
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+@pytest.fixture
+def chip() -> Chip8:
+    """Fixture for a machine that has run part of Pong."""
+    chip = Chip8(ROMS / "Pong [Paul Vervalin, 1990].ch8")
+    chip.run_cycles(5_000)
+    return chip
+
+
+def test_snapshot_roundtrip(chip: Chip8) -> None:
+    """Test that a restored machine continues exactly like the original."""
+    data = chip.snapshot()
+    assert len(data) == savestate.SIZE
+    other = Chip8(ROMS / "Pong [Paul Vervalin, 1990].ch8", engine="recompiler")
+    other.restore(data)
+    assert other.snapshot() == data
+    chip.run_cycles(5_000)
+    other.run_cycles(5_000)
+    assert other.snapshot() == chip.snapshot()
+
+
+def test_restore_rewinds(chip: Chip8) -> None:
+    """Test that restoring an older snapshot brings the machine back to it."""
+    data = chip.snapshot()
+    chip.run_cycles(1_000)
+    chip.restore(data)
+    assert chip.cycles == 5_000
+    assert chip.snapshot() == data
+
+
+def test_restore_rejects_bad_data(chip: Chip8) -> None:
+    """Test that truncated data, bad magic and unknown versions are rejected."""
+    data = chip.snapshot()
+    with pytest.raises(ValueError):
+        chip.restore(data[:-1])
+    with pytest.raises(ValueError):
+        chip.restore(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        chip.restore(savestate.HEADER.pack(savestate.MAGIC, savestate.VERSION + 1) + data[savestate.HEADER.size :])
+
+
+def test_save_and_load_state(chip: Chip8, tmp_path: pathlib.Path) -> None:
+    """Test that snapshots can be written to and read from disk."""
+    path = tmp_path / "slot1.c8s"
+    savestate.save_state(chip, path)
+    chip.run_cycles(100)
+    savestate.load_state(chip, path)
+    assert chip.snapshot() == path.read_bytes()
@@ -0,0 +1,89 @@
+import pathlib
+
+import pytest
+
+from src.core.chip8 import Chip8
+from src.core.scheduler import FrameScheduler
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    """Fixture for a manually advanced clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def scheduler(clock: FakeClock) -> FrameScheduler:
+    """Fixture for a scheduler driving the IBM logo ROM."""
+    chip = Chip8(ROMS / "IBM Logo.ch8", instructions_per_tick=None)
+    return FrameScheduler(chip, clock=clock, sleep=clock.sleep)
+
+
+def test_step_runs_owed_frames(scheduler: FrameScheduler, clock: FakeClock) -> None:
+    """Test that each due frame runs its share of cycles and ticks the timers once."""
+    scheduler.chip.registers.DT = 10
+    assert scheduler.step() == 1
+    clock.now += 2 * scheduler.frame_time
+    assert scheduler.step() == 2
+    assert scheduler.chip.cycles == 3 * scheduler.cycles_per_frame
+    assert scheduler.chip.registers.DT == 7
+    assert scheduler.step() == 0
+
+
+def test_step_caps_catch_up(scheduler: FrameScheduler, clock: FakeClock) -> None:
+    """Test that a long stall only replays `max_catch_up` frames."""
+    clock.now += 100 * scheduler.frame_time
+    assert scheduler.step() == scheduler.max_catch_up
+    assert scheduler.dropped_frames > 0
+    assert scheduler.step() == 0
+
+
+def test_sleep_waits_for_next_frame(scheduler: FrameScheduler, clock: FakeClock) -> None:
+    """Test that sleeping advances the clock to the next frame deadline."""
+    scheduler.step()
+    scheduler.sleep()
+    assert clock.now == pytest.approx(scheduler.frame_time)
+    assert scheduler.step() == 1
+
+
+def test_turbo_runs_uncapped(scheduler: FrameScheduler, clock: FakeClock) -> None:
+    """Test that turbo mode runs a burst of frames per step without waiting on the clock."""
+    scheduler.turbo = True
+    scheduler.chip.registers.DT = 100
+    assert scheduler.step() == scheduler.turbo_frames
+    assert scheduler.chip.registers.DT == 100 - scheduler.turbo_frames
+    assert scheduler.present_due()
+    assert scheduler.step() == scheduler.turbo_frames
+    assert not scheduler.present_due()
+    scheduler.sleep()
+    assert clock.now == 0.0
+    scheduler.turbo = False
+    assert scheduler.step() == 1
+
+
+def test_blocked_machine_is_paced_in_turbo(clock: FakeClock, tmp_path: pathlib.Path) -> None:
+    """Test that turbo falls back to pacing while the machine waits for a key."""
+    rom = tmp_path / "wait_key.ch8"
+    rom.write_bytes(bytes.fromhex("F30A 1202"))
+    chip = Chip8(rom, instructions_per_tick=None)
+    scheduler = FrameScheduler(chip, turbo=True, clock=clock, sleep=clock.sleep)
+    assert scheduler.step() == scheduler.turbo_frames
+    assert chip.blocked
+    assert scheduler.step() == 1
+    scheduler.sleep()
+    assert clock.now == pytest.approx(scheduler.frame_time)
+    chip.keyboard.KEY1.pressed = True
+    assert scheduler.step() == scheduler.turbo_frames
@@ -0,0 +1,54 @@
+import os
+import typing as t
+
+import pygame
+import pytest
+
+from src.core.framebuffer import Framebuffer
+from src.gui import screen
+from src.gui.screen import BLACK, PIXEL_SIZE, WHITE, Display
+
+
+@pytest.fixture
+def display() -> Display:
+    """Fixture for a display of a blank framebuffer on the dummy video driver."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    return Display(Framebuffer())
+
+
+def test_render_scales_pixels(display: Display) -> None:
+    """Test that every lit pixel becomes a white square of the pixel size and the rest stays black."""
+    framebuffer = display.framebuffer
+    framebuffer.set_pixel(0, 0, True)
+    framebuffer.set_pixel(63, 31, True)
+    framebuffer.draw_sprite(8, 4, b"\xa0")
+    surface = display.render()
+    assert surface.get_size() == (64 * PIXEL_SIZE, 32 * PIXEL_SIZE)
+    for x in range(64):
+        for y in range(32):
+            colour = WHITE if framebuffer.get_pixel(x, y) else BLACK
+            for dx, dy in ((0, 0), (PIXEL_SIZE - 1, PIXEL_SIZE - 1)):
+                assert surface.get_at((x * PIXEL_SIZE + dx, y * PIXEL_SIZE + dy))[:3] == colour
+    assert framebuffer.get_pixel(10, 4) and not framebuffer.get_pixel(9, 4)
+
+
+def test_render_skips_unchanged_frames(display: Display, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that rendering an unchanged framebuffer uploads and scales nothing."""
+    scales: list[tuple[t.Any, ...]] = []
+    scale = pygame.transform.scale
+
+    def counted(*args: t.Any) -> pygame.Surface:
+        scales.append(args)
+        return scale(*args)
+
+    monkeypatch.setattr(screen.pygame.transform, "scale", counted)
+    display.framebuffer.set_pixel(5, 5, True)
+    first = display.render()
+    display.pixels[:] = bytes(len(display.pixels))
+    assert display.render() is first and len(scales) == 1
+    assert first.get_at((5 * PIXEL_SIZE, 5 * PIXEL_SIZE))[:3] == WHITE
+    display.framebuffer.set_pixel(6, 5, True)
+    display.render()
+    assert len(scales) == 2
+    assert first.get_at((6 * PIXEL_SIZE, 5 * PIXEL_SIZE))[:3] == WHITE
@@ -0,0 +1,112 @@
+import asyncio
+import pathlib
+import typing as t
+
+import pytest
+
+from src.core.rewind import apply_delta, xor_delta
+from src.net.client import Client
+from src.net.server import EmulationServer
+
+ROMS = pathlib.Path(__file__).parent.parent / "roms"
+
+
+def serve(test: t.Callable[[EmulationServer], t.Awaitable[None]], **options: t.Any) -> None:
+    async def main() -> None:
+        server = EmulationServer(ROMS, **options)
+        await server.start()
+        try:
+            await asyncio.wait_for(test(server), timeout=10)
+        finally:
+            await server.close()
+
+    asyncio.run(main())
+
+
+async def settle(condition: t.Callable[[], bool]) -> None:
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+def test_xor_delta_roundtrip() -> None:
+    """Test that a frame delta turns the previous frame into the next one."""
+    old = bytes(256)
+    new = bytearray(old)
+    new[10:14] = b"\xff\x0f\xf0\x01"
+    delta = xor_delta(old, bytes(new))
+    assert len(delta) == 8
+    assert apply_delta(old, delta) == new
+
+
+def test_client_mirrors_framebuffer() -> None:
+    """Test that a full frame followed by deltas keeps the client's framebuffer in sync."""
+
+    async def test(server: EmulationServer) -> None:
+        client = await Client.connect(*server.address, "IBM Logo.ch8", seed=0)
+        assert await client.wait_frame(0)
+        session = next(iter(server.sessions.values()))
+        await settle(lambda: session.scheduler.frames >= 30 and client.frames == session.frames_sent)
+        assert client.framebuffer == session.chip.framebuffer.to_bytes()
+        assert any(client.framebuffer or b"")
+        # The logo is drawn once; frames after that are not resent.
+        assert session.frames_sent < session.scheduler.frames
+        await client.close()
+
+    serve(test)
+
+
+def test_keys_ping_and_stats() -> None:
+    """Test that keys reach the session's keypad and that ping and stats are answered."""
+
+    async def test(server: EmulationServer) -> None:
+        first = await Client.connect(*server.address, "Keypad Test [Hap, 2006].ch8")
+        second = await Client.connect(*server.address, "IBM Logo.ch8")
+        await first.wait_frame(0)
+        await second.wait_frame(0)
+        await first.send_keys(0b1010)
+        session = server.sessions[1]
+        await settle(lambda: session.latency > 0)
+        assert session.chip.keyboard.state == 0b1010
+        assert await first.ping() > 0
+        stats = await second.stats()
+        assert [entry["session"] for entry in stats["sessions"]] == [1, 2]
+        assert stats["latency_ms"] == pytest.approx(session.latency * 1000)
+        assert stats["frames_sent"] == sum(entry["frames_sent"] for entry in stats["sessions"])
+        await first.close()
+        await settle(lambda: len(server.sessions) == 1)
+        await second.close()
+
+    serve(test)
+
+
+def test_slow_client_drops_frames(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that frames are skipped while the transport is backed up and the client resyncs after."""
+
+    async def test(server: EmulationServer) -> None:
+        client = await Client.connect(*server.address, "Pong [Paul Vervalin, 1990].ch8", seed=0)
+        await client.wait_frame(0)
+        session = next(iter(server.sessions.values()))
+        transport = session.writer.transport
+        monkeypatch.setattr(transport, "get_write_buffer_size", lambda: server.max_buffer + 1)
+        sent = session.frames_sent
+        await settle(lambda: session.frames_dropped > 0)
+        assert session.frames_sent == sent
+        monkeypatch.undo()
+        await settle(lambda: session.scheduler.frames > 120 and client.frames == session.frames_sent)
+        assert client.framebuffer == session.chip.framebuffer.to_bytes()
+        await client.close()
+
+    serve(test)
+
+
+def test_unknown_rom_is_refused() -> None:
+    """Test that opening a ROM outside the server's directory reports an error and closes."""
+
+    async def test(server: EmulationServer) -> None:
+        client = await Client.connect(*server.address, "../pyproject.toml")
+        assert not await client.wait_frame(0)
+        assert client.error is not None and "Unknown ROM" in client.error
+        assert not server.sessions
+        await client.close()
+
+    serve(test)
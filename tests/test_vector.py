@@ -0,0 +1,90 @@
+import pathlib
+
+import pytest
+
+from src.core.chip8 import Chip8
+
+pytest.importorskip("numpy")
+
+from src.core.vector import VectorChip8
+
+ROMS = sorted((pathlib.Path(__file__).parent.parent / "roms").iterdir())
+
+
+def write_rom(tmp_path: pathlib.Path, program: bytes) -> pathlib.Path:
+    path = tmp_path / "program.ch8"
+    path.write_bytes(program)
+    return path
+
+
+def test_matches_interpreter_on_every_rom() -> None:
+    """Test that every ROM run in lockstep ends in the same state as the interpreter, keys included."""
+    machines = VectorChip8(ROMS, seeds=list(range(len(ROMS))))
+    chips = [Chip8(rom, seed=i) for i, rom in enumerate(ROMS)]
+    for round, mask in enumerate((0, 1 << 5, 0, 1 << 4 | 1 << 6, 1 << 0xA)):
+        masks = [mask if i % 2 == round % 2 else 0 for i in range(len(ROMS))]
+        machines.set_keys(masks)
+        for chip, keys in zip(chips, masks):
+            chip.keyboard.set_state(keys)
+            chip.run_cycles(300)
+        assert machines.run_cycles(300) == 300 * len(ROMS)
+    for i, chip in enumerate(chips):
+        assert machines.snapshot(i) == chip.snapshot(), ROMS[i].name
+
+
+def test_clipped_sprites_and_arithmetic(tmp_path: pathlib.Path) -> None:
+    """Test that edge-clipped sprites, flag arithmetic and BCD match the interpreter."""
+    program = bytes.fromhex(
+        "603C"  # V0 = 60
+        "611E"  # V1 = 30
+        "F029"  # I = font(V0)
+        "D015"  # draw clipped at the right and bottom edges
+        "62F0"  # V2 = 0xF0
+        "8F24"  # VF += V2, X = F
+        "8FF6"  # VF >>= 1, X = F
+        "8E2E"  # VE <<= 1
+        "A300"  # I = 0x300
+        "F233"  # BCD of V2
+        "FF55"  # store V0-VF
+        "F365"  # load V0-V3
+        "1218"  # spin
+    )
+    rom = write_rom(tmp_path, program)
+    machines = VectorChip8([rom], seeds=[0])
+    chip = Chip8(rom, seed=0)
+    machines.run_cycles(20)
+    chip.run_cycles(20)
+    assert machines.snapshot(0) == chip.snapshot()
+    assert machines.framebuffer(0) == chip.framebuffer.to_bytes()
+
+
+def test_fault_halts_only_that_machine(tmp_path: pathlib.Path) -> None:
+    """Test that a machine that would raise halts with the interpreter's error while the rest keep running."""
+    recursion = write_rom(tmp_path, bytes.fromhex("2200"))
+    machines = VectorChip8([recursion, ROMS[0]], seeds=[0, 0])
+    machines.run_cycles(100)
+    chip = Chip8(recursion, seed=0)
+    with pytest.raises(IndexError, match="Stack overflow at 0x200") as error:
+        chip.run_cycles(100)
+    assert machines.errors == [f"IndexError: {error.value}", None]
+    assert machines.halted.tolist() == [True, False]
+    assert int(machines.SP[0]) == chip.registers.SP == 16
+    assert int(machines.cycles[0]) == 16
+    assert int(machines.cycles[1]) == 100
+
+
+def test_key_wait_and_restore(tmp_path: pathlib.Path) -> None:
+    """Test that FX0A blocks until a key is pressed and that a snapshot restores into the interpreter."""
+    rom = write_rom(tmp_path, bytes.fromhex("F30A" "7301" "1202"))
+    machines = VectorChip8([rom, rom], seeds=[1, 2])
+    machines.run_cycles(10)
+    assert machines.wait_register.tolist() == [3, 3]
+    machines.set_keys([0, 1 << 7 | 1 << 9])
+    machines.run_cycles(3)
+    assert machines.wait_register.tolist() == [3, -1]
+    assert int(machines.V[1, 3]) == 8
+    chip = Chip8(rom)
+    chip.restore(machines.snapshot(1))
+    chip.run_cycles(50)
+    machines.run_cycles(50)
+    assert machines.snapshot(1) == chip.snapshot()
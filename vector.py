@@ -0,0 +1,48 @@
+import argparse
+import pathlib
+import sys
+import time
+
+from src.core.chip8 import Chip8
+
+DEFAULT_ROM = pathlib.Path(__file__).parent / "roms" / "Pong [Paul Vervalin, 1990].ch8"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run many copies of ROMs in lockstep with the NumPy engine.")
+    parser.add_argument("roms", nargs="*", type=pathlib.Path, default=[DEFAULT_ROM], help="ROMs, assigned round-robin")
+    parser.add_argument("--machines", type=int, default=1024, help="number of machines")
+    parser.add_argument("--cycles", type=int, default=10_000, help="lockstep steps to run")
+    parser.add_argument("--seed", type=int, default=0, help="machine i is seeded with seed + i")
+    parser.add_argument("--check", type=int, default=0, help="compare this many machines against the interpreter")
+    args = parser.parse_args()
+
+    try:
+        from src.core.vector import VectorChip8
+    except ImportError:
+        sys.exit("The vector engine needs NumPy: poetry install --with vector")
+
+    roms = [args.roms[i % len(args.roms)] for i in range(args.machines)]
+    seeds = [args.seed + i for i in range(args.machines)]
+    machines = VectorChip8(roms, seeds=seeds)
+    start = time.perf_counter()
+    executed = machines.run_cycles(args.cycles)
+    elapsed = time.perf_counter() - start
+    faulted = sum(error is not None for error in machines.errors)
+    print(
+        f"{args.machines:,} machines, {executed:,} instructions in {elapsed:.2f}s: "
+        f"{executed / elapsed:,.0f} machine-instructions/s ({faulted} faulted)"
+    )
+
+    mismatches = 0
+    for i in range(min(args.check, args.machines)):
+        chip = Chip8(roms[i], seed=seeds[i])
+        try:
+            chip.run_cycles(args.cycles)
+        except (ValueError, IndexError):
+            continue
+        if chip.snapshot() != machines.snapshot(i):
+            mismatches += 1
+            print(f"machine {i} ({roms[i].name}) differs from the interpreter", file=sys.stderr)
+    if args.check:
+        print(f"checked {min(args.check, args.machines)} machines against the interpreter: {mismatches} mismatches")
+    sys.exit(1 if mismatches else 0)